@@ -13,7 +13,7 @@ for root, dirs, files in os.walk('fastflix'):
 	for file in files:
 		all_fastflix_files.append((os.path.join(root,file), root))
 
-all_imports = collect_submodules('pydantic') + ['dataclasses', 'colorsys', 'typing_extensions', 'box']
+all_imports = collect_submodules('pydantic') + collect_submodules('fastflix.encoders') + ['dataclasses', 'colorsys', 'typing_extensions', 'box']
 with open("requirements.txt", "r") as reqs:
     for line in reqs:
         package = line.split("[")[0].split("=")[0].split(">")[0].split("<")[0].replace('"', '').replace("'", '').rstrip("~").strip()
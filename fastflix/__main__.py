@@ -3,8 +3,6 @@ import sys
 import traceback
 from multiprocessing import freeze_support
 
-from fastflix.entry import main
-
 
 def start_fastflix():
     exit_code = 2
@@ -17,6 +15,14 @@ def start_fastflix():
     if portable_mode:
         print("PORTABLE MODE DETECTED: now using local config file and workspace in same directory as the executable")
 
+    if sys.argv[1:2] == ["batch"]:
+        # Kept apart from entry so the GUI and its Qt imports are never loaded
+        from fastflix.batch import main as batch_main
+
+        sys.exit(batch_main(sys.argv[2:], portable_mode))
+
+    from fastflix.entry import main
+
     try:
         exit_code = main(portable_mode)
     except Exception:
@@ -6,7 +6,14 @@ import coloredlogs
 import reusables
 from PySide6 import QtGui, QtWidgets, QtCore
 
-from fastflix.flix import ffmpeg_audio_encoders, ffmpeg_configuration, ffprobe_configuration, ffmpeg_opencl_support
+from fastflix.flix import (
+    ffmpeg_audio_encoders,
+    ffmpeg_configuration,
+    ffprobe_configuration,
+    ffmpeg_opencl_support,
+    load_ffmpeg_capabilities,
+    save_ffmpeg_capabilities,
+)
 from fastflix.language import t
 from fastflix.models.config import Config, MissingFF
 from fastflix.models.fastflix import FastFlix
@@ -136,10 +143,11 @@ def register_app():
             logger.exception("Could not set application ID for Windows, please raise issue in github with above error")
 
 
-def start_app(worker_queue, status_queue, log_queue, queue_list, queue_lock, portable_mode=False):
+def start_app(worker_queue, status_queue, log_queue, progress_queue, queue_list, queue_lock, portable_mode=False):
     app = create_app()
     app.fastflix = FastFlix(queue=queue_list, queue_lock=queue_lock)
     app.fastflix.log_queue = log_queue
+    app.fastflix.progress_queue = progress_queue
     app.fastflix.status_queue = status_queue
     app.fastflix.worker_queue = worker_queue
 
@@ -188,16 +196,23 @@ def start_app(worker_queue, status_queue, log_queue, queue_list, queue_lock, por
 
     logger.setLevel(app.fastflix.config.logging_level)
 
-    startup_tasks = [
-        Task(t("Gather FFmpeg version"), ffmpeg_configuration),
-        Task(t("Gather FFprobe version"), ffprobe_configuration),
-        Task(t("Gather FFmpeg audio encoders"), ffmpeg_audio_encoders),
-        Task(t("Determine OpenCL Support"), ffmpeg_opencl_support),
-        Task(t("Initialize Encoders"), init_encoders),
-    ]
+    if load_ffmpeg_capabilities(app, app.fastflix.config):
+        startup_tasks = [Task(t("Initialize Encoders"), init_encoders)]
+    else:
+        # FFmpeg is new or has changed, each check is its own process so they can all run at once
+        checks = [
+            Task(t("Gather FFmpeg version"), ffmpeg_configuration),
+            Task(t("Gather FFprobe version"), ffprobe_configuration),
+            Task(t("Gather FFmpeg audio encoders"), ffmpeg_audio_encoders),
+            Task(t("Determine OpenCL Support"), ffmpeg_opencl_support),
+        ]
+        startup_tasks = checks + [
+            Task(t("Save FFmpeg details"), save_ffmpeg_capabilities, depends_on=[x.name for x in checks]),
+            Task(t("Initialize Encoders"), init_encoders, depends_on=[t("Gather FFmpeg version")]),
+        ]
 
     try:
-        ProgressBar(app, startup_tasks)
+        ProgressBar(app, startup_tasks, concurrent=True)
     except Exception:
         logger.exception(f'{t("Could not start FastFlix")}!')
         sys.exit(1)
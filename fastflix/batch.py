@@ -0,0 +1,350 @@
+# -*- coding: utf-8 -*-
+"""
+Headless batch encoding
+
+    python -m fastflix batch <files or folders> [--profile NAME] [--output DIR] [--jobs N]
+
+Sources are probed with the same flix functions the GUI uses, turned into commands by the encoder's
+own command builder and run on the conversion worker's encoding slots.
+Nothing here may import fastflix.widgets or PySide6, so it starts quickly and works without a display.
+"""
+import argparse
+import datetime
+import logging
+import secrets
+import shutil
+import sys
+import time
+from pathlib import Path
+from queue import Empty, Queue
+from types import SimpleNamespace
+from typing import Optional
+
+import reusables
+
+from fastflix.audio_processing import apply_audio_filters
+from fastflix.command_runner import ProgressEvent
+from fastflix.conversion_worker import EncodeSlot, log_path
+from fastflix.encoders.common.plugin import encoder_plugins
+from fastflix.exceptions import FastFlixError, FlixError, MissingFF
+from fastflix.flix import (
+    analyze_source,
+    detect_hdr10_plus,
+    ffmpeg_configuration,
+    ffprobe_configuration,
+    load_ffmpeg_capabilities,
+    parse,
+)
+from fastflix.models.config import Config
+from fastflix.models.encode import AudioTrack, SubtitleTrack, setting_types
+from fastflix.models.fastflix import FastFlix
+from fastflix.models.video import Video
+from fastflix.version import __version__
+
+logger = logging.getLogger("fastflix")
+
+__all__ = ["main"]
+
+progress_report_interval = 5  # seconds, keeps render node logs readable
+
+
+class BatchItem:
+    def __init__(self, video: Video):
+        self.video = video
+        self.command_index = 0
+        self.started = time.time()
+        self.last_report = 0.0
+
+    @property
+    def name(self):
+        return self.video.source.name
+
+    @property
+    def commands(self):
+        return self.video.video_settings.conversion_commands
+
+
+def encoder_for_profile(profile_encoder: str) -> str:
+    for profile_name, settings_class in setting_types.items():
+        if settings_class.__fields__["name"].default == profile_encoder:
+            return profile_name
+    raise FastFlixError(f"Unknown encoder in profile: {profile_encoder}")
+
+
+def find_sources(paths: list[str]) -> list[Path]:
+    sources = []
+    for item in paths:
+        path = Path(item).expanduser()
+        if path.is_dir():
+            # Concat lists are only used when asked for directly
+            sources.extend(
+                x for x in sorted(path.iterdir()) if x.is_file() and not x.name.startswith(".") and x.suffix != ".txt"
+            )
+        elif path.exists():
+            sources.append(path)
+        else:
+            logger.error(f"Source does not exist: {path}")
+    return sources
+
+
+def output_path(config: Config, source: Path, output_dir: Optional[Path], extension: str) -> Path:
+    directory = output_dir or config.output_directory or source.parent
+    name = (config.output_name_format or "{source}-fastflix-{rand_4}.{ext}").format(
+        source=source.stem,
+        datetime=datetime.datetime.now().isoformat().replace(":", "-").split(".")[0],
+        rand_4=secrets.token_hex(2),
+        rand_8=secrets.token_hex(4),
+        ext=extension,
+    )
+    return Path(directory) / name
+
+
+def audio_tracks(fastflix: FastFlix) -> list[AudioTrack]:
+    profile = fastflix.config.profile
+    streams = fastflix.current_video.streams.audio
+    if profile.audio_filters:
+        matches = apply_audio_filters(profile.audio_filters, original_tracks=streams)
+    else:
+        matches = [(track, None) for track in streams]
+
+    tracks = []
+    for outdex, (track, match) in enumerate(matches, start=1):
+        tags = track.get("tags", {})
+        tracks.append(
+            AudioTrack(
+                index=track.index,
+                outdex=outdex,
+                codec=track.get("codec_name", ""),
+                title=tags.get("title", ""),
+                language=tags.get("language", ""),
+                profile=track.get("profile"),
+                channels=track.get("channels", 2),
+                conversion_codec=(match.conversion or "") if match else "",
+                conversion_bitrate=(match.bitrate or "") if match else "",
+                downmix=match.downmix if match else None,
+                original=True,
+                raw_info=track,
+            )
+        )
+    return tracks
+
+
+def subtitle_tracks(fastflix: FastFlix, first_outdex: int) -> list[SubtitleTrack]:
+    tracks = []
+    for outdex, track in enumerate(fastflix.current_video.streams.subtitle, start=first_outdex):
+        disposition = track.get("disposition", {})
+        tracks.append(
+            SubtitleTrack(
+                index=track.index,
+                outdex=outdex,
+                disposition="forced" if disposition.get("forced") else "default" if disposition.get("default") else "",
+                language=track.get("tags", {}).get("language", ""),
+            )
+        )
+    return tracks
+
+
+def prepare_video(fastflix: FastFlix, encoder: str, source: Path, output_dir: Optional[Path]) -> Video:
+    config = fastflix.config
+    profile = config.profile
+    # Only the builder is ever used here, so the encoder's Qt settings panel is never imported
+    plugin = encoder_plugins()[profile.encoder]
+
+    work_path = config.work_path / f"temp_{secrets.token_hex(12)}"
+    work_path.mkdir(parents=True)
+    fastflix.current_video = Video(source=source, work_path=work_path)
+    # The flix functions only need an object with a .fastflix attribute, not the Qt application
+    app = SimpleNamespace(fastflix=fastflix)
+
+    parse(app)
+    analyze_source(app, config=config)
+    detect_hdr10_plus(app, config=config)
+
+    video = fastflix.current_video
+    settings = video.video_settings
+    detected_crop, settings.crop = settings.crop, None
+    settings.output_path = output_path(config, source, output_dir, plugin.video_extension)
+    settings.fast_seek = profile.fast_seek
+    settings.rotate = profile.rotate
+    settings.vertical_flip = profile.vertical_flip
+    settings.horizontal_flip = profile.horizontal_flip
+    settings.copy_chapters = profile.copy_chapters
+    settings.remove_metadata = profile.remove_metadata
+    settings.remove_hdr = profile.remove_hdr
+    for key, value in profile.advanced_options.dict(exclude={"denoise_type_index", "denoise_strength_index"}).items():
+        setattr(settings, key, value)
+    if (
+        profile.auto_crop
+        and detected_crop
+        and (detected_crop.width, detected_crop.height) != (video.width, video.height)
+    ):
+        settings.crop = detected_crop
+
+    encoder_settings = getattr(profile, encoder) or setting_types[encoder]()
+    settings.video_encoder_settings = encoder_settings.copy(deep=True)
+    if plugin.enable_audio:
+        settings.audio_tracks = audio_tracks(fastflix)
+    if plugin.enable_subtitles:
+        settings.subtitle_tracks = subtitle_tracks(fastflix, first_outdex=len(settings.audio_tracks) + 1)
+
+    commands = plugin.build(fastflix)
+    if not commands:
+        raise FastFlixError(f"{profile.encoder} could not build commands for {source}")
+    settings.conversion_commands = commands
+    return video
+
+
+def report_progress(item: BatchItem, event: ProgressEvent):
+    now = time.time()
+    # The finished message covers the end of each command
+    if event.done or now - item.last_report < progress_report_interval:
+        return
+    item.last_report = now
+    settings = item.video.video_settings
+    length = (settings.end_time or item.video.duration) - (settings.start_time or 0)
+    percent = min(100.0, (event.out_time_us / 1_000_000) / length * 100) if length > 0 else 0
+    print(
+        f"{item.name} [{item.command_index + 1}/{len(item.commands)}] "
+        f"{percent:5.1f}% {event.fps:.1f} fps {event.speed:.2f}x",
+        flush=True,
+    )
+
+
+def run_queue(videos: list[Video], jobs: int, priority: str, verbose: bool) -> int:
+    log_path.mkdir(parents=True, exist_ok=True)
+    log_queue, progress_queue = Queue(), Queue()
+    slots = [EncodeSlot(i, log_queue, progress_queue) for i in range(max(1, jobs))]
+    running: dict[int, BatchItem] = {}
+    pending = [BatchItem(video) for video in videos]
+    failed = []
+
+    def start(slot: EncodeSlot, item: BatchItem):
+        command = item.commands[item.command_index]
+        logger.info(f"{item.name}: {command.name or 'Command'} ({item.command_index + 1}/{len(item.commands)})")
+        slot.video_uuid, slot.command_uuid = item.video.uuid, command.uuid
+        slot.start_command(
+            command.run_args,
+            work_dir=str(item.video.work_path),
+            log_name=item.video.video_settings.output_path.stem,
+            priority=priority,
+            chunks=command.chunks.dict() if command.chunks else None,
+        )
+        running[slot.slot] = item
+
+    try:
+        while pending or running:
+            for slot in slots:
+                item = running.get(slot.slot)
+                if item and not slot.runner.is_alive():
+                    slot.finish()
+                    del running[slot.slot]
+                    if slot.runner.error_detected:
+                        logger.error(f"{item.name}: {item.commands[item.command_index].name or 'command'} failed")
+                        failed.append(item)
+                    elif item.command_index + 1 < len(item.commands):
+                        item.command_index += 1
+                        start(slot, item)
+                    else:
+                        elapsed = datetime.timedelta(seconds=int(time.time() - item.started))
+                        logger.info(f"{item.name}: finished in {elapsed} -> {item.video.video_settings.output_path}")
+                        shutil.rmtree(item.video.work_path, ignore_errors=True)
+                if slot.slot not in running and pending:
+                    item = pending.pop(0)
+                    item.started = time.time()
+                    start(slot, item)
+
+            while True:
+                try:
+                    slot_number, line = log_queue.get_nowait()
+                except Empty:
+                    break
+                if verbose and not line.startswith(("CLEAR_WINDOW", "STOP_TIMER")):
+                    print(f"[{slot_number}] {line}", flush=True)
+            while True:
+                try:
+                    event = progress_queue.get_nowait()
+                except Empty:
+                    break
+                if event.slot in running:
+                    report_progress(running[event.slot], event)
+            time.sleep(0.1)
+    except KeyboardInterrupt:
+        logger.warning("Interrupted, stopping encodes")
+        for slot in slots:
+            if slot.busy:
+                slot.cancel()
+        return 1
+
+    for item in failed:
+        logger.error(f"Failed: {item.video.source} (work files kept in {item.video.work_path})")
+    logger.info(f"{len(videos) - len(failed)} of {len(videos)} videos encoded")
+    return 1 if failed else 0
+
+
+def main(arguments: list[str] = None, portable_mode: bool = False) -> int:
+    parser = argparse.ArgumentParser(prog="fastflix batch", description="Encode videos without the GUI")
+    parser.add_argument("sources", nargs="+", help="video files or folders of videos")
+    parser.add_argument("-p", "--profile", help="saved profile to use, defaults to the selected profile")
+    parser.add_argument("-o", "--output", type=Path, help="output folder, defaults to the configured one")
+    parser.add_argument("-j", "--jobs", type=int, help="videos to encode at the same time")
+    parser.add_argument("-v", "--verbose", action="store_true", help="show encoder output")
+    args = parser.parse_args(arguments)
+
+    logger.addHandler(reusables.get_stream_handler(level=logging.DEBUG if args.verbose else logging.INFO))
+    logger.setLevel(logging.DEBUG if args.verbose else logging.INFO)
+    logger.info(f"FastFlix {__version__} batch mode")
+
+    config = Config()
+    try:
+        config.load(portable_mode=portable_mode)
+    except MissingFF as err:
+        logger.error(f"Could not find {err}, please install FFmpeg or set it in the config file")
+        return 1
+    if args.profile:
+        if args.profile not in config.profiles:
+            logger.error(f"No profile named {args.profile}, choose from: {', '.join(config.profiles)}")
+            return 1
+        config.selected_profile = args.profile
+    try:
+        encoder = encoder_for_profile(config.profile.encoder)
+    except FastFlixError as err:
+        logger.error(str(err))
+        return 1
+    if args.output:
+        args.output.mkdir(parents=True, exist_ok=True)
+    fastflix = FastFlix(config=config)
+    try:
+        # The versions are part of the probe cache keys
+        if not load_ffmpeg_capabilities(SimpleNamespace(fastflix=fastflix), config):
+            ffmpeg_configuration(SimpleNamespace(fastflix=fastflix), config)
+            ffprobe_configuration(SimpleNamespace(fastflix=fastflix), config)
+    except FlixError as err:
+        logger.error(str(err))
+        return 1
+
+    videos = []
+    for source in find_sources(args.sources):
+        try:
+            videos.append(prepare_video(fastflix, encoder, source, args.output))
+        except Exception as err:
+            if isinstance(err, FastFlixError):
+                logger.warning(f"Skipping {source}: {err}")
+            elif isinstance(err, FlixError):
+                logger.warning(f"Skipping {source}, not a video file: {err}")
+            else:
+                logger.exception(f"Skipping {source}, could not prepare it: {err}")
+            if fastflix.current_video:
+                shutil.rmtree(fastflix.current_video.work_path, ignore_errors=True)
+        fastflix.current_video = None
+    if not videos:
+        logger.error("Nothing to encode")
+        return 1
+
+    logger.info(f"Encoding {len(videos)} videos with profile {config.selected_profile}")
+    return run_queue(
+        videos, jobs=args.jobs or config.concurrent_encodes, priority=config.priority, verbose=args.verbose
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
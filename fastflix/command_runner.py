@@ -2,14 +2,20 @@
 # -*- coding: utf-8 -*-
 import datetime
 import logging
+import os
+import re
 import secrets
+import selectors
 import shlex
+import time
+from collections import deque
 from pathlib import Path
 from subprocess import PIPE
-from threading import Thread
-from typing import Literal
+from threading import Lock, Thread
+from typing import Literal, NamedTuple
 
 from psutil import Popen
+import reusables
 
 try:
     from psutil import (
@@ -41,16 +47,57 @@ else:
 
 logger = logging.getLogger("fastflix-core")
 
-__all__ = ["BackgroundRunner"]
+# FFmpeg updates its status line with carriage returns, so treat those as line endings too
+line_split = re.compile(rb"[\r\n]+")
+
+# Keys FFmpeg writes with "-progress", each block of them ends with "progress=continue" or "progress=end"
+progress_keys = (
+    "frame",
+    "fps",
+    "bitrate",
+    "total_size",
+    "out_time_us",
+    "out_time_ms",
+    "out_time",
+    "dup_frames",
+    "drop_frames",
+    "speed",
+    "progress",
+)
+progress_interval = 0.5
+
+__all__ = ["BackgroundRunner", "ChunkedRunner", "ProgressEvent"]
+
+
+class ProgressEvent(NamedTuple):
+    slot: int
+    frame: int
+    fps: float
+    out_time_us: int
+    total_size: int
+    speed: float
+    done: bool = False
+
+
+def progress_number(value: str, kind=int):
+    try:
+        return kind(value.rstrip("x"))
+    except ValueError:
+        return kind(0)
 
 
 class BackgroundRunner:
-    def __init__(self, log_queue):
+    def __init__(self, log_queue, slot: int = 0, progress_queue=None):
         self.process = None
+        self.slot = slot
+        self.logger = logger.getChild(f"slot{slot}")
         self.killed = False
         self.output_file = None
-        self.error_output_file = None
         self.log_queue = log_queue
+        self.progress_queue = progress_queue
+        self.progress = {}
+        self.last_progress_sent = 0
+        self.reader = None
         self.error_detected = False
         self.success_detected = False
         self.error_message = []
@@ -59,30 +106,25 @@ class BackgroundRunner:
 
     def start_exec(self, command, work_dir: str = None, shell: bool = False, errors=(), successes=()):
         self.clean()
-        logger.debug(f"Using work dir: {work_dir}")
+        self.logger.debug(f"Using work dir: {work_dir}")
         work_path = Path(work_dir)
         work_path.mkdir(exist_ok=True, parents=True)
         self.output_file = work_path / f"encoder_output_{secrets.token_hex(6)}.log"
-        self.error_output_file = work_path / f"encoder_error_output_{secrets.token_hex(6)}.log"
-        logger.debug(f"command output file set to: {self.output_file}")
-        logger.debug(f"command error output file set to: {self.error_output_file}")
-        self.output_file.touch(exist_ok=True)
-        self.error_output_file.touch(exist_ok=True)
+        self.logger.debug(f"command output file set to: {self.output_file}")
         self.error_message = errors
         self.success_message = successes
-        logger.info(f"Running command: {command}")
+        self.logger.info(f"Running command: {command if isinstance(command, str) else ' '.join(command)}")
         try:
             self.process = Popen(
                 shlex.split(command.replace("\\", "\\\\")) if not shell and isinstance(command, str) else command,
                 shell=shell,
                 cwd=work_dir,
-                stdout=open(self.output_file, "w"),
-                stderr=open(self.error_output_file, "w"),
+                stdout=PIPE,
+                stderr=PIPE,
                 stdin=PIPE,  # FFmpeg can try to read stdin and wrecks havoc on linux
-                encoding="utf-8",
             )
         except PermissionError:
-            logger.error(
+            self.logger.error(
                 "Could not encode video due to permissions error."
                 "Please make sure encoder is executable and you have permissions to run it."
                 "Otherwise try running FastFlix as an administrator."
@@ -90,13 +132,14 @@ class BackgroundRunner:
             self.error_detected = True
             return
         except Exception:
-            logger.exception("Could not start worker process")
+            self.logger.exception("Could not start worker process")
             self.error_detected = True
             return
 
         self.started_at = datetime.datetime.now(datetime.timezone.utc)
 
-        Thread(target=self.read_output).start()
+        self.reader = Thread(target=self.read_output)
+        self.reader.start()
 
     def change_priority(
         self, new_priority: Literal["Realtime", "High", "Above Normal", "Normal", "Below Normal", "Idle"]
@@ -104,65 +147,121 @@ class BackgroundRunner:
         try:
             if self.process:
                 self.process.nice(priority_levels[new_priority])
-                logger.info(f"Set command priority to {new_priority}")
+                self.logger.info(f"Set command priority to {new_priority}")
         except Exception:
-            logger.exception(f"Could not set process priority to {new_priority}")
+            self.logger.exception(f"Could not set process priority to {new_priority}")
 
     def read_output(self):
-        with open(self.output_file, "r", encoding="utf-8", errors="ignore") as out_file, open(
-            self.error_output_file, "r", encoding="utf-8", errors="ignore"
-        ) as err_file:
-            while True:
-                if not self.is_alive():
-                    excess = out_file.read()
-                    logger.info(excess)
-                    self.log_queue.put(excess)
-
-                    err_excess = err_file.read()
-                    logger.info(err_excess)
-                    self.log_queue.put(err_excess)
-                    if self.process.returncode is not None and self.process.returncode > 0:
-                        self.error_detected = True
-                    break
-                line = out_file.readline().rstrip()
-                if line:
-                    logger.info(line)
-                    self.log_queue.put(line)
-                    if not self.success_detected:
-                        for success in self.success_message:
-                            if success in line:
-                                self.success_detected = True
-
-                err_line = err_file.readline().rstrip()
-                if err_line:
-                    logger.info(err_line)
-                    self.log_queue.put(err_line)
-                    if "Conversion failed!" in err_line or "Error during output" in err_line:
-                        self.error_detected = True
-                    if not self.error_detected:
-                        for error in self.error_message:
-                            if error in err_line:
-                                self.error_detected = True
+        """
+        Only wakes up when the encoder writes something, instead of polling the output.
+        Pipes can't be used with selectors on Windows, so there each pipe gets its own blocking reader thread.
+        """
+        with open(self.output_file, "wb") as raw_log:
+            if reusables.win_based:
+                readers = [
+                    Thread(target=self._read_pipe, args=(self.process.stdout, False, raw_log)),
+                    Thread(target=self._read_pipe, args=(self.process.stderr, True, raw_log)),
+                ]
+                for reader in readers:
+                    reader.start()
+                for reader in readers:
+                    reader.join()
+            else:
+                self._select_pipes(raw_log)
 
-        try:
-            self.output_file.unlink()
-            self.error_output_file.unlink()
-        except OSError:
-            pass
+        self.process.wait()
+        if self.process.returncode is not None and self.process.returncode > 0:
+            self.error_detected = True
+
+    def _select_pipes(self, raw_log):
+        buffers = {False: b"", True: b""}
+        with selectors.DefaultSelector() as selector:
+            selector.register(self.process.stdout, selectors.EVENT_READ, False)
+            selector.register(self.process.stderr, selectors.EVENT_READ, True)
+            while selector.get_map():
+                for key, _ in selector.select():
+                    is_error = key.data
+                    data = os.read(key.fileobj.fileno(), 65536)
+                    if not data:
+                        selector.unregister(key.fileobj)
+                        self._handle_line(buffers[is_error], is_error)
+                        continue
+                    raw_log.write(data)
+                    buffers[is_error] = self._split_lines(buffers[is_error] + data, is_error)
+
+    def _read_pipe(self, pipe, is_error, raw_log):
+        buffer = b""
+        while data := pipe.read1(65536):
+            raw_log.write(data)
+            buffer = self._split_lines(buffer + data, is_error)
+        self._handle_line(buffer, is_error)
+
+    def _split_lines(self, data: bytes, is_error: bool) -> bytes:
+        *lines, remainder = line_split.split(data)
+        for line in lines:
+            self._handle_line(line, is_error)
+        return remainder
 
-    def read(self, limit=None):
-        if not self.is_alive():
+    def _handle_line(self, raw_line: bytes, is_error: bool):
+        line = raw_line.decode("utf-8", errors="ignore").rstrip()
+        if not line:
             return
-        return self.process.stdout.read(limit)
+        if not is_error and self._handle_progress(line):
+            return
+        self.logger.info(line)
+        self.log_queue.put((self.slot, line))
+        if is_error:
+            if "Conversion failed!" in line or "Error during output" in line:
+                self.error_detected = True
+            if not self.error_detected:
+                for error in self.error_message:
+                    if error in line:
+                        self.error_detected = True
+        elif not self.success_detected:
+            for success in self.success_message:
+                if success in line:
+                    self.success_detected = True
+
+    def _handle_progress(self, line: str) -> bool:
+        key, sep, value = line.partition("=")
+        if not sep or key not in progress_keys:
+            return False
+        if key != "progress":
+            self.progress[key] = value.strip()
+            return True
+
+        done = value.strip() == "end"
+        now = time.monotonic()
+        if self.progress_queue is not None and (done or now - self.last_progress_sent >= progress_interval):
+            self.last_progress_sent = now
+            self.progress_queue.put(
+                ProgressEvent(
+                    slot=self.slot,
+                    frame=progress_number(self.progress.get("frame", "0")),
+                    fps=progress_number(self.progress.get("fps", "0"), float),
+                    out_time_us=progress_number(self.progress.get("out_time_us", "0")),
+                    total_size=progress_number(self.progress.get("total_size", "0")),
+                    speed=progress_number(self.progress.get("speed", "0"), float),
+                    done=done,
+                )
+            )
+        self.progress = {}
+        return True
 
     def is_alive(self):
         if not self.process:
             return False
+        if self.reader and self.reader.is_alive():
+            # Still draining the last of the output, so errors may yet be detected
+            return True
         return True if self.process.poll() is None else False
 
     def clean(self):
         self.kill(log=False)
         self.process = None
+        self.reader = None
+        self.progress = {}
+        self.last_progress_sent = 0
         self.error_detected = False
         self.success_detected = False
         self.killed = False
@@ -171,7 +270,7 @@ class BackgroundRunner:
     def kill(self, log=True):
         if self.process and self.process.poll() is None:
             if log:
-                logger.info(f"Killing worker process {self.process.pid}")
+                self.logger.info(f"Killing worker process {self.process.pid}")
             try:
                 # if reusables.win_based:
                 #     os.kill(self.process.pid, signal.CTRL_C_EVENT)
@@ -181,9 +280,14 @@ class BackgroundRunner:
                 self.process.kill()
             except Exception as err:
                 if log:
-                    logger.exception(f"Couldn't terminate process: {err}")
+                    self.logger.exception(f"Couldn't terminate process: {err}")
         self.killed = True
 
+    def wait(self, timeout: float = None):
+        """Wait for the output of the process to be read to the end"""
+        if self.reader:
+            self.reader.join(timeout)
+
     def pause(self):
         if not self.process:
             return False
@@ -193,3 +297,181 @@ class BackgroundRunner:
         if not self.process:
             return False
         self.process.resume()
+
+
+class ChunkedRunner:
+    """
+    Encodes the chunks of a ChunkPlan with up to `workers` BackgroundRunners at once.
+    Each chunk runs its own commands in order, and once every chunk is done the concat file is written.
+    """
+
+    def __init__(self, log_queue, slot: int = 0, progress_queue=None):
+        self.slot = slot
+        self.logger = logger.getChild(f"slot{slot}")
+        self.log_queue = log_queue
+        self.progress_queue = progress_queue
+        self.runners: list[BackgroundRunner] = []
+        self.manager = None
+        self.priority = "Normal"
+        self.paused = False
+        self.killed = False
+        self.error_detected = False
+        self.success_detected = False
+        self.started_at = None
+        self.chunk_progress: dict[int, ProgressEvent] = {}
+        self.progress_lock = Lock()
+        self.last_progress_sent = 0
+
+    def start_exec(self, plan: dict, work_dir: str = None):
+        self.clean()
+        self.started_at = datetime.datetime.now(datetime.timezone.utc)
+        Path(plan["concat_file"]).parent.mkdir(parents=True, exist_ok=True)
+        self.manager = Thread(target=self.run_chunks, args=(plan, work_dir))
+        self.manager.start()
+
+    def run_chunks(self, plan: dict, work_dir: str):
+        finished = self.finished_chunks(plan)
+        pending = deque(
+            (i, deque(commands)) for i, commands in enumerate(plan.get("args") or plan["commands"]) if i not in finished
+        )
+        workers = max(int(plan.get("workers", 1)), 1)
+        active: list[tuple[int, BackgroundRunner, deque]] = []
+        if finished:
+            self.logger.info(f"Resuming, {len(finished)} of {len(plan['commands'])} chunks were already encoded")
+        self.logger.info(f"Encoding {len(pending)} chunks, {workers} at a time")
+
+        while (pending or active) and not self.killed and not self.error_detected:
+            while pending and len(active) < workers and not self.paused:
+                chunk, commands = pending.popleft()
+                runner = BackgroundRunner(self.log_queue, self.slot, progress_queue=ChunkProgress(self, chunk))
+                self.runners.append(runner)
+                self.logger.info(f"Starting chunk {chunk + 1}")
+                runner.start_exec(commands.popleft(), work_dir=work_dir)
+                runner.change_priority(self.priority)
+                active.append((chunk, runner, commands))
+
+            for item in active.copy():
+                chunk, runner, commands = item
+                if runner.is_alive():
+                    continue
+                if runner.error_detected or runner.killed:
+                    self.logger.error(f"Chunk {chunk + 1} failed")
+                    self.error_detected = True
+                    break
+                if commands:
+                    runner.start_exec(commands.popleft(), work_dir=work_dir)
+                    runner.change_priority(self.priority)
+                    continue
+                self.logger.info(f"Chunk {chunk + 1} complete")
+                self.checkpoint(plan, chunk)
+                active.remove(item)
+                self.runners.remove(runner)
+            time.sleep(0.2)
+
+        if self.killed or self.error_detected:
+            for _, runner, _ in active:
+                runner.kill()
+            return
+
+        with open(plan["concat_file"], "w", encoding="utf-8") as concat_file:
+            for output in plan["outputs"]:
+                # Quotes in paths are closed, escaped and opened again, the concat demuxer's own way
+                path = Path(output).as_posix().replace("'", "'\\''")
+                concat_file.write(f"file '{path}'\n")
+        self.success_detected = True
+
+    def finished_chunks(self, plan: dict) -> set[int]:
+        """Chunks recorded as finished by an earlier run whose output is still there"""
+        checkpoint_file = Path(plan.get("checkpoint_file") or "")
+        if not plan.get("checkpoint_file") or not checkpoint_file.exists():
+            return set()
+        finished = set()
+        for line in checkpoint_file.read_text(encoding="utf-8").splitlines():
+            try:
+                chunk = int(line.strip())
+            except ValueError:
+                continue
+            output = Path(plan["outputs"][chunk]) if chunk < len(plan["outputs"]) else None
+            if output and output.exists() and output.stat().st_size:
+                finished.add(chunk)
+        return finished
+
+    def checkpoint(self, plan: dict, chunk: int):
+        if not plan.get("checkpoint_file"):
+            return
+        with open(plan["checkpoint_file"], "a", encoding="utf-8") as checkpoint_file:
+            checkpoint_file.write(f"{chunk}\n")
+            checkpoint_file.flush()
+            os.fsync(checkpoint_file.fileno())
+
+    def update_progress(self, chunk: int, event: ProgressEvent):
+        # Progress of every running chunk is combined, so the time left covers the whole video
+        with self.progress_lock:
+            self.chunk_progress[chunk] = event
+            now = time.monotonic()
+            if self.progress_queue is None or now - self.last_progress_sent < progress_interval:
+                return
+            self.last_progress_sent = now
+            events = list(self.chunk_progress.values())
+        self.progress_queue.put(
+            ProgressEvent(
+                slot=self.slot,
+                frame=sum(x.frame for x in events),
+                fps=sum(x.fps for x in events if not x.done),
+                out_time_us=sum(x.out_time_us for x in events),
+                total_size=sum(x.total_size for x in events),
+                speed=sum(x.speed for x in events if not x.done),
+            )
+        )
+
+    def change_priority(
+        self, new_priority: Literal["Realtime", "High", "Above Normal", "Normal", "Below Normal", "Idle"]
+    ):
+        self.priority = new_priority
+        for runner in self.runners.copy():
+            runner.change_priority(new_priority)
+
+    def is_alive(self):
+        return bool(self.manager and self.manager.is_alive())
+
+    def clean(self):
+        self.kill(log=False)
+        self.runners = []
+        self.manager = None
+        self.paused = False
+        self.killed = False
+        self.error_detected = False
+        self.success_detected = False
+        self.started_at = None
+        self.chunk_progress = {}
+        self.last_progress_sent = 0
+
+    def kill(self, log=True):
+        self.killed = True
+        for runner in self.runners.copy():
+            runner.kill(log=log)
+
+    def wait(self, timeout: float = None):
+        if self.manager:
+            self.manager.join(timeout)
+
+    def pause(self):
+        self.paused = True
+        for runner in self.runners.copy():
+            runner.pause()
+
+    def resume(self):
+        self.paused = False
+        for runner in self.runners.copy():
+            runner.resume()
+
+
+class ChunkProgress:
+    """Stands in for the progress queue of a single chunk's runner"""
+
+    def __init__(self, chunked_runner: ChunkedRunner, chunk: int):
+        self.chunked_runner = chunked_runner
+        self.chunk = chunk
+
+    def put(self, event: ProgressEvent):
+        self.chunked_runner.update_progress(self.chunk, event)
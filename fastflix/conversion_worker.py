@@ -8,7 +8,7 @@ import reusables
 from appdirs import user_data_dir
 from pathvalidate import sanitize_filename
 
-from fastflix.command_runner import BackgroundRunner
+from fastflix.command_runner import BackgroundRunner, ChunkedRunner
 from fastflix.language import t
 from fastflix.shared import file_date
 
@@ -18,58 +18,94 @@ logger = logging.getLogger("fastflix-core")
 log_path = Path(user_data_dir("FastFlix", appauthor=False, roaming=True)) / "logs"
 
 
-@reusables.log_exception(log="fastflix-core")
-def queue_worker(gui_proc, worker_queue, status_queue, log_queue):
-    runner = BackgroundRunner(log_queue=log_queue)
-    gui_died = False
-    currently_encoding = False
-    video_uuid = None
-    command_uuid = None
-    command = None
-    work_dir = None
-    log_name = ""
-    priority: Literal["Realtime", "High", "Above Normal", "Normal", "Below Normal", "Idle"] = "Normal"
+class EncodeSlot:
+    """One concurrent encoding lane, each with its own runner and conversion log file"""
 
-    def start_command():
-        nonlocal currently_encoding
-        log_queue.put(f"CLEAR_WINDOW:{video_uuid}:{command_uuid}")
-        reusables.remove_file_handlers(logger)
+    def __init__(self, slot: int, log_queue, progress_queue=None):
+        self.slot = slot
+        self.log_queue = log_queue
+        self.background_runner = BackgroundRunner(log_queue=log_queue, slot=slot, progress_queue=progress_queue)
+        self.chunked_runner = ChunkedRunner(log_queue=log_queue, slot=slot, progress_queue=progress_queue)
+        self.runner = self.background_runner
+        self.currently_encoding = False
+        self.video_uuid = None
+        self.command_uuid = None
+
+    def start_command(self, command, work_dir, log_name, priority, chunks=None):
+        self.log_queue.put((self.slot, f"CLEAR_WINDOW:{self.video_uuid}:{self.command_uuid}"))
+        reusables.remove_file_handlers(self.runner.logger)
         new_file_handler = reusables.get_file_handler(
             log_path / sanitize_filename(f"flix_conversion_{log_name}_{file_date()}.log"),
             level=logging.DEBUG,
             log_format="%(asctime)s - %(message)s",
             encoding="utf-8",
         )
-        logger.addHandler(new_file_handler)
-        currently_encoding = True
-        runner.start_exec(
-            command,
-            work_dir=work_dir,
-        )
-        runner.change_priority(priority)
+        self.runner.logger.addHandler(new_file_handler)
+        self.currently_encoding = True
+        if chunks:
+            self.runner = self.chunked_runner
+            self.runner.start_exec(chunks, work_dir=work_dir)
+        else:
+            self.runner = self.background_runner
+            self.runner.start_exec(
+                command,
+                work_dir=work_dir,
+            )
+        self.runner.change_priority(priority)
 
-    while True:
-        if currently_encoding and not runner.is_alive():
-            reusables.remove_file_handlers(logger)
-            log_queue.put("STOP_TIMER")
-            currently_encoding = False
+    def cancel(self):
+        self.runner.kill()
+        # A restart can be sent right after the cancel, the killed runner must be done by then or it is refused
+        self.runner.wait(timeout=10)
+        self.finish()
+
+    def finish(self):
+        reusables.remove_file_handlers(self.runner.logger)
+        self.log_queue.put((self.slot, "STOP_TIMER"))
+        self.currently_encoding = False
+
+    @property
+    def busy(self):
+        return self.currently_encoding or self.runner.is_alive()
 
-            if runner.error_detected:
-                logger.info(t("Error detected while converting"))
 
-                status_queue.put(("error", video_uuid, command_uuid))
-                if gui_died:
-                    return
+@reusables.log_exception(log="fastflix-core")
+def queue_worker(gui_proc, worker_queue, status_queue, log_queue, progress_queue=None):
+    slots: dict[int, EncodeSlot] = {}
+    gui_died = False
+    priority: Literal["Realtime", "High", "Above Normal", "Normal", "Below Normal", "Idle"] = "Normal"
+
+    def get_slot(slot_number: int) -> EncodeSlot:
+        if slot_number not in slots:
+            slots[slot_number] = EncodeSlot(slot_number, log_queue, progress_queue)
+        return slots[slot_number]
+
+    def requested_slots(request) -> list[EncodeSlot]:
+        # Pause, resume and cancel can target a single slot, or every slot if none is given
+        if len(request) > 1 and request[1] is not None:
+            return [get_slot(int(request[1]))]
+        return list(slots.values())
+
+    while True:
+        for slot in slots.values():
+            if not slot.currently_encoding or slot.runner.is_alive():
                 continue
+            slot.finish()
 
-            status_queue.put(("complete", video_uuid, command_uuid))
-            if gui_died:
-                return
+            if slot.runner.error_detected:
+                logger.info(f"{t('Error detected while converting')} ({t('slot')} {slot.slot})")
+                status_queue.put(("error", slot.video_uuid, slot.command_uuid, slot.slot))
+                continue
+
+            status_queue.put(("complete", slot.video_uuid, slot.command_uuid, slot.slot))
+
+        if gui_died and not any(slot.busy for slot in slots.values()):
+            return
 
         if not gui_died and not gui_proc.is_alive():
             gui_proc.join()
             gui_died = True
-            if runner.is_alive() or currently_encoding:
+            if any(slot.busy for slot in slots.values()):
                 logger.info(t("The GUI might have died, but I'm going to keep converting!"))
             else:
                 logger.debug(t("Conversion worker shutting down"))
@@ -83,31 +119,43 @@ def queue_worker(gui_proc, worker_queue, status_queue, log_queue):
             return
         else:
             if request[0] == "execute":
-                _, video_uuid, command_uuid, command, work_dir, log_name = request
-                start_command()
+                _, video_uuid, command_uuid, command, work_dir, log_name, slot_number, chunks = request
+                slot = get_slot(slot_number or 0)
+                if slot.busy:
+                    logger.error(f"Slot {slot.slot} is already encoding, cannot start {video_uuid}:{command_uuid}")
+                    # Not an error of the video, and the slot must stay taken by what is running in it
+                    status_queue.put(("rejected", video_uuid, command_uuid, slot.slot))
+                    continue
+                slot.video_uuid = video_uuid
+                slot.command_uuid = command_uuid
+                slot.start_command(command, work_dir, log_name, priority, chunks)
 
             if request[0] == "cancel":
                 logger.debug(t("Cancel has been requested, killing encoding"))
-                runner.kill()
-                currently_encoding = False
-                status_queue.put(("cancelled", video_uuid, command_uuid))
-                log_queue.put("STOP_TIMER")
+                for slot in requested_slots(request):
+                    if not slot.busy:
+                        continue
+                    slot.cancel()
+                    status_queue.put(("cancelled", slot.video_uuid, slot.command_uuid, slot.slot))
 
             if request[0] == "pause encode":
                 logger.debug(t("Command worker received request to pause current encode"))
-                try:
-                    runner.pause()
-                except Exception:
-                    logger.exception("Could not pause command")
+                for slot in requested_slots(request):
+                    try:
+                        slot.runner.pause()
+                    except Exception:
+                        logger.exception(f"Could not pause command in slot {slot.slot}")
 
             if request[0] == "resume encode":
                 logger.debug(t("Command worker received request to resume paused encode"))
-                try:
-                    runner.resume()
-                except Exception:
-                    logger.exception("Could not resume command")
+                for slot in requested_slots(request):
+                    try:
+                        slot.runner.resume()
+                    except Exception:
+                        logger.exception(f"Could not resume command in slot {slot.slot}")
 
             if request[0] == "priority":
                 priority = request[1]
-                if runner.is_alive():
-                    runner.change_priority(priority)
+                for slot in slots.values():
+                    if slot.runner.is_alive():
+                        slot.runner.change_priority(priority)
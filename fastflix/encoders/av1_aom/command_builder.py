@@ -2,6 +2,7 @@
 import re
 import secrets
 
+from fastflix.encoders.common.chunked import build_chunked, chunk_boundaries
 from fastflix.encoders.common.helpers import Command, generate_all, generate_color_details, null
 from fastflix.models.encode import AOMAV1Settings
 from fastflix.models.fastflix import FastFlix
@@ -9,6 +10,9 @@ from fastflix.models.fastflix import FastFlix
 
 def build(fastflix: FastFlix):
     settings: AOMAV1Settings = fastflix.current_video.video_settings.video_encoder_settings
+    if boundaries := chunk_boundaries(fastflix):
+        return build_chunked(fastflix, build, boundaries)
+
     beginning, ending = generate_all(fastflix, "libaom-av1")
 
     beginning += (
@@ -65,6 +65,8 @@ class AV1(SettingPanel):
         grid.addLayout(self.init_usage(), 4, 0, 1, 2)
         grid.addLayout(self.init_max_mux(), 5, 0, 1, 2)
         grid.addLayout(self.init_pix_fmt(), 6, 0, 1, 2)
+        grid.addLayout(self.init_chunks(), 7, 0, 1, 2)
+        grid.addLayout(self.init_chunk_workers(), 8, 0, 1, 2)
 
         grid.addLayout(self.init_modes(), 0, 2, 5, 4)
 
@@ -160,6 +162,8 @@ class AV1(SettingPanel):
             tile_rows=self.widgets.tile_rows.currentText(),
             tile_columns=self.widgets.tile_columns.currentText(),
             max_muxing_queue_size=self.widgets.max_mux.currentText(),
+            chunks=self.widgets.chunks.currentText(),
+            chunk_workers=self.widgets.chunk_workers.currentText(),
             pix_fmt=self.widgets.pix_fmt.currentText().split(":")[1].strip(),
             extra=self.ffmpeg_extras,
             extra_both_passes=self.widgets.extra_both_passes.isChecked(),
@@ -1,21 +1,17 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 __author__ = "Chris Griffith"
-from pathlib import Path
-
-import pkg_resources
+from fastflix.encoders.common.plugin import lazy_plugin
 
 name = "AVC (x264)"
 requires = "libx264"
 
 video_extension = "mkv"
 video_dimension_divisor = 1
-icon = str(Path(pkg_resources.resource_filename(__name__, f"../../data/encoders/icon_x264.png")).resolve())
 
 enable_subtitles = True
 enable_audio = True
 enable_attachments = True
 enable_concat = True
 
-from fastflix.encoders.avc_x264.command_builder import build
-from fastflix.encoders.avc_x264.settings_panel import AVC as settings_panel
+__getattr__ = lazy_plugin(__name__, "AVC", icon="encoders/icon_x264.png")
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+import logging
+import os
+import secrets
+from typing import Callable
+
+from fastflix.encoders.common.audio import build_audio
+from fastflix.encoders.common.attachments import build_attachments
+from fastflix.encoders.common.helpers import (
+    ChunkPlan,
+    Command,
+    ffmpeg_progress,
+    generate_ending,
+    settings_snapshot,
+)
+from fastflix.encoders.common.subtitles import build_subtitle
+from fastflix.flix import keyframes_near
+from fastflix.models.fastflix import FastFlix
+from fastflix.packet_index import get_packet_index
+from fastflix.shared import clean_file_string
+
+logger = logging.getLogger("fastflix")
+
+minimum_chunk_length = 30  # seconds, anything shorter isn't worth the extra keyframe and process startup
+
+__all__ = ["chunk_boundaries", "build_chunked", "chunk_workers"]
+
+
+def chunk_workers(setting: str, chunks: int) -> int:
+    """ "auto" gives each worker roughly four cores, as these encoders already use a few threads each"""
+    if setting and setting != "auto":
+        return max(1, min(int(setting), chunks))
+    return max(1, min(chunks, (os.cpu_count() or 4) // 4))
+
+
+def chunk_boundaries(fastflix: FastFlix) -> list[tuple[float, float]]:
+    """
+    Split the selected time range into (start, end) pairs, moved to the nearest following keyframe.
+    Returns an empty list if the video should be encoded in one piece.
+    """
+    video = fastflix.current_video
+    settings = video.video_settings.video_encoder_settings
+    try:
+        chunks = int(getattr(settings, "chunks", 1) or 1)
+    except ValueError:
+        return []
+    if chunks < 2:
+        return []
+
+    if video.concat:
+        logger.info("Chunked encoding does not support concatenating files, encoding in one piece")
+        return []
+    if getattr(settings, "hdr10plus_metadata", None):
+        logger.info("Chunked encoding can not split HDR10+ metadata, encoding in one piece")
+        return []
+    if any(track.burn_in for track in video.video_settings.subtitle_tracks):
+        logger.info("Chunked encoding does not support burning in subtitles, encoding in one piece")
+        return []
+
+    start = video.video_settings.start_time or 0
+    end = video.video_settings.end_time or video.duration
+    length = end - start
+    if length <= 0:
+        return []
+    chunks = min(chunks, int(length // minimum_chunk_length))
+    if chunks < 2:
+        return []
+
+    targets = tuple(round(start + (length / chunks) * i, 3) for i in range(1, chunks))
+    track = video.video_settings.selected_track
+    # The index is built in the background when a file is opened, only read the keyframe windows without it
+    index = get_packet_index(fastflix.config.ffprobe, video.source, track, fastflix.data_path / "packet_index", False)
+    if index:
+        cuts = [x if (x := index.keyframe_after(target, window=10)) is not None else target for target in targets]
+    else:
+        cuts = keyframes_near(fastflix.config.ffprobe, video.source, track, targets, window=10)
+    points = [start, *sorted(set(x for x in cuts if start < x < end)), end]
+    return list(zip(points[:-1], points[1:]))
+
+
+def build_chunked(fastflix: FastFlix, build: Callable, boundaries: list[tuple[float, float]]) -> list[Command]:
+    """
+    Build every chunk with the encoder's own build function, video only, then a stream copy
+    concatenate command that brings back the audio, subtitles and chapters from the source.
+    """
+    original = fastflix.current_video
+    chunk_dir = original.work_path / f"chunks_{secrets.token_hex(6)}"
+    outputs = []
+    chunk_commands = []
+
+    try:
+        for i, (start, end) in enumerate(boundaries):
+            chunk_video = original.copy(deep=True)
+            chunk_settings = chunk_video.video_settings
+            chunk_settings.start_time = start
+            chunk_settings.end_time = end
+            chunk_settings.fast_seek = True
+            chunk_settings.audio_tracks = []
+            chunk_settings.subtitle_tracks = []
+            chunk_settings.attachment_tracks = []
+            chunk_settings.copy_chapters = False
+            chunk_settings.remove_metadata = True
+            chunk_settings.video_encoder_settings.chunks = "1"
+            chunk_settings.output_path = chunk_dir / f"chunk_{i:04}.mkv"
+            fastflix.current_video = chunk_video
+            commands = build(fastflix)
+            if not commands:
+                return []
+            chunk_commands.append([x.command for x in commands])
+            outputs.append(str(chunk_settings.output_path))
+    finally:
+        fastflix.current_video = original
+
+    settings = original.video_settings
+    concat_file = chunk_dir / "chunks.txt"
+
+    subtitles, _, _ = build_subtitle(settings.subtitle_tracks)
+    ending = generate_ending(
+        **{
+            **settings_snapshot(fastflix),
+            "audio": build_audio(settings.audio_tracks),
+            "subtitles": subtitles,
+            "cover": build_attachments(settings.attachment_tracks),
+            "output_video": settings.output_path,
+            "output_fps": None,
+        }
+    )
+
+    # The source stays input 0 so the audio and subtitle maps from the normal builders still line up
+    time_settings = f'{f"-ss {settings.start_time}" if settings.start_time else ""} {f"-to {settings.end_time}" if settings.end_time else ""}'
+    concat_command = (
+        f'"{clean_file_string(fastflix.config.ffmpeg)}" -y {ffmpeg_progress} {time_settings} '
+        f'-i "{clean_file_string(original.source)}" -f concat -safe 0 -i "{concat_file}" '
+        f"-map 1:v:0 -c:v copy {ending}"
+    )
+
+    workers = chunk_workers(getattr(settings.video_encoder_settings, "chunk_workers", "auto"), len(boundaries))
+    return [
+        Command(
+            command="\n".join(x for commands in chunk_commands for x in commands),
+            name=f"Encode {len(boundaries)} chunks, {workers} at a time",
+            exe="ffmpeg",
+            chunks=ChunkPlan(
+                commands=chunk_commands,
+                outputs=outputs,
+                concat_file=str(concat_file),
+                checkpoint_file=str(chunk_dir / "completed_chunks.txt"),
+                workers=workers,
+            ),
+        ),
+        Command(command=concat_command, name="Concatenate chunks", exe="ffmpeg"),
+    ]
@@ -1,10 +1,11 @@
 # -*- coding: utf-8 -*-
+import shlex
 import uuid
 from pathlib import Path
 from typing import Tuple, Union, Optional
 
 import reusables
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, validator
 
 from fastflix.encoders.common.attachments import build_attachments
 from fastflix.encoders.common.audio import build_audio
@@ -16,14 +17,98 @@ null = "/dev/null"
 if reusables.win_based:
     null = "NUL"
 
+# Machine readable key=value progress blocks on stdout, read by the command runner
+ffmpeg_progress = "-progress pipe:1"
+
+
+def split_command(command: str) -> list[str]:
+    """Arguments of a command line as the builders write it, Windows path separators are kept as they are"""
+    return shlex.split(command.replace("\\", "\\\\"))
+
+
+def quote_arg(arg: str) -> str:
+    if arg and not any(x in "'\"" or x.isspace() for x in arg):
+        return arg
+    # Backslashes stay as they are inside double quotes, as split_command doubles them,
+    # so a double quote can't be escaped and is put in single quotes between the quoted pieces instead
+    return "'\"'".join(f'"{part}"' for part in arg.split('"'))
+
+
+def join_command(args: list[str]) -> str:
+    """Command line for arguments that split_command turns back into the same arguments"""
+    return " ".join(quote_arg(arg) for arg in args)
+
+
+def relocate_args(args: list[str], old_path: str, new_path: str) -> bool:
+    """Point every argument that is the path, or an option value holding it, at the new path"""
+    found = False
+    for i, arg in enumerate(args):
+        if old_path in arg:
+            args[i] = new_path if arg == old_path else arg.replace(old_path, new_path)
+            found = True
+    return found
+
+
+class ChunkPlan(BaseModel):
+    commands: list[list[str]]  # Each chunk's commands, run in order
+    outputs: list[str]
+    concat_file: str
+    checkpoint_file: str = ""  # Finished chunk numbers, so an interrupted encode can pick back up
+    workers: int = 1
+    args: list[list[list[str]]] = Field(default_factory=list)  # The commands split into arguments
+
+    @validator("args", always=True)
+    def split_commands(cls, v, values):
+        if v or "commands" not in values:
+            return v
+        try:
+            return [[split_command(command) for command in chunk] for chunk in values["commands"]]
+        except ValueError:
+            return []
+
 
 class Command(BaseModel):
-    command: str
+    command: str  # As shown to the user
     item = "command"
     name: str = ""
     exe: str = None
     shell: bool = False
     uuid: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    chunks: Optional[ChunkPlan] = None
+    # What is executed, split once when the command is built instead of every time it is run
+    args: list[str] = Field(default_factory=list)
+
+    @validator("args", always=True)
+    def split_command(cls, v, values):
+        if v or values.get("shell") or values.get("chunks") or "command" not in values:
+            return v
+        try:
+            return split_command(values["command"])
+        except ValueError:
+            # Unbalanced quotes, left for the runner to report
+            return []
+
+    @property
+    def run_args(self) -> Union[list[str], str]:
+        return self.args if self.args and not self.shell else self.command
+
+    @property
+    def inputs(self) -> list[str]:
+        return [self.args[i + 1] for i, arg in enumerate(self.args[:-1]) if arg in ("-i", "--input")]
+
+    @property
+    def output(self) -> str:
+        for i, arg in enumerate(self.args[:-1]):
+            if arg in ("-o", "--output"):
+                return self.args[i + 1]
+        return self.args[-1] if self.args else ""
+
+    def relocate(self, old_path: str, new_path: str) -> bool:
+        """Swap a file the command reads or writes for another one, False if the command does not use it"""
+        if not relocate_args(self.args, old_path, new_path):
+            return False
+        self.command = join_command(self.args)
+        return True
 
 
 def generate_ffmpeg_start(
@@ -60,6 +145,7 @@ def generate_ffmpeg_start(
         [
             f'"{ffmpeg}"',
             "-y",
+            ffmpeg_progress,
             time_one,
             incoming_fps,
             f"{'-f concat -safe 0' if concat else ''}",
@@ -209,10 +295,66 @@ def generate_filters(
     return f' -filter_complex "{filter_complex}" -map "[v]" '
 
 
+def settings_snapshot(fastflix: FastFlix) -> dict:
+    """
+    The video settings as one plain dict, to pass to every generate_* function of a build.
+    Track lists are left out, they are only read through build_audio / build_subtitle / build_attachments.
+    """
+    return fastflix.current_video.video_settings.dict(
+        exclude={"audio_tracks", "subtitle_tracks", "attachment_tracks", "conversion_commands"}
+    )
+
+
+def command_key(fastflix: FastFlix) -> int:
+    """
+    Hash of everything the command builders read, commands only have to be built again when it changes.
+    Streams and format only change when a video is loaded, so the source's size and modification time
+    stand in for their contents.
+    """
+    video = fastflix.current_video
+    skip = {"streams", "format", "status", "uuid", "video_settings", "conversion_commands", "profiles"}
+    # Tracks are plain values and can be hashed as they are, which is much faster than repr for long track lists
+    skip |= {"audio_tracks", "subtitle_tracks", "attachment_tracks"}
+
+    def fields(model) -> str:
+        return repr([(name, value) for name, value in model.__dict__.items() if name not in skip])
+
+    def values(track) -> tuple:
+        # The raw FFprobe info of audio tracks is large and never read by the builders
+        return tuple(value for name, value in track.__dict__.items() if name != "raw_info")
+
+    try:
+        stat = Path(video.source).stat()
+        source_stat = (stat.st_size, stat.st_mtime_ns)
+    except OSError:
+        source_stat = None
+
+    return hash(
+        (
+            fields(video),
+            source_stat,
+            fields(video.video_settings),
+            tuple(values(track) for track in video.video_settings.audio_tracks),
+            tuple(values(track) for track in video.video_settings.subtitle_tracks),
+            tuple(values(track) for track in video.video_settings.attachment_tracks),
+            fields(fastflix.config),
+            fastflix.opencl_support,
+            fastflix.ffmpeg_version,
+        )
+    )
+
+
 def generate_all(
-    fastflix: FastFlix, encoder: str, audio: bool = True, subs: bool = True, disable_filters: bool = False
+    fastflix: FastFlix,
+    encoder: str,
+    audio: bool = True,
+    subs: bool = True,
+    disable_filters: bool = False,
+    video_settings: Optional[dict] = None,
 ) -> Tuple[str, str]:
     settings = fastflix.current_video.video_settings.video_encoder_settings
+    if video_settings is None:
+        video_settings = settings_snapshot(fastflix)
 
     audio = build_audio(fastflix.current_video.video_settings.audio_tracks) if audio else ""
 
@@ -234,7 +376,7 @@ def generate_all(
             burn_in_subtitle_track=burn_in_track,
             burn_in_subtitle_type=burn_in_type,
             enable_opencl=fastflix.opencl_support,
-            **fastflix.current_video.video_settings.dict(),
+            **video_settings,
         )
 
     ending = generate_ending(
@@ -243,7 +385,7 @@ def generate_all(
         cover=attachments,
         output_video=fastflix.current_video.video_settings.output_path,
         disable_rotate_metadata=encoder == "copy",
-        **fastflix.current_video.video_settings.dict(),
+        **video_settings,
     )
 
     beginning = generate_ffmpeg_start(
@@ -253,7 +395,7 @@ def generate_all(
         filters=filters,
         concat=fastflix.current_video.concat,
         enable_opencl=fastflix.opencl_support,
-        **fastflix.current_video.video_settings.dict(),
+        **video_settings,
         **settings.dict(),
     )
 
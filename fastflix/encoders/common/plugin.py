@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+Encoder main modules only hold metadata (name, requirements, output extension and feature flags).
+Their command builder, Qt settings panel and icon path are looked up the first time they are used,
+so listing every encoder at startup does not load every settings panel.
+"""
+import importlib
+import importlib.resources
+import pkgutil
+import sys
+from functools import lru_cache
+from types import ModuleType
+
+__all__ = ["lazy_plugin", "encoder_plugins"]
+
+
+def lazy_plugin(main_module: str, settings_panel: str, icon: str = None):
+    """
+    Module level __getattr__ for an encoder's main module, providing its build, settings_panel
+    and icon (given relative to fastflix/data) on demand
+    """
+    package = main_module.rsplit(".", 1)[0]
+
+    def __getattr__(attr):
+        if attr == "build":
+            value = importlib.import_module(f"{package}.command_builder").build
+        elif attr == "settings_panel":
+            value = getattr(importlib.import_module(f"{package}.settings_panel"), settings_panel)
+        elif attr == "icon" and icon:
+            value = str(importlib.resources.files("fastflix").joinpath("data", *icon.split("/")))
+        else:
+            raise AttributeError(f"module {main_module!r} has no attribute {attr!r}")
+        setattr(sys.modules[main_module], attr, value)
+        return value
+
+    return __getattr__
+
+
+@lru_cache(maxsize=1)
+def encoder_plugins() -> dict[str, ModuleType]:
+    """Every encoder's main module, by encoder name"""
+    import fastflix.encoders
+
+    plugins = {}
+    for package in pkgutil.iter_modules(fastflix.encoders.__path__):
+        if package.ispkg and package.name != "common":
+            plugin = importlib.import_module(f"fastflix.encoders.{package.name}.main")
+            plugins[plugin.name] = plugin
+    return plugins
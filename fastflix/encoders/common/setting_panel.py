@@ -452,6 +452,27 @@ class SettingPanel(QtWidgets.QWidget):
             opt="max_muxing_queue_size",
         )
 
+    def init_chunks(self):
+        return self._add_combo_box(
+            label="Chunks",
+            tooltip=(
+                "Split the video at keyframes and encode the pieces at the same time\n"
+                "Audio, subtitles and chapters are copied back in when the pieces are joined"
+            ),
+            widget_name="chunks",
+            options=["1", "2", "4", "8", "16", "32", "64"],
+            opt="chunks",
+        )
+
+    def init_chunk_workers(self):
+        return self._add_combo_box(
+            label="Chunk Workers",
+            tooltip="How many chunks to encode at the same time\nauto uses about four CPU cores per chunk",
+            widget_name="chunk_workers",
+            options=["auto", "1", "2", "3", "4", "6", "8", "12", "16"],
+            opt="chunk_workers",
+        )
+
     def reload(self):
         """This will reset the current settings to what is set in "current_video", useful for return from queue"""
         global ffmpeg_extra_command
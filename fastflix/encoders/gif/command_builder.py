@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 import secrets
 
-from fastflix.encoders.common.helpers import Command, generate_filters
+from fastflix.encoders.common.helpers import Command, generate_filters, ffmpeg_progress, settings_snapshot
 from fastflix.models.encode import GIFSettings
 from fastflix.models.fastflix import FastFlix
 from fastflix.shared import clean_file_string
@@ -15,18 +15,15 @@ def build(fastflix: FastFlix):
     if settings.max_colors != "256":
         args += f":max_colors={settings.max_colors}"
 
-    palletgen_filters = generate_filters(
-        custom_filters=f"palettegen{args}", **fastflix.current_video.video_settings.dict()
-    )
+    video_settings = settings_snapshot(fastflix)
+    palletgen_filters = generate_filters(custom_filters=f"palettegen{args}", **video_settings)
 
-    filters = generate_filters(
-        custom_filters=f"fps={settings.fps:.2f}", raw_filters=True, **fastflix.current_video.video_settings.dict()
-    )
+    filters = generate_filters(custom_filters=f"fps={settings.fps:.2f}", raw_filters=True, **video_settings)
 
     output_video = clean_file_string(fastflix.current_video.video_settings.output_path)
 
     beginning = (
-        f'"{fastflix.config.ffmpeg}" -y '
+        f'"{fastflix.config.ffmpeg}" -y {ffmpeg_progress} '
         f'{f"-ss {fastflix.current_video.video_settings.start_time}" if fastflix.current_video.video_settings.start_time else ""} '
         f'{f"-to {fastflix.current_video.video_settings.end_time}" if fastflix.current_video.video_settings.end_time else ""} '
         f'{f"-r {fastflix.current_video.video_settings.source_fps } " if fastflix.current_video.video_settings.source_fps else ""}'
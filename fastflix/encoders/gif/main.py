@@ -1,15 +1,12 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 __author__ = "Chris Griffith"
-from pathlib import Path
-
-import pkg_resources
+from fastflix.encoders.common.plugin import lazy_plugin
 
 name = "GIF"
 
 video_extension = "gif"
 video_dimension_divisor = 1
-icon = str(Path(pkg_resources.resource_filename(__name__, f"../../data/encoders/icon_gif.png")).resolve())
 
 enable_subtitles = False
 enable_audio = False
@@ -18,5 +15,4 @@ enable_concat = False
 
 audio_formats = []
 
-from fastflix.encoders.gif.command_builder import build
-from fastflix.encoders.gif.settings_panel import GIF as settings_panel
+__getattr__ = lazy_plugin(__name__, "GIF", icon="encoders/icon_gif.png")
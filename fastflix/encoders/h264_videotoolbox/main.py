@@ -1,13 +1,10 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 __author__ = "Chris Griffith"
-from pathlib import Path
-
-import pkg_resources
+from fastflix.encoders.common.plugin import lazy_plugin
 
 name = "H264 (Video Toolbox)"
 requires = "videotoolbox"
-icon = str(Path(pkg_resources.resource_filename(__name__, f"../../data/encoders/icon_h264_toolbox.png")).resolve())
 
 
 video_extension = "mkv"
@@ -18,5 +15,4 @@ enable_audio = True
 enable_attachments = False
 enable_concat = True
 
-from fastflix.encoders.h264_videotoolbox.command_builder import build
-from fastflix.encoders.h264_videotoolbox.settings_panel import H264VideoToolbox as settings_panel
+__getattr__ = lazy_plugin(__name__, "H264VideoToolbox", icon="encoders/icon_h264_toolbox.png")
@@ -1,13 +1,10 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 __author__ = "Chris Griffith"
-from pathlib import Path
-
-import pkg_resources
+from fastflix.encoders.common.plugin import lazy_plugin
 
 name = "HEVC (Video Toolbox)"
 requires = "videotoolbox"
-icon = str(Path(pkg_resources.resource_filename(__name__, f"../../data/encoders/icon_hevc_toolbox.png")).resolve())
 
 
 video_extension = "mkv"
@@ -18,5 +15,4 @@ enable_audio = True
 enable_attachments = False
 enable_concat = True
 
-from fastflix.encoders.hevc_videotoolbox.command_builder import build
-from fastflix.encoders.hevc_videotoolbox.settings_panel import HEVCVideoToolbox as settings_panel
+__getattr__ = lazy_plugin(__name__, "HEVCVideoToolbox", icon="encoders/icon_hevc_toolbox.png")
@@ -2,6 +2,7 @@
 import re
 import secrets
 
+from fastflix.encoders.common.chunked import build_chunked, chunk_boundaries
 from fastflix.encoders.common.helpers import Command, generate_all, null
 from fastflix.models.encode import x265Settings
 from fastflix.models.fastflix import FastFlix
@@ -79,6 +80,8 @@ chromaloc_mapping = {"left": 0, "center": 1, "topleft": 2, "top": 3, "bottomleft
 
 def build(fastflix: FastFlix):
     settings: x265Settings = fastflix.current_video.video_settings.video_encoder_settings
+    if boundaries := chunk_boundaries(fastflix):
+        return build_chunked(fastflix, build, boundaries)
 
     beginning, ending = generate_all(fastflix, "libx265")
 
@@ -105,6 +105,8 @@ class HEVC(SettingPanel):
         grid.addLayout(self.init_aq_mode(), 6, 0, 1, 2)
         grid.addLayout(self.init_frame_threads(), 7, 0, 1, 2)
         grid.addLayout(self.init_max_mux(), 8, 0, 1, 2)
+        grid.addLayout(self.init_chunks(), 9, 0, 1, 2)
+        grid.addLayout(self.init_chunk_workers(), 10, 0, 1, 2)
         grid.addLayout(self.init_x265_row(), 6, 2, 1, 4)
         grid.addLayout(self.init_x265_row_two(), 7, 2, 1, 4)
         # grid.addLayout(self.init_hdr10_opt(), 5, 2, 1, 1)
@@ -577,6 +579,8 @@ class HEVC(SettingPanel):
             # intra_encoding=self.widgets.intra_encoding.isChecked(),
             intra_refresh=self.widgets.intra_refresh.isChecked(),
             max_muxing_queue_size=self.widgets.max_mux.currentText(),
+            chunks=self.widgets.chunks.currentText(),
+            chunk_workers=self.widgets.chunk_workers.currentText(),
             pix_fmt=self.widgets.pix_fmt.currentText().split(":")[1].strip(),
             profile=self.widgets.profile.currentText(),
             hdr10=self.widgets.hdr10.isChecked(),
@@ -7,6 +7,7 @@ from fastflix.models.video import Video
 from fastflix.models.fastflix import FastFlix
 from fastflix.encoders.common.encc_helpers import build_subtitle, build_audio
 from fastflix.flix import clean_file_string
+from fastflix.packet_index import get_packet_index
 
 logger = logging.getLogger("fastflix")
 
@@ -34,6 +35,15 @@ def build(fastflix: FastFlix):
         dhdr = f'--dhdr10-info "{settings.hdr10plus_metadata}"'
 
     trim = ""
+    index = None
+    if video.video_settings.end_time and not video.concat:
+        index = get_packet_index(
+            fastflix.config.ffprobe,
+            video.source,
+            video.video_settings.selected_track,
+            fastflix.data_path / "packet_index",
+            build=False,
+        )
     try:
         if "/" in video.frame_rate:
             over, under = [int(x) for x in video.frame_rate.split("/")]
@@ -43,7 +53,11 @@ def build(fastflix: FastFlix):
     except Exception:
         logger.exception("Could not get framerate of this movie!")
     else:
-        if video.video_settings.end_time:
+        if video.video_settings.end_time and index:
+            # Frame numbers from the packet times, which stay right for variable frame rate video
+            start_frame = index.frame_at(video.video_settings.start_time or 0)
+            trim = f"--trim {start_frame}:{index.frame_at(video.video_settings.end_time)}"
+        elif video.video_settings.end_time:
             end_frame = int(video.video_settings.end_time * rate)
             start_frame = 0
             if video.video_settings.start_time:
@@ -52,7 +66,7 @@ def build(fastflix: FastFlix):
         elif video.video_settings.start_time:
             trim = f"--seek {video.video_settings.start_time}"
 
-    if (video.frame_rate != video.average_frame_rate) and trim:
+    if (video.frame_rate != video.average_frame_rate) and trim and not index:
         logger.warning("Cannot use 'trim' when working with variable frame rate videos")
         trim = ""
 
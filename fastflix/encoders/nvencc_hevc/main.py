@@ -1,15 +1,12 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 __author__ = "Chris Griffith"
-from pathlib import Path
-
-import pkg_resources
+from fastflix.encoders.common.plugin import lazy_plugin
 
 name = "HEVC (NVEncC)"
 
 video_extension = "mkv"
 video_dimension_divisor = 1
-icon = str(Path(pkg_resources.resource_filename(__name__, f"../../data/encoders/icon_nvencc.png")).resolve())
 
 enable_subtitles = True
 enable_audio = True
@@ -95,5 +92,4 @@ audio_formats = [
     "wmav2",
 ]
 
-from fastflix.encoders.nvencc_hevc.command_builder import build
-from fastflix.encoders.nvencc_hevc.settings_panel import NVENCC as settings_panel
+__getattr__ = lazy_plugin(__name__, "NVENCC", icon="encoders/icon_nvencc.png")
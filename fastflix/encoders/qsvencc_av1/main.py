@@ -1,15 +1,12 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 __author__ = "Chris Griffith"
-from pathlib import Path
-
-import pkg_resources
+from fastflix.encoders.common.plugin import lazy_plugin
 
 name = "AV1 (QSVEncC)"
 
 video_extension = "mkv"
 video_dimension_divisor = 1
-icon = str(Path(pkg_resources.resource_filename(__name__, f"../../data/encoders/icon_qsvencc.png")).resolve())
 
 enable_subtitles = True
 enable_audio = True
@@ -95,5 +92,4 @@ audio_formats = [
     "wmav2",
 ]
 
-from fastflix.encoders.qsvencc_av1.command_builder import build
-from fastflix.encoders.qsvencc_av1.settings_panel import QSVEnc as settings_panel
+__getattr__ = lazy_plugin(__name__, "QSVEnc", icon="encoders/icon_qsvencc.png")
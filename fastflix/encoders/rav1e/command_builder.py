@@ -5,6 +5,7 @@ import logging
 import re
 import secrets
 
+from fastflix.encoders.common.chunked import build_chunked, chunk_boundaries
 from fastflix.encoders.common.helpers import Command, generate_all, generate_color_details, null
 from fastflix.models.encode import rav1eSettings
 from fastflix.models.fastflix import FastFlix
@@ -14,6 +15,9 @@ logger = logging.getLogger("fastflix")
 
 def build(fastflix: FastFlix):
     settings: rav1eSettings = fastflix.current_video.video_settings.video_encoder_settings
+    if boundaries := chunk_boundaries(fastflix):
+        return build_chunked(fastflix, build, boundaries)
+
     beginning, ending = generate_all(fastflix, "librav1e")
 
     beginning += (
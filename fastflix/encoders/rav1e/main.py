@@ -1,21 +1,17 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 __author__ = "Chris Griffith"
-from pathlib import Path
-
-import pkg_resources
+from fastflix.encoders.common.plugin import lazy_plugin
 
 name = "AV1 (rav1e)"
 requires = "librav1e"
 
 video_extension = "mkv"
 video_dimension_divisor = 8
-icon = str(Path(pkg_resources.resource_filename(__name__, f"../../data/encoders/icon_rav1e.png")).resolve())
 
 enable_subtitles = True
 enable_audio = True
 enable_attachments = True
 enable_concat = True
 
-from fastflix.encoders.rav1e.command_builder import build
-from fastflix.encoders.rav1e.settings_panel import RAV1E as settings_panel
+__getattr__ = lazy_plugin(__name__, "RAV1E", icon="encoders/icon_rav1e.png")
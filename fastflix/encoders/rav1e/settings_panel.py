@@ -75,6 +75,8 @@ class RAV1E(SettingPanel):
         grid.addLayout(self.init_tile_columns(), 3, 0, 1, 2)
         grid.addLayout(self.init_pix_fmt(), 4, 0, 1, 2)
         grid.addLayout(self.init_max_mux(), 5, 0, 1, 2)
+        grid.addLayout(self.init_chunks(), 6, 0, 1, 2)
+        grid.addLayout(self.init_chunk_workers(), 7, 0, 1, 2)
 
         grid.addLayout(self.init_modes(), 0, 2, 5, 4)
         grid.addLayout(self.init_single_pass(), 5, 2, 1, 1)
@@ -150,6 +152,8 @@ class RAV1E(SettingPanel):
             tiles=self.widgets.tiles.currentText(),
             single_pass=self.widgets.single_pass.isChecked(),
             max_muxing_queue_size=self.widgets.max_mux.currentText(),
+            chunks=self.widgets.chunks.currentText(),
+            chunk_workers=self.widgets.chunk_workers.currentText(),
             extra=self.ffmpeg_extras,
             extra_both_passes=self.widgets.extra_both_passes.isChecked(),
             pix_fmt=self.widgets.pix_fmt.currentText().split(":")[1].strip(),
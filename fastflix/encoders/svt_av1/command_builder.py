@@ -6,6 +6,7 @@ import secrets
 
 import reusables
 
+from fastflix.encoders.common.chunked import build_chunked, chunk_boundaries
 from fastflix.encoders.common.helpers import Command, generate_all, generate_color_details, null
 from fastflix.models.encode import SVTAV1Settings
 from fastflix.models.fastflix import FastFlix
@@ -16,6 +17,9 @@ logger = logging.getLogger("fastflix")
 @reusables.log_exception("fastflix", show_traceback=True)
 def build(fastflix: FastFlix):
     settings: SVTAV1Settings = fastflix.current_video.video_settings.video_encoder_settings
+    if boundaries := chunk_boundaries(fastflix):
+        return build_chunked(fastflix, build, boundaries)
+
     beginning, ending = generate_all(fastflix, "libsvtav1")
 
     beginning += f"-strict experimental " f"-preset {settings.speed} " f"{generate_color_details(fastflix)} "
@@ -79,6 +79,8 @@ class SVT_AV1(SettingPanel):
         grid.addLayout(self.init_qp_or_crf(), 5, 0, 1, 2)
         grid.addLayout(self.init_sc_detection(), 4, 0, 1, 2)
         grid.addLayout(self.init_max_mux(), 5, 0, 1, 2)
+        grid.addLayout(self.init_chunks(), 6, 0, 1, 2)
+        grid.addLayout(self.init_chunk_workers(), 7, 0, 1, 2)
         grid.addLayout(self.init_modes(), 0, 2, 5, 4)
         grid.addLayout(self.init_single_pass(), 6, 2, 1, 1)
         grid.addLayout(self.init_svtav1_params(), 5, 2, 1, 4)
@@ -194,6 +196,8 @@ class SVT_AV1(SettingPanel):
             qp_mode=self.widgets.qp_mode.currentText(),
             pix_fmt=self.widgets.pix_fmt.currentText().split(":")[1].strip(),
             max_muxing_queue_size=self.widgets.max_mux.currentText(),
+            chunks=self.widgets.chunks.currentText(),
+            chunk_workers=self.widgets.chunk_workers.currentText(),
             extra=self.ffmpeg_extras,
             extra_both_passes=self.widgets.extra_both_passes.isChecked(),
             svtav1_params=svtav1_params_text.split(":") if svtav1_params_text else [],
@@ -1,13 +1,10 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 __author__ = "Chris Griffith"
-from pathlib import Path
-
-import pkg_resources
+from fastflix.encoders.common.plugin import lazy_plugin
 
 name = "VP9"
 requires = "libvpx"
-icon = str(Path(pkg_resources.resource_filename(__name__, f"../../data/encoders/icon_vp9.png")).resolve())
 
 
 video_extension = "mkv"
@@ -18,5 +15,4 @@ enable_audio = True
 enable_attachments = False
 enable_concat = True
 
-from fastflix.encoders.vp9.command_builder import build
-from fastflix.encoders.vp9.settings_panel import VP9 as settings_panel
+__getattr__ = lazy_plugin(__name__, "VP9", icon="encoders/icon_vp9.png")
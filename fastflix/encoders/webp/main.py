@@ -1,16 +1,13 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 __author__ = "Chris Griffith"
-from pathlib import Path
-
-import pkg_resources
+from fastflix.encoders.common.plugin import lazy_plugin
 
 name = "WebP"
 
 requires = "libwebp"
 video_extension = "webp"
 video_dimension_divisor = 2
-icon = str(Path(pkg_resources.resource_filename(__name__, f"../../data/encoders/icon_webp.png")).resolve())
 
 enable_subtitles = False
 enable_audio = False
@@ -19,5 +16,4 @@ enable_concat = True
 
 audio_formats = []
 
-from fastflix.encoders.webp.command_builder import build
-from fastflix.encoders.webp.settings_panel import WEBP as settings_panel
+__getattr__ = lazy_plugin(__name__, "WEBP", icon="encoders/icon_webp.png")
@@ -26,13 +26,15 @@ except ImportError as err:
     sys.exit(1)
 
 
-def separate_app_process(worker_queue, status_queue, log_queue, queue_list, queue_lock, portable_mode=False):
+def separate_app_process(
+    worker_queue, status_queue, log_queue, progress_queue, queue_list, queue_lock, portable_mode=False
+):
     """This prevents any QT components being imported in the main process"""
     from fastflix.application import start_app
 
     freeze_support()
     try:
-        start_app(worker_queue, status_queue, log_queue, queue_list, queue_lock, portable_mode)
+        start_app(worker_queue, status_queue, log_queue, progress_queue, queue_list, queue_lock, portable_mode)
     except Exception as err:
         print(f"Could not start GUI process - Error: {err}", file=sys.stderr)
         raise err
@@ -132,6 +134,7 @@ def main(portable_mode=False):
     worker_queue = Queue()
     status_queue = Queue()
     log_queue = Queue()
+    progress_queue = Queue()
 
     queue_lock = Lock()
     with Manager() as manager:
@@ -141,7 +144,7 @@ def main(portable_mode=False):
         try:
             gui_proc = Process(
                 target=separate_app_process,
-                args=(worker_queue, status_queue, log_queue, queue_list, queue_lock, portable_mode),
+                args=(worker_queue, status_queue, log_queue, progress_queue, queue_list, queue_lock, portable_mode),
             )
             gui_proc.start()
         except Exception:
@@ -149,7 +152,7 @@ def main(portable_mode=False):
             return exit_status
 
         try:
-            queue_worker(gui_proc, worker_queue, status_queue, log_queue)
+            queue_worker(gui_proc, worker_queue, status_queue, log_queue, progress_queue)
             exit_status = 0
         except Exception:
             logger.exception("Exception occurred while running FastFlix core")
@@ -1,14 +1,21 @@
 # -*- coding: utf-8 -*-
 from typing import Optional
+import json
 import os
+from contextlib import closing
+from functools import lru_cache
 from pathlib import Path
+import hashlib
 import logging
+import pickle
 import shutil
+import sqlite3
 import uuid
 
 from box import Box, BoxError
 from ruamel.yaml import YAMLError
 
+from fastflix.encoders.common.helpers import Command, join_command, relocate_args
 from fastflix.models.video import Video, VideoSettings, Status, Crop
 from fastflix.models.encode import AudioTrack, SubtitleTrack, AttachmentTrack
 from fastflix.models.encode import setting_types
@@ -17,106 +24,298 @@ from fastflix.models.config import Config
 logger = logging.getLogger("fastflix")
 
 
-def get_queue(queue_file: Path) -> list[Video]:
-    if not queue_file.exists():
-        return []
-
-    try:
-        loaded = Box.from_yaml(filename=queue_file)
-    except (BoxError, YAMLError):
-        logger.exception("Could not open queue")
-        return []
+@lru_cache(maxsize=1)
+def encoder_settings_types() -> dict:
+    return {x().name: x for x in setting_types.values()}
 
-    queue = []
-    for video in loaded["queue"]:
-        video["source"] = Path(video["source"])
-        video["work_path"] = Path(video["work_path"])
-        video["video_settings"]["output_path"] = Path(video["video_settings"]["output_path"])
-        encoder_settings = video["video_settings"]["video_encoder_settings"]
-        ves = [x(**encoder_settings) for x in setting_types.values() if x().name == encoder_settings["name"]][0]
-        audio = [AudioTrack(**x) for x in video["video_settings"]["audio_tracks"]]
-        subtitles = [SubtitleTrack(**x) for x in video["video_settings"]["subtitle_tracks"]]
-        attachments = []
-        for x in video["video_settings"]["attachment_tracks"]:
-            try:
-                attachment_path = x.pop("file_path")
-            except KeyError:
-                attachment_path = None
-            attachment = AttachmentTrack(**x)
-            attachment.file_path = Path(attachment_path)
-            attachments.append(attachment)
-        status = Status(**video["status"])
-        crop = None
-        if video["video_settings"]["crop"]:
-            crop = Crop(**video["video_settings"]["crop"])
-        del video["video_settings"]["audio_tracks"]
-        del video["video_settings"]["subtitle_tracks"]
-        del video["video_settings"]["attachment_tracks"]
-        del video["video_settings"]["video_encoder_settings"]
-        del video["status"]
-        del video["video_settings"]["crop"]
-        vs = VideoSettings(
-            **video["video_settings"],
-            audio_tracks=audio,
-            subtitle_tracks=subtitles,
-            attachment_tracks=attachments,
-            crop=crop,
-        )
-        vs.video_encoder_settings = ves  # No idea why this has to be called after, otherwise reset to x265
-        del video["video_settings"]
-        queue.append(Video(**video, video_settings=vs, status=status))
-    return queue
 
+def video_from_item(video: Box) -> Video:
+    video["source"] = Path(video["source"])
+    video["work_path"] = Path(video["work_path"])
+    video["video_settings"]["output_path"] = Path(video["video_settings"]["output_path"])
+    encoder_settings = video["video_settings"]["video_encoder_settings"]
+    ves = encoder_settings_types()[encoder_settings["name"]](**encoder_settings)
+    audio = [AudioTrack(**x) for x in video["video_settings"]["audio_tracks"]]
+    subtitles = [SubtitleTrack(**x) for x in video["video_settings"]["subtitle_tracks"]]
+    attachments = []
+    for x in video["video_settings"]["attachment_tracks"]:
+        try:
+            attachment_path = x.pop("file_path")
+        except KeyError:
+            attachment_path = None
+        attachment = AttachmentTrack(**x)
+        attachment.file_path = Path(attachment_path)
+        attachments.append(attachment)
+    status = Status(**video["status"])
+    if status.running and not video["work_path"].exists():
+        # Stopped mid encode, but the pass logs and chunks are gone so it has to start over
+        status.current_command = 0
+    crop = None
+    if video["video_settings"]["crop"]:
+        crop = Crop(**video["video_settings"]["crop"])
+    del video["video_settings"]["audio_tracks"]
+    del video["video_settings"]["subtitle_tracks"]
+    del video["video_settings"]["attachment_tracks"]
+    del video["video_settings"]["video_encoder_settings"]
+    del video["status"]
+    del video["video_settings"]["crop"]
+    video["video_settings"]["conversion_commands"] = [
+        Command(**x) for x in video["video_settings"]["conversion_commands"]
+    ]
+    vs = VideoSettings(
+        **video["video_settings"],
+        audio_tracks=audio,
+        subtitle_tracks=subtitles,
+        attachment_tracks=attachments,
+        crop=crop,
+    )
+    vs.video_encoder_settings = ves  # No idea why this has to be called after, otherwise reset to x265
+    del video["video_settings"]
+    return Video(**video, video_settings=vs, status=status)
 
-def save_queue(queue: list[Video], queue_file: Path, config: Optional[Config] = None):
-    items = []
 
+def item_from_video(video: Video, config: Optional[Config] = None) -> dict:
+    """
+    Plain data of a queued video. With a config, covers and HDR10+ metadata are copied into the
+    work folder first, so the queue can still be encoded after the originals are gone.
+    """
     if config is not None:
         queue_covers = config.work_path / "covers"
         queue_covers.mkdir(parents=True, exist_ok=True)
         queue_data = config.work_path / "queue_extras"
         queue_data.mkdir(parents=True, exist_ok=True)
-    else:
-        queue_data = Path()
-        queue_covers = Path()
 
     def update_conversion_command(vid, old_path: str, new_path: str):
         for command in vid["video_settings"]["conversion_commands"]:
-            new_command = command["command"].replace(old_path, new_path)
-            if new_command == command["command"]:
+            found = relocate_args(command["args"], old_path, new_path)
+            if found:
+                command["command"] = join_command(command["args"])
+            if command.get("chunks"):
+                for args in (args for chunk in command["chunks"]["args"] for args in chunk):
+                    found = relocate_args(args, old_path, new_path) or found
+            if not found:
                 logger.error(f'Could not replace "{old_path}" with "{new_path}" in {command["command"]}')
-            command["command"] = new_command
-
-    for video in queue:
-        video = video.dict()
-        video["source"] = os.fspath(video["source"])
-        video["work_path"] = os.fspath(video["work_path"])
-        video["video_settings"]["output_path"] = os.fspath(video["video_settings"]["output_path"])
-        if config:
-            if metadata := video["video_settings"]["video_encoder_settings"].get("hdr10plus_metadata"):
-                new_metadata_file = queue_data / f"{uuid.uuid4().hex}_metadata.json"
+
+    load_probe_data(video)
+    video = video.dict()
+    video["source"] = os.fspath(video["source"])
+    video["work_path"] = os.fspath(video["work_path"])
+    video["video_settings"]["output_path"] = os.fspath(video["video_settings"]["output_path"])
+    if config:
+        # Files already copied for an earlier save are used as they are, instead of being copied again
+        metadata = video["video_settings"]["video_encoder_settings"].get("hdr10plus_metadata")
+        if metadata and Path(metadata).parent != queue_data:
+            new_metadata_file = queue_data / f"{uuid.uuid4().hex}_metadata.json"
+            try:
+                shutil.copy(metadata, new_metadata_file)
+            except OSError:
+                logger.exception("Could not save HDR10+ metadata file to queue recovery location, removing HDR10+")
+
+            update_conversion_command(
+                video,
+                str(metadata),
+                str(new_metadata_file),
+            )
+            video["video_settings"]["video_encoder_settings"]["hdr10plus_metadata"] = str(new_metadata_file)
+        for track in video["video_settings"]["attachment_tracks"]:
+            if track.get("file_path") and Path(track["file_path"]).parent != queue_covers:
+                new_file = queue_covers / f'{uuid.uuid4().hex}_{track["file_path"].name}'
                 try:
-                    shutil.copy(metadata, new_metadata_file)
+                    shutil.copy(track["file_path"], new_file)
                 except OSError:
-                    logger.exception("Could not save HDR10+ metadata file to queue recovery location, removing HDR10+")
-
-                update_conversion_command(
-                    video,
-                    str(metadata),
-                    str(new_metadata_file),
-                )
-                video["video_settings"]["video_encoder_settings"]["hdr10plus_metadata"] = str(new_metadata_file)
-            for track in video["video_settings"]["attachment_tracks"]:
-                if track.get("file_path"):
-                    new_file = queue_covers / f'{uuid.uuid4().hex}_{track["file_path"].name}'
-                    try:
-                        shutil.copy(track["file_path"], new_file)
-                    except OSError:
-                        logger.exception("Could not save cover to queue recovery location, removing cover")
-                    update_conversion_command(video, str(track["file_path"]), str(new_file))
-                    track["file_path"] = str(new_file)
-
-        items.append(video)
+                    logger.exception("Could not save cover to queue recovery location, removing cover")
+                update_conversion_command(video, str(track["file_path"]), str(new_file))
+                track["file_path"] = str(new_file)
+            elif track.get("file_path"):
+                track["file_path"] = os.fspath(track["file_path"])
+    return video
+
+
+def split_probe_data(item: dict) -> dict:
+    """Take the FFprobe data out of a queue item, it is only needed once the video is edited again"""
+    return {
+        "streams": item.pop("streams", None),
+        "format": item.pop("format", None),
+        "hdr10_streams": item.pop("hdr10_streams", []),
+        "raw_info": [track.pop("raw_info", None) for track in item["video_settings"]["audio_tracks"]],
+    }
+
+
+def set_probe_data(video: Video, probe: dict):
+    video.streams = Box(probe["streams"]) if probe.get("streams") is not None else None
+    video.format = Box(probe["format"]) if probe.get("format") is not None else None
+    video.hdr10_streams = [Box(x) for x in probe.get("hdr10_streams", [])]
+    for track, raw_info in zip(video.video_settings.audio_tracks, probe.get("raw_info", [])):
+        track.raw_info = raw_info
+
+
+def load_probe_data(video: Video):
+    """Read the FFprobe data of a video loaded from the queue database, if it was left out when loading"""
+    database, video._probe_database = video._probe_database, None
+    if database is None or video.streams is not None:
+        return
+    with closing(sqlite3.connect(database, timeout=10)) as db:
+        row = db.execute("SELECT probe FROM queue WHERE uuid = ?", (video.uuid,)).fetchone()
+    if row and row[0]:
+        set_probe_data(video, json.loads(row[0]))
+
+
+def fingerprint(video: Video) -> bytes:
+    """Changes to a queued video besides its status, pickling is a lot quicker than serializing to JSON"""
+    fields = [
+        value for name, value in video.__dict__.items() if name not in ("status", "streams", "format", "hdr10_streams")
+    ]
+    return hashlib.blake2b(pickle.dumps(fields), digest_size=16).digest()
+
+
+class QueueStore:
+    """
+    The queue as one SQLite row per video, so a change only writes the videos it touched.
+
+    Each save is a single transaction. New videos are serialized (and their covers copied) once,
+    after that only their status and position are updated while they stay in the queue, unless
+    anything else of the video changed.
+    A queue.yaml from before next to the database is moved into it the first time it is opened.
+
+    The FFprobe data of each video is kept in its own column and only read when the video is edited
+    again (see load_probe_data), the encode only needs the settings and commands.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.legacy_file = self.path.with_name("queue.yaml")
+        # uuid: (video object, fingerprint, status json, position) as last written
+        self._saved: dict[str, tuple[Video, bytes, str, int]] = {}
+        self._synced = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self.connect()) as db, db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS queue "
+                "(uuid TEXT PRIMARY KEY, position INTEGER, status TEXT, data TEXT, probe TEXT)"
+            )
+            if "probe" not in [x[1] for x in db.execute("PRAGMA table_info(queue)")]:
+                db.execute("ALTER TABLE queue ADD COLUMN probe TEXT")
+
+    def connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=10)
+
+    def migrate(self):
+        if not self.legacy_file.exists():
+            return
+        with closing(self.connect()) as db:
+            if db.execute("SELECT 1 FROM queue LIMIT 1").fetchone():
+                return
+        logger.info(f"Moving queue from {self.legacy_file} to {self.path}")
+        # Covers and metadata were already copied to the work folder when the old file was written
+        self._write(get_yaml_queue(self.legacy_file), config=None)
+        self.legacy_file.replace(self.legacy_file.with_suffix(".yaml.migrated"))
+
+    def load(self) -> list[Video]:
+        try:
+            self.migrate()
+        except (OSError, sqlite3.Error):
+            logger.exception(f"Could not move {self.legacy_file} into the queue database")
+
+        queue, saved, broken = [], {}, []
+        with closing(self.connect()) as db:
+            rows = db.execute(
+                "SELECT uuid, position, status, data, probe IS NOT NULL FROM queue ORDER BY position"
+            ).fetchall()
+        for video_uuid, position, status, data, has_probe in rows:
+            try:
+                item = json.loads(data)
+                item["status"] = json.loads(status)
+                if has_probe:
+                    probe = split_probe_data(item)
+                else:
+                    # Stored before the FFprobe data had its own column
+                    probe = split_probe_data(item) if item.get("streams") is not None else {}
+                video = video_from_item(item)
+                if has_probe:
+                    video._probe_database = self.path
+                elif probe:
+                    set_probe_data(video, probe)
+            except Exception:
+                logger.exception(f"Could not load queued video {video_uuid}, removing it")
+                broken.append((video_uuid,))
+                continue
+            saved[video.uuid] = (video, fingerprint(video), status, position)
+            queue.append(video)
+        if broken:
+            with closing(self.connect()) as db, db:
+                db.executemany("DELETE FROM queue WHERE uuid = ?", broken)
+        self._saved, self._synced = saved, True
+        return queue
+
+    def save(self, queue: list[Video], config: Optional[Config] = None):
+        try:
+            self._write(queue, config)
+        except Exception as err:
+            logger.exception(f"Could not save queue! {err.__class__.__name__}: {err}")
+            raise err from None
+
+    def _write(self, queue: list[Video], config: Optional[Config]):
+        saved, inserts, updates = {}, [], []
+        for position, video in enumerate(queue):
+            status = video.status.json()
+            video_fingerprint = fingerprint(video)
+            previous = self._saved.get(video.uuid)
+            if previous is None or previous[0] is not video or previous[1] != video_fingerprint:
+                item = item_from_video(video, config)
+                # Serializing loads the FFprobe data left out when loading
+                video_fingerprint = fingerprint(video)
+                probe = json.dumps(split_probe_data(item), default=str)
+                inserts.append((video.uuid, position, status, json.dumps(item, default=str), probe))
+            elif previous[2:] != (status, position):
+                updates.append((position, status, video.uuid))
+            saved[video.uuid] = (video, video_fingerprint, status, position)
+        removed = [(video_uuid,) for video_uuid in self._saved if video_uuid not in saved]
+
+        with closing(self.connect()) as db, db:
+            if not self._synced:
+                # Nothing was loaded, whatever is stored is not part of this queue
+                db.execute("DELETE FROM queue")
+            db.executemany("DELETE FROM queue WHERE uuid = ?", removed)
+            db.executemany("UPDATE queue SET position = ?, status = ? WHERE uuid = ?", updates)
+            db.executemany(
+                "INSERT OR REPLACE INTO queue (uuid, position, status, data, probe) VALUES (?, ?, ?, ?, ?)", inserts
+            )
+        self._saved, self._synced = saved, True
+
+
+@lru_cache(maxsize=4)
+def get_queue_store(queue_file: Path) -> QueueStore:
+    return QueueStore(queue_file)
+
+
+def get_yaml_queue(queue_file: Path) -> list[Video]:
+    try:
+        loaded = Box.from_yaml(filename=queue_file)
+    except (BoxError, YAMLError):
+        logger.exception("Could not open queue")
+        return []
+    return [video_from_item(video) for video in loaded["queue"]]
+
+
+def get_queue(queue_file: Path) -> list[Video]:
+    """Queue from the database (.sqlite) or from a single YAML file the queue was exported to"""
+    queue_file = Path(queue_file)
+    if queue_file.suffix == ".sqlite":
+        return get_queue_store(queue_file).load()
+    if not queue_file.exists():
+        return []
+    return get_yaml_queue(queue_file)
+
+
+def save_queue(queue: list[Video], queue_file: Path, config: Optional[Config] = None):
+    """Only writes the changed videos to the database (.sqlite), any other file is written whole as YAML"""
+    queue_file = Path(queue_file)
+    if queue_file.suffix == ".sqlite":
+        get_queue_store(queue_file).save(queue, config)
+        return
+
+    items = [item_from_video(video, config) for video in queue]
     try:
         Box(queue=items).to_yaml(filename=queue_file)
     except Exception as err:
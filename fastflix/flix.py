@@ -1,12 +1,18 @@
 # -*- coding: utf-8 -*-
+import json
 import logging
+import math
 import os
 import re
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from subprocess import PIPE, CompletedProcess, Popen, TimeoutExpired, run, check_output
-from typing import List, Tuple, Union
+from typing import TYPE_CHECKING, List, Tuple, Union
 from distutils.version import LooseVersion
 
+import numpy as np
 import reusables
 from box import Box, BoxError
 from pathvalidate import sanitize_filepath
@@ -14,12 +20,20 @@ from pathvalidate import sanitize_filepath
 from fastflix.exceptions import FlixError
 from fastflix.language import t
 from fastflix.models.config import Config
-from fastflix.models.fastflix_app import FastFlixApp
+from fastflix.models.video import Crop
+from fastflix.probe_cache import get_probe_cache
+
+if TYPE_CHECKING:
+    from fastflix.models.fastflix_app import FastFlixApp
 
 here = os.path.abspath(os.path.dirname(__file__))
 re_tff = re.compile(r"TFF:\s+(\d+)")
 re_bff = re.compile(r"BFF:\s+(\d+)")
 re_progressive = re.compile(r"Progressive:\s+(\d+)")
+re_filter_instance = re.compile(r"\[Parsed_(\w+?)_(\d+) @")
+re_showinfo_primaries = re.compile(r"(r|g|b|wp)\(x,y\):\(\s*(\d+(?:\.\d+)?),?\s+(\d+(?:\.\d+)?)\)")
+re_showinfo_luminance = re.compile(r"min_luminance=(\d+(?:\.\d+)?), max_luminance=(\d+(?:\.\d+)?)")
+re_showinfo_cll = re.compile(r"MaxCLL=(\d+), MaxFALL=(\d+)")
 
 logger = logging.getLogger("fastflix")
 
@@ -182,8 +196,28 @@ def ffprobe_configuration(app, config: Config, **_):
     app.fastflix.ffprobe_version = version
 
 
-def probe(app: FastFlixApp, file: Path) -> Box:
+def tool_versions(app) -> str:
+    """Cached results are only used with the same FFprobe and FFmpeg that created them"""
+    if not app.fastflix.ffprobe_version or not app.fastflix.ffmpeg_version:
+        return ""
+    return f"{app.fastflix.ffprobe_version}|{app.fastflix.ffmpeg_version}"
+
+
+def cache_get(app, source: Path, name: str):
+    if not (versions := tool_versions(app)):
+        return None
+    return get_probe_cache(app.fastflix.data_path).get(source, name, versions)
+
+
+def cache_set(app, source: Path, name: str, data):
+    if versions := tool_versions(app):
+        get_probe_cache(app.fastflix.data_path).set(source, name, versions, data)
+
+
+def probe(app: "FastFlixApp", file: Path) -> Box:
     """Run FFprobe on a file"""
+    if (cached := cache_get(app, file, "ffprobe")) is not None:
+        return Box.from_json(cached)
     command = [
         f"{app.fastflix.config.ffprobe}",
         "-v",
@@ -204,10 +238,60 @@ def probe(app: FastFlixApp, file: Path) -> Box:
         raise FlixError(f"No output from FFprobe, not a known video type. stderr: {result.stderr}")
 
     try:
-        return Box.from_json(result.stdout)
+        data = Box.from_json(result.stdout)
     except BoxError:
         logger.error(f"Could not read output: {result.stdout} - {result.stderr}")
         raise FlixError(result.stderr)
+    cache_set(app, file, "ffprobe", result.stdout)
+    return data
+
+
+@lru_cache(maxsize=64)
+def keyframes_near(ffprobe: Path, source: Path, track: int, times: tuple, window: int = 10) -> tuple:
+    """
+    Move each time forward to the first keyframe inside the window after it.
+    Only the packets inside those windows are read, so this is quick even on large files.
+    """
+    if not times:
+        return ()
+    command = [
+        f"{ffprobe}",
+        "-v",
+        "quiet",
+        "-select_streams",
+        f"{track}",
+        "-read_intervals",
+        ",".join(f"{x}%+{window}" for x in times),
+        "-show_entries",
+        "packet=pts_time,flags:format=start_time",
+        "-print_format",
+        "json",
+        f"{clean_file_string(source)}",
+    ]
+    try:
+        result = execute(command)
+    except OSError:
+        logger.exception("Could not run FFprobe to find keyframes, using exact times")
+        return times
+    if result.returncode != 0:
+        logger.warning(f"Could not find keyframes, using exact times: {result.stderr}")
+        return times
+    try:
+        data = Box.from_json(result.stdout, default_box=True)
+        start = float(data.format.start_time or 0)
+        keyframes = sorted(
+            float(packet.pts_time) - start
+            for packet in data.packets or []
+            if "K" in packet.flags and packet.pts_time not in ("", "N/A")
+        )
+    except (BoxError, ValueError, TypeError):
+        logger.warning(f"Could not read keyframes, using exact times: {result.stdout}")
+        return times
+
+    snapped = []
+    for target in times:
+        snapped.append(next((x for x in keyframes if target <= x <= target + window), target))
+    return tuple(snapped)
 
 
 def get_all_concat_items(file):
@@ -237,7 +321,50 @@ def get_concat_item(file, location=0):
     return all_items[item_num]
 
 
-def parse(app: FastFlixApp, **_):
+# FFprobe fields FastFlix never reads, dropped so every queued video doesn't carry them around.
+# The complete output stays in the probe cache, see full_probe.
+unused_stream_fields = (
+    "codec_tag",
+    "codec_tag_string",
+    "codec_time_base",
+    "time_base",
+    "start_pts",
+    "duration_ts",
+    "extradata_size",
+    "has_b_frames",
+    "refs",
+    "nb_frames",
+    "is_avc",
+    "nal_length_size",
+    "closed_captions",
+    "film_grain",
+    "initial_padding",
+    "bits_per_sample",
+    "sample_fmt",
+)
+# Matroska statistics tags, e.g. "NUMBER_OF_BYTES-eng", written for every track by mkvmerge
+unused_tag_prefixes = ("BPS", "DURATION", "NUMBER_OF_FRAMES", "NUMBER_OF_BYTES", "_STATISTICS_")
+used_format_fields = ("filename", "format_name", "start_time", "duration", "size", "bit_rate", "tags")
+
+
+def compact_stream(track: Box) -> Box:
+    stream = Box({k: v for k, v in track.items() if k not in unused_stream_fields})
+    if "tags" in stream:
+        stream.tags = Box({k: v for k, v in stream.tags.items() if not k.upper().startswith(unused_tag_prefixes)})
+    return stream
+
+
+def full_probe(app: "FastFlixApp") -> Union[Box, None]:
+    """The complete FFprobe output of the current video, from the probe cache when possible"""
+    video = app.fastflix.current_video
+    try:
+        return probe(app, get_concat_item(video.source) if video.concat else video.source)
+    except Exception:
+        logger.exception("Could not probe the current video again")
+        return None
+
+
+def parse(app: "FastFlixApp", **_):
     source = app.fastflix.current_video.source
     if source.name.lower().endswith("txt"):
         source = get_concat_item(source)
@@ -246,7 +373,7 @@ def parse(app: FastFlixApp, **_):
     if "streams" not in data:
         raise FlixError(f"Not a video file, FFprobe output: {data}")
     streams = Box({"video": [], "audio": [], "subtitle": [], "attachment": [], "data": []})
-    for track in data.streams:
+    for track in (compact_stream(x) for x in data.streams):
         if track.codec_type == "video" and (
             track.get("disposition", {}).get("attached_pic")
             or track.get("tags", {}).get("MIMETYPE", "").startswith("image")
@@ -268,11 +395,11 @@ def parse(app: FastFlixApp, **_):
 
     app.fastflix.current_video.streams = streams
     app.fastflix.current_video.video_settings.selected_track = streams.video[0].index
-    app.fastflix.current_video.format = data.format
+    app.fastflix.current_video.format = Box({k: v for k, v in data.format.items() if k in used_format_fields})
     app.fastflix.current_video.duration = float(data.format.get("duration", 0))
 
 
-def extract_attachments(app: FastFlixApp, **_):
+def extract_attachments(app: "FastFlixApp", **_):
     for track in app.fastflix.current_video.streams.attachment:
         filename = track.get("tags", {}).get("filename", "")
         if filename.rsplit(".", 1)[0] in ("cover", "small_cover", "cover_land", "small_cover_land"):
@@ -311,27 +438,79 @@ def extract_attachment(ffmpeg: Path, source: Path, stream: int, work_dir: Path,
 def generate_thumbnail_command(
     config: Config,
     source: Path,
-    output: Path,
     filters: str,
     start_time: float = 0,
     input_track: int = 0,
     enable_opencl: bool = False,
-) -> str:
-    command_options = [
-        f'"{config.ffmpeg}"',
-        f"-ss {start_time}" if start_time else "",
-        "-loglevel warning",
-        f'-i "{clean_file_string(source)}"',
-        ("-init_hw_device opencl=ocl -filter_hw_device ocl" if enable_opencl else ""),
-        filters,
-        f"-map 0:{input_track}" if "-map" not in filters else "",
-        "-an",
-        "-y",
-        "-map_metadata -1",
-        "-frames:v 1",
-        f'"{clean_file_string(output)}"',
-    ]
-    return " ".join(command_options)
+) -> List[str]:
+    """
+    FFmpeg arguments to write one frame to stdout as a PPM image, which is raw RGB24 pixels behind a short header
+    with the size the filters produced. filters is the raw filter graph from generate_filters, with its output as [v]
+    """
+    command = [f"{config.ffmpeg}", "-hide_banner", "-nostdin", "-loglevel", "warning"]
+    if start_time:
+        command.extend(["-ss", f"{start_time}"])
+    command.extend(["-i", f"{clean_file_string(source)}"])
+    if enable_opencl:
+        command.extend(["-init_hw_device", "opencl=ocl", "-filter_hw_device", "ocl"])
+    if filters:
+        command.extend(["-filter_complex", filters, "-map", "[v]"])
+    else:
+        command.extend(["-map", f"0:{input_track}"])
+    command.extend(["-an", "-map_metadata", "-1", "-frames:v", "1"])
+    command.extend(["-pix_fmt", "rgb24", "-c:v", "ppm", "-f", "image2pipe", "-"])
+    return command
+
+
+def sample_gray_frames(
+    ffmpeg: Path, source: Path, track: int, points: List[float], frames: int, width: int, height: int
+) -> Union[np.ndarray, None]:
+    """
+    Decode a few frames at every point in a single FFmpeg run, scaled down and as 8-bit luma only,
+    returned as an array of shape (frames, height, width).
+    """
+    command = [f"{ffmpeg}", "-hide_banner", "-nostdin", "-loglevel", "error"]
+    graphs = []
+    for i, point in enumerate(points):
+        command.extend(["-ss", f"{point}", "-i", f"{clean_file_string(source)}"])
+        # Area scaling averages partly black rows and columns with the picture, so they are never cropped off
+        graphs.append(
+            f"[{i}:{track}]trim=end_frame={frames},scale={width}:{height}:flags=area,format=gray,setsar=1[s{i}]"
+        )
+    graphs.append(f"{''.join(f'[s{i}]' for i in range(len(points)))}concat=n={len(points)}:v=1:a=0[gray]")
+    command.extend(["-filter_complex", ";".join(graphs), "-map", "[gray]", "-f", "rawvideo", "-pix_fmt", "gray", "-"])
+
+    logger.info(f"{t('Running command')}: {' '.join(command)}")
+    try:
+        output = run(command, stdout=PIPE, stderr=PIPE, stdin=PIPE)
+    except Exception:
+        logger.exception("Error while reading frames for auto crop")
+        return None
+    if output.returncode != 0:
+        logger.warning(f"Could not read frames for auto crop: {output.stderr.decode('utf-8', 'ignore')[-1000:]}")
+        return None
+    count = len(output.stdout) // (width * height)
+    if not count:
+        return None
+    return np.frombuffer(output.stdout, dtype=np.uint8, count=count * width * height).reshape(count, height, width)
+
+
+def crop_from_frames(frames: np.ndarray, limit: int = 24) -> Union[Tuple[int, int, int, int], None]:
+    """
+    Find the picture area shared by all frames, as (top, bottom, left, right) rows and columns that are black bars.
+    A row or column is picture when its average luma in any frame is over the limit (the same as cropdetect's),
+    so bars that only show in some scenes are never cropped into the others.
+    """
+    rows = (frames.mean(axis=2, dtype=np.float32) > limit).any(axis=0)
+    if not rows.any():
+        return None
+    top = int(rows.argmax())
+    bottom = int(rows[::-1].argmax())
+    # Columns are only measured inside the picture rows, letterboxing would otherwise darken every column
+    columns = (frames[:, top : len(rows) - bottom].mean(axis=1, dtype=np.float32) > limit).any(axis=0)
+    left = int(columns.argmax())
+    right = int(columns[::-1].argmax())
+    return top, bottom, left, right
 
 
 def get_auto_crop(
@@ -340,49 +519,42 @@ def get_auto_crop(
     video_width: int,
     video_height: int,
     input_track: int,
-    start_time: float,
+    start_times: List[float],
     result_list: List,
+    frames: int = 4,
     **_,
 ):
-    output = execute(
-        [
-            f"{config.ffmpeg}",
-            "-y",
-            "-hide_banner",
-            "-ss",
-            f"{start_time}",
-            "-i",
-            f"{clean_file_string(source)}",
-            "-map",
-            f"0:{input_track}",
-            "-vf",
-            "cropdetect=round=2",
-            "-vframes",
-            "10",
-            "-f",
-            "null",
-            "-",
-        ]
-    )
+    """Detect black bars from a few frames at each start time, adding [right, bottom, left, top] to the result list"""
+    width, height = crop_sample_size(video_width, video_height)
+    samples = sample_gray_frames(config.ffmpeg, source, input_track, start_times, frames, width, height)
+    if samples is None or not (bars := crop_from_frames(samples)):
+        return
+    result_list.append(crop_to_source(bars, width, height, video_width, video_height))
+
+
+def crop_sample_size(video_width: int, video_height: int) -> Tuple[int, int]:
+    # Downscaling by a whole number keeps each small row and column mapping to the same number of source pixels
+    scale = max(1, video_height // 540)
+    return video_width // scale, video_height // scale
 
-    width, height, x_crop, y_crop = None, None, None, None
-    for line in output.stderr.splitlines():
-        if line.startswith("[Parsed_cropdetect"):
-            w, h, x, y = [int(x) for x in line.rsplit("=")[1].split(":")]
-            if (not x_crop or (x_crop and x > x_crop)) and (not width or (width and w < width)):
-                width = w
-                x_crop = x
-            if (not height or (height and h < height)) and (not y_crop or (y_crop and y > y_crop)):
-                height = h
-                y_crop = y
 
-    if None in (width, height, x_crop, y_crop):
-        return 0, 0, 0, 0
+def crop_to_source(bars, width: int, height: int, video_width: int, video_height: int) -> List[int]:
+    """Black bars found in the downscaled frames as [right, bottom, left, top] pixels of the source"""
 
-    result_list.append([video_width - width - x_crop, video_height - height - y_crop, x_crop, y_crop])
+    def to_source(value, small, full):
+        # Round down to an even number of pixels, leaving a sliver of bar rather than cutting into the picture
+        return (value * full // small) // 2 * 2
+
+    top, bottom, left, right = bars
+    return [
+        to_source(right, width, video_width),
+        to_source(bottom, height, video_height),
+        to_source(left, width, video_width),
+        to_source(top, height, video_height),
+    ]
 
 
-def detect_interlaced(app: FastFlixApp, config: Config, source: Path, **_):
+def detect_interlaced(app: "FastFlixApp", config: Config, source: Path, **_):
     """http://www.aktau.be/2013/09/22/detecting-interlaced-video-with-ffmpeg/"""
 
     # Interlaced
@@ -395,45 +567,81 @@ def detect_interlaced(app: FastFlixApp, config: Config, source: Path, **_):
     # [Parsed_idet_0 @ 00000] Single frame detection: TFF:     0 BFF:     0 Progressive:   641 Undetermined:   359
     # [Parsed_idet_0 @ 00000] Multi frame detection: TFF:     0 BFF:     0 Progressive:   953 Undetermined:    47
 
+    video = app.fastflix.current_video
+    track = video.video_settings.selected_track
+    points = sample_points(video.duration, config.crop_detect_points)
+    frames = max(10, 200 // len(points))
+    cache_name = f"interlace:{track}:{','.join(str(x) for x in points)}:{frames}"
+    if (interlace := cache_get(app, source, cache_name)) is None:
+        # Each point is its own short decode, so they run side by side
+        with ThreadPoolExecutor(max_workers=min(4, len(points))) as executor:
+            results = list(executor.map(lambda x: idet_counts(config.ffmpeg, source, track, x, frames), points))
+        if None in results:
+            return
+        interlace = {key: sum(x[key] for x in results) for key in ("tff", "bff", "progressive")}
+        cache_set(app, source, cache_name, interlace)
+
+    interlaced, confidence = interlace_decision(interlace)
+    video.video_settings.deinterlace = bool(interlaced)
+    video.interlaced = interlaced
+    video.interlace_confidence = confidence
+
+
+def idet_counts(ffmpeg: Path, source: Path, track: int, point: float, frames: int) -> Union[dict, None]:
+    """idet's single frame detection counts for a few frames from one point, only that video track is decoded"""
     try:
         output = execute(
             [
-                f"{config.ffmpeg}",
+                f"{ffmpeg}",
                 "-hide_banner",
+                "-nostats",
+                "-ss",
+                f"{point}",
                 "-i",
                 f"{clean_file_string(source)}",
+                "-map",
+                f"0:{track}",
                 "-vf",
                 "idet",
                 "-frames:v",
-                "100",
+                f"{frames}",
                 "-an",
                 "-sn",
                 "-dn",
                 "-f",
-                "rawvideo",
-                f"{'NUL' if reusables.win_based else '/dev/null'}",
-                "-y",
+                "null",
+                "-",
             ]
         )
     except Exception:
         logger.exception("Error while running the interlace detection command")
-        return
+        return None
 
     for line in output.stderr.splitlines():
         if "Single frame detection" in line:
             try:
-                tffs = re_tff.findall(line)[0]
-                bffs = re_bff.findall(line)[0]
-                progressive = re_progressive.findall(line)[0]
+                return {
+                    "tff": int(re_tff.findall(line)[0]),
+                    "bff": int(re_bff.findall(line)[0]),
+                    "progressive": int(re_progressive.findall(line)[0]),
+                }
             except IndexError:
                 logger.error(f"Could not extract interlaced information via regex: {line}")
-            else:
-                if int(tffs) + int(bffs) > int(progressive):
-                    app.fastflix.current_video.video_settings.deinterlace = True
-                    app.fastflix.current_video.interlaced = "tff" if int(tffs) > int(bffs) else "bff"
-                    return
-    app.fastflix.current_video.video_settings.deinterlace = False
-    app.fastflix.current_video.interlaced = False
+    return {"tff": 0, "bff": 0, "progressive": 0}
+
+
+def interlace_decision(interlace: dict) -> Tuple[Union[str, bool], float]:
+    """
+    Interlaced field order ("tff" / "bff") or False, and how sure that is:
+    the share of frames idet could decide on that agree with it.
+    """
+    interlaced_frames = interlace["tff"] + interlace["bff"]
+    decided = interlaced_frames + interlace["progressive"]
+    if not decided:
+        return False, 0.0
+    if interlaced_frames > interlace["progressive"]:
+        return "tff" if interlace["tff"] > interlace["bff"] else "bff", round(interlaced_frames / decided, 3)
+    return False, round(interlace["progressive"] / decided, 3)
 
 
 def ffmpeg_audio_encoders(app, config: Config) -> List:
@@ -457,6 +665,44 @@ def ffmpeg_opencl_support(app, config: Config) -> bool:
     return app.fastflix.opencl_support
 
 
+capability_fields = ("ffmpeg_version", "ffmpeg_config", "ffprobe_version", "audio_encoders", "opencl_support")
+
+
+def binary_stamp(binary: Path) -> str:
+    """Location, size and modification time of an executable, replacing or updating it changes the stamp"""
+    location = Path(shutil.which(str(binary)) or binary).resolve()
+    stat = location.stat()
+    return f"{location}|{stat.st_size}|{stat.st_mtime_ns}"
+
+
+def ffmpeg_stamps(config: Config) -> List[str]:
+    return [binary_stamp(config.ffmpeg), binary_stamp(config.ffprobe)]
+
+
+def load_ffmpeg_capabilities(app, config: Config) -> bool:
+    """Reuse the versions, libraries and encoders found last time if FFmpeg and FFprobe have not changed"""
+    cache_file = app.fastflix.data_path / "ffmpeg_capabilities.json"
+    try:
+        cached = json.loads(cache_file.read_text(encoding="utf-8"))
+        if cached["stamps"] != ffmpeg_stamps(config):
+            return False
+        values = {name: cached[name] for name in capability_fields}
+    except (OSError, ValueError, KeyError, TypeError):
+        return False
+    for name, value in values.items():
+        setattr(app.fastflix, name, value)
+    return True
+
+
+def save_ffmpeg_capabilities(app, config: Config, **_):
+    cache_file = app.fastflix.data_path / "ffmpeg_capabilities.json"
+    try:
+        data = {"stamps": ffmpeg_stamps(config), **{name: getattr(app.fastflix, name) for name in capability_fields}}
+        cache_file.write_text(json.dumps(data), encoding="utf-8")
+    except OSError:
+        logger.warning(f"Could not save FFmpeg details to {cache_file}")
+
+
 def convert_mastering_display(data: Box) -> Tuple[Box, str]:
     master_display = None
     cll = None
@@ -485,126 +731,320 @@ def convert_mastering_display(data: Box) -> Tuple[Box, str]:
     return master_display, cll
 
 
-def parse_hdr_details(app: FastFlixApp, **_):
+def stream_side_data_hdr10(video_stream: Box) -> Union[Box, None]:
+    """HDR10 details from the side data FFprobe already reported for the stream, no file reading needed"""
+    if not video_stream.get("side_data_list"):
+        return None
+    try:
+        master_display, cll = convert_mastering_display(video_stream)
+    except FlixError as err:
+        logger.error(str(err))
+    except Exception:
+        logger.exception(f"Unexpected error while processing master-display from {video_stream}")
+    else:
+        if master_display:
+            return Box(index=video_stream.index, master_display=master_display, cll=cll)
+    return None
+
+
+def probe_frame_hdr10(app: "FastFlixApp", video_stream: Box) -> Union[Box, None]:
+    """HDR10 details from the side data of the first frame of a stream"""
+    result = execute(
+        [
+            f"{app.fastflix.config.ffprobe}",
+            "-loglevel",
+            "panic",
+            "-select_streams",
+            f"{video_stream.index}",
+            "-print_format",
+            "json",
+            "-show_frames",
+            "-read_intervals",
+            "%+#1",
+            "-show_entries",
+            "frame=color_space,color_primaries,color_transfer,side_data_list,pix_fmt",
+            f"{clean_file_string(app.fastflix.current_video.source)}",
+        ]
+    )
+
+    try:
+        data = Box.from_json(result.stdout, default_box=True, default_box_attr="")
+    except BoxError:
+        # Could not parse details
+        logger.error(
+            "COULD NOT PARSE FFPROBE HDR METADATA, PLEASE OPEN ISSUE WITH THESE DETAILS:"
+            f"\nSTDOUT: {result.stdout}\nSTDERR: {result.stderr}"
+        )
+        return None
+    if "frames" not in data or not len(data.frames):
+        return None
+    data = data.frames[0]
+    if not data.get("side_data_list"):
+        return None
+
+    try:
+        master_display, cll = convert_mastering_display(data)
+    except FlixError as err:
+        logger.error(str(err))
+    except Exception:
+        logger.exception(f"Unexpected error while processing master-display from {video_stream}")
+    else:
+        if master_display:
+            return Box(index=video_stream.index, master_display=master_display, cll=cll)
+    return None
+
+
+def parse_hdr_details(app: "FastFlixApp", **_):
+    source = app.fastflix.current_video.source
+    if (cached := cache_get(app, source, "hdr10")) is not None:
+        app.fastflix.current_video.hdr10_streams = [Box(x) for x in cached]
+        return
     streams = app.fastflix.current_video.streams
     video_track = app.fastflix.current_video.video_settings.selected_track
     if streams and streams.video:
         for video_stream in streams.video:
-            if video_stream["index"] == video_track and video_stream.get("side_data_list"):
-                try:
-                    master_display, cll = convert_mastering_display(video_stream)
-                except FlixError as err:
-                    logger.error(str(err))
-                except Exception:
-                    logger.exception(f"Unexpected error while processing master-display from {video_stream}")
-                else:
-                    if master_display:
-                        app.fastflix.current_video.hdr10_streams.append(
-                            Box(index=video_stream.index, master_display=master_display, cll=cll)
-                        )
-                        continue
-
-            result = execute(
-                [
-                    f"{app.fastflix.config.ffprobe}",
-                    "-loglevel",
-                    "panic",
-                    "-select_streams",
-                    f"{video_stream.index}",
-                    "-print_format",
-                    "json",
-                    "-show_frames",
-                    "-read_intervals",
-                    "%+#1",
-                    "-show_entries",
-                    "frame=color_space,color_primaries,color_transfer,side_data_list,pix_fmt",
-                    f"{clean_file_string(app.fastflix.current_video.source)}",
-                ]
-            )
-
-            try:
-                data = Box.from_json(result.stdout, default_box=True, default_box_attr="")
-            except BoxError:
-                # Could not parse details
-                logger.error(
-                    "COULD NOT PARSE FFPROBE HDR METADATA, PLEASE OPEN ISSUE WITH THESE DETAILS:"
-                    f"\nSTDOUT: {result.stdout}\nSTDERR: {result.stderr}"
-                )
-                continue
-            if "frames" not in data or not len(data.frames):
-                continue
-            data = data.frames[0]
-            if not data.get("side_data_list"):
-                continue
+            details = stream_side_data_hdr10(video_stream) if video_stream["index"] == video_track else None
+            if details or (details := probe_frame_hdr10(app, video_stream)):
+                app.fastflix.current_video.hdr10_streams.append(details)
+    cache_set(app, source, "hdr10", [x.to_dict() for x in app.fastflix.current_video.hdr10_streams])
+
+
+def sample_points(duration: float, points: int) -> List[float]:
+    """Evenly spaced times to look at, skipping the first tenth of the video where intros and logos are"""
+    start = int(duration // 10)
+    step = max(1, math.ceil((duration - start) / (points + 1)))
+    return [float(x) for x in range(start, int(duration), step)][:points] or [0.0]
+
+
+def run_source_analysis(
+    ffmpeg: Path, source: Path, track: int, points: List[float], frames: int, width: int, height: int
+) -> Union[dict, None]:
+    """
+    Read a few frames at every sample point in a single FFmpeg run, passing them through idet and showinfo
+    (which logs the HDR side data), while the same frames are sent back downscaled as 8-bit luma
+    for crop_from_frames, the same black bar detection get_auto_crop uses.
+    """
+    command = [f"{ffmpeg}", "-hide_banner", "-nostats", "-loglevel", "info"]
+    graphs, outputs = [], []
+    for i, point in enumerate(points):
+        command.extend(["-ss", f"{point}", "-i", f"{clean_file_string(source)}"])
+        graphs.append(f"[{i}:{track}]idet,showinfo,split[v{i}][c{i}]")
+        graphs.append(f"[c{i}]trim=end_frame={frames},scale={width}:{height}:flags=area,format=gray,setsar=1[s{i}]")
+        outputs.extend(["-map", f"[v{i}]", "-frames:v", f"{frames}", "-f", "null", "-"])
+    graphs.append(f"{''.join(f'[s{i}]' for i in range(len(points)))}concat=n={len(points)}:v=1:a=0[gray]")
+    outputs.extend(["-map", "[gray]", "-f", "rawvideo", "-pix_fmt", "gray", "-"])
+    command.extend(["-filter_complex", ";".join(graphs), *outputs])
 
+    logger.info(f"{t('Running command')}: {' '.join(command)}")
+    try:
+        output = run(command, stdout=PIPE, stderr=PIPE, stdin=PIPE)
+    except Exception:
+        logger.exception("Error while running the source analysis command")
+        return None
+    stderr = output.stderr.decode("utf-8", "ignore")
+    if output.returncode != 0:
+        logger.warning(f"Source analysis failed: {stderr[-1000:]}")
+        return None
+    results = parse_source_analysis(stderr)
+    count = len(output.stdout) // (width * height)
+    bars = None
+    if count:
+        samples = np.frombuffer(output.stdout, dtype=np.uint8, count=count * width * height)
+        bars = crop_from_frames(samples.reshape(count, height, width))
+    results["crop_bars"] = list(bars) if bars else None
+    return results
+
+
+def parse_source_analysis(stderr: str) -> dict:
+    """Split the combined idet and showinfo log back up by filter"""
+    interlace = {"tff": 0, "bff": 0, "progressive": 0}
+    primaries, luminance, cll = {}, None, None
+    for line in stderr.splitlines():
+        instance = re_filter_instance.search(line)
+        if not instance:
+            continue
+        name, _ = instance.groups()
+        if name == "idet" and "Single frame detection" in line:
             try:
-                master_display, cll = convert_mastering_display(data)
-            except FlixError as err:
-                logger.error(str(err))
-            except Exception:
-                logger.exception(f"Unexpected error while processing master-display from {streams.video[0]}")
-            else:
-                if master_display:
-                    app.fastflix.current_video.hdr10_streams.append(
-                        Box(index=video_stream.index, master_display=master_display, cll=cll)
-                    )
-
-
-def detect_hdr10_plus(app: FastFlixApp, config: Config, **_):
-    if not config.hdr10plus_parser or not config.hdr10plus_parser.exists():
-        return
+                interlace["tff"] += int(re_tff.findall(line)[0])
+                interlace["bff"] += int(re_bff.findall(line)[0])
+                interlace["progressive"] += int(re_progressive.findall(line)[0])
+            except IndexError:
+                logger.error(f"Could not extract interlaced information via regex: {line}")
+        elif name == "showinfo":
+            if "mastering display" in line and not primaries:
+                primaries = {key: (float(x), float(y)) for key, x, y in re_showinfo_primaries.findall(line)}
+                if found := re_showinfo_luminance.search(line):
+                    luminance = float(found.group(1)), float(found.group(2))
+            elif cll is None and (found := re_showinfo_cll.search(line)):
+                cll = f"{found.group(1)},{found.group(2)}"
 
-    hdr10plus_streams = []
+    master_display = None
+    if len(primaries) == 4 and luminance:
 
-    hdr10_parser_version_output = check_output([str(config.hdr10plus_parser), "--version"], encoding="utf-8")
-    _, version_string = hdr10_parser_version_output.rsplit(sep=" ", maxsplit=1)
-    hdr10_parser_version = LooseVersion(version_string)
-    logger.debug(f"Using HDR10 parser version {str(hdr10_parser_version).strip()}")
+        def point(key):
+            return f"({round(primaries[key][0] * 50_000)},{round(primaries[key][1] * 50_000)})"
 
-    for stream in app.fastflix.current_video.streams.video:
-        logger.debug(f"Checking for hdr10+ in stream {stream.index}")
-        process = Popen(
-            [
-                str(config.ffmpeg),
-                "-y",
-                "-i",
-                clean_file_string(app.fastflix.current_video.source),
-                "-map",
-                f"0:{stream.index}",
-                "-loglevel",
-                "panic",
-                "-c:v",
-                "copy",
-                "-vbsf",
-                "hevc_mp4toannexb",
-                "-f",
-                "hevc",
-                "-",
-            ],
-            stdout=PIPE,
-            stderr=PIPE,
-            stdin=PIPE,  # FFmpeg can try to read stdin and wrecks havoc
+        master_display = dict(
+            red=point("r"),
+            green=point("g"),
+            blue=point("b"),
+            white=point("wp"),
+            luminance=f"({round(luminance[1] * 10_000)},{round(luminance[0] * 10_000)})",
         )
 
-        hdr10_parser_command = [str(config.hdr10plus_parser), "--verify", "-"]
-        if hdr10_parser_version >= LooseVersion("1.0.0"):
-            hdr10_parser_command.insert(-1, "extract")
+    return {
+        "interlace": interlace,
+        "master_display": master_display,
+        "cll": cll,
+    }
+
+
+def analyze_source(app: "FastFlixApp", config: Config, **_):
+    """
+    Interlace, black bar and HDR10 detection from one decode of the selected video track,
+    filling in the same fields as detect_interlaced, get_auto_crop and parse_hdr_details.
+    The detected crop is stored as the video's crop, all zeros if there are no black bars.
+    """
+    video = app.fastflix.current_video
+    source = get_concat_item(video.source) if video.concat else video.source
+    track = video.video_settings.selected_track
+    points = sample_points(video.duration, config.crop_detect_points)
+    frames = max(10, 100 // len(points))
+
+    width, height = video.width, video.height
+    sample_width, sample_height = crop_sample_size(width, height)
+
+    cache_name = f"analysis:{track}:{','.join(str(x) for x in points)}:{frames}:{sample_width}x{sample_height}"
+    if (results := cache_get(app, source, cache_name)) is None:
+        results = run_source_analysis(config.ffmpeg, source, track, points, frames, sample_width, sample_height)
+        if results is None:
+            logger.info("Falling back to separate interlace and HDR detection")
+            detect_interlaced(app, config=config, source=source)
+            parse_hdr_details(app)
+            return
+        results["other_hdr10"] = [
+            details.to_dict()
+            for video_stream in video.streams.video
+            if video_stream.index != track and (details := probe_frame_hdr10(app, video_stream))
+        ]
+        cache_set(app, source, cache_name, results)
+
+    video.interlaced, video.interlace_confidence = interlace_decision(results["interlace"])
+    video.video_settings.deinterlace = bool(video.interlaced)
+    logger.info(f"Interlaced: {video.interlaced} ({video.interlace_confidence:.0%} of decided frames agree)")
+
+    right, bottom, left, top = 0, 0, 0, 0
+    if results["crop_bars"]:
+        right, bottom, left, top = crop_to_source(results["crop_bars"], sample_width, sample_height, width, height)
+    if top + bottom > height * 0.9 or right + left > width * 0.9:
+        logger.warning(f"Autocrop tried to crop too much ({left=}, {top=}, {right=}, {bottom=}), ignoring")
+        right, bottom, left, top = 0, 0, 0, 0
+    video.video_settings.crop = Crop(
+        top=top, right=right, bottom=bottom, left=left, width=width - right - left, height=height - top - bottom
+    )
 
+    video.hdr10_streams = [Box(x) for x in results["other_hdr10"]]
+    for video_stream in video.streams.video:
+        if video_stream.index != track:
+            continue
+        if not (details := stream_side_data_hdr10(video_stream)) and results["master_display"]:
+            details = Box(index=track, master_display=Box(results["master_display"]), cll=results["cll"])
+        if details:
+            video.hdr10_streams.append(details)
+
+
+@lru_cache(maxsize=4)
+def hdr10plus_tool_command(parser: Path) -> Tuple[str, ...]:
+    version_output = check_output([str(parser), "--version"], encoding="utf-8")
+    _, version_string = version_output.rsplit(sep=" ", maxsplit=1)
+    version = LooseVersion(version_string)
+    logger.debug(f"Using HDR10 parser version {str(version).strip()}")
+    if version >= LooseVersion("1.0.0"):
+        return str(parser), "--verify", "extract", "-"
+    return str(parser), "--verify", "-"
+
+
+def stream_has_hdr10_plus(config: Config, source: Path, stream_index: int) -> bool:
+    """
+    Only the start of the stream is copied out to the parser, limited by frames and size,
+    and FFmpeg is stopped as soon as the parser has made up its mind.
+    """
+    logger.debug(f"Checking for hdr10+ in stream {stream_index}")
+    process = Popen(
+        [
+            str(config.ffmpeg),
+            "-y",
+            "-i",
+            clean_file_string(source),
+            "-map",
+            f"0:{stream_index}",
+            "-loglevel",
+            "panic",
+            "-c:v",
+            "copy",
+            "-vbsf",
+            "hevc_mp4toannexb",
+            "-frames:v",
+            f"{config.hdr10plus_detect_frames}",
+            "-fs",
+            f"{config.hdr10plus_detect_megabytes * 1024 * 1024}",
+            "-f",
+            "hevc",
+            "-",
+        ],
+        stdout=PIPE,
+        stderr=PIPE,
+        stdin=PIPE,  # FFmpeg can try to read stdin and wrecks havoc
+    )
+    try:
         process_two = Popen(
-            hdr10_parser_command,
+            hdr10plus_tool_command(config.hdr10plus_parser),
             stdout=PIPE,
             stderr=PIPE,
             stdin=process.stdout,
             encoding="utf-8",
         )
+        # Only the parser holds the pipe now, so FFmpeg sees it close when the parser exits
+        process.stdout.close()
+        stdout, _ = process_two.communicate()
+    finally:
+        process.kill()
+        process.wait()
+    return "Dynamic HDR10+ metadata detected." in stdout
+
 
+def detect_hdr10_plus(app: "FastFlixApp", config: Config, **_):
+    if not config.hdr10plus_parser or not config.hdr10plus_parser.exists():
+        return
+
+    source = app.fastflix.current_video.source
+    # Results found with different limits are kept apart
+    cache_name = (
+        f"hdr10plus:{config.hdr10plus_parser}:{config.hdr10plus_detect_frames}:{config.hdr10plus_detect_megabytes}"
+    )
+    if (cached := cache_get(app, source, cache_name)) is not None:
+        if cached:
+            app.fastflix.current_video.hdr10_plus = cached
+        return
+
+    hdr10plus_streams = []
+    failed = False
+
+    streams = [x.index for x in app.fastflix.current_video.streams.video if x.get("codec_name") == "hevc"]
+    if not streams:
+        return
+    with ThreadPoolExecutor(max_workers=len(streams)) as executor:
+        checks = {index: executor.submit(stream_has_hdr10_plus, config, source, index) for index in streams}
+    for index, check in checks.items():
         try:
-            stdout, stderr = process_two.communicate()
+            if check.result():
+                hdr10plus_streams.append(index)
         except Exception:
-            logger.exception(f"Unexpected error while trying to detect HDR10+ metadata in stream {stream.index}")
-        else:
-            if "Dynamic HDR10+ metadata detected." in stdout:
-                hdr10plus_streams.append(stream.index)
+            logger.exception(f"Unexpected error while trying to detect HDR10+ metadata in stream {index}")
+            failed = True
 
+    if not failed:
+        cache_set(app, source, cache_name, hdr10plus_streams)
     if hdr10plus_streams:
         app.fastflix.current_video.hdr10_plus = hdr10plus_streams
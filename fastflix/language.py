@@ -36,18 +36,26 @@ if not language:
             print("WARNING: Could not get language from config file")
         language = "eng"
 
-language_data = Box.from_yaml(filename=language_file, encoding="utf-8")
-
 if language not in ("deu", "eng", "fra", "ita", "spa", "zho", "rus", "jpn", "pol", "swe", "por"):
     print(f"WARNING: {language} is not a supported language, defaulting to eng")
     language = "eng"
 
 
+@lru_cache(maxsize=1)
+def language_data() -> dict:
+    """Only the selected language is kept, read the first time something is translated"""
+    return {
+        text: options[language]
+        for text, options in Box.from_yaml(filename=language_file, encoding="utf-8").items()
+        if language in options
+    }
+
+
 @lru_cache(maxsize=2048)  # This little trick makes re-calls 10x faster
 def translate(text):
-    if text in language_data:
-        if language in language_data[text]:
-            return language_data[text][language]
+    translations = language_data()
+    if text in translations:
+        return translations[text]
     else:
         if os.getenv("DEVMODE", "").lower() in ("1", "true"):
             print(f'Cannot find translation for: "{text}"')
@@ -108,7 +108,10 @@ class Config(BaseModel):
     language: str = "eng"
     logging_level: int = 10
     crop_detect_points: int = 10
+    hdr10plus_detect_frames: int = 240
+    hdr10plus_detect_megabytes: int = 256
     continue_on_failure: bool = True
+    concurrent_encodes: int = 1
     work_path: Path = Path(os.getenv("FF_WORKDIR", user_data_dir("FastFlix", appauthor=False, roaming=True)))
     use_sane_audio: bool = True
     selected_profile: str = "Standard Profile"
@@ -69,6 +69,8 @@ class x265Settings(EncoderSettings):
     intra_refresh: bool = False
     intra_smoothing: bool = True
     frame_threads: int = 0
+    chunks: str = "1"
+    chunk_workers: str = "auto"
 
 
 class x264Settings(EncoderSettings):
@@ -323,6 +325,8 @@ class rav1eSettings(EncoderSettings):
     single_pass: bool = False
     qp: Optional[Union[int, float]] = 24
     bitrate: Optional[str] = None
+    chunks: str = "1"
+    chunk_workers: str = "auto"
 
 
 class SVTAV1Settings(EncoderSettings):
@@ -336,6 +340,8 @@ class SVTAV1Settings(EncoderSettings):
     qp_mode: str = "qp"
     bitrate: Optional[str] = None
     svtav1_params: list[str] = Field(default_factory=list)
+    chunks: str = "1"
+    chunk_workers: str = "auto"
 
 
 class SVTAVIFSettings(EncoderSettings):
@@ -397,6 +403,8 @@ class AOMAV1Settings(EncoderSettings):
     cpu_used: str = "4"
     crf: Optional[Union[int, float]] = 26
     bitrate: Optional[str] = None
+    chunks: str = "1"
+    chunk_workers: str = "auto"
 
 
 class WebPSettings(EncoderSettings):
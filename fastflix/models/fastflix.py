@@ -15,7 +15,7 @@ class FastFlix(BaseModel):
     config: Config = None
     data_path: Path = Path(user_data_dir("FastFlix", appauthor=False, roaming=True))
     log_path: Path = Path(user_data_dir("FastFlix", appauthor=False, roaming=True)) / "logs"
-    queue_path: Path = Path(user_data_dir("FastFlix", appauthor=False, roaming=True)) / "queue.yaml"
+    queue_path: Path = Path(user_data_dir("FastFlix", appauthor=False, roaming=True)) / "queue.sqlite"
     ffmpeg_version: str = ""
     ffmpeg_config: list[str] = ""
     ffprobe_version: str = ""
@@ -25,6 +25,7 @@ class FastFlix(BaseModel):
     worker_queue: Any = None
     status_queue: Any = None
     log_queue: Any = None
+    progress_queue: Any = None
 
     current_video: Video | None = None
 
@@ -32,6 +33,7 @@ class FastFlix(BaseModel):
     currently_encoding: bool = False
     conversion_paused: bool = False
     conversion_list: list[Video] = Field(default_factory=list)
+    encoding_slots: dict[int, str] = Field(default_factory=dict)
     current_video_encode_index = 0
     current_command_encode_index = 0
 
@@ -4,7 +4,7 @@ from pathlib import Path
 from typing import List, Optional, Union, Tuple
 
 from box import Box
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 from fastflix.models.encode import (
     AOMAV1Settings,
@@ -144,14 +144,15 @@ class Status(BaseModel):
     def ready(self) -> bool:
         return not self.success and not self.error and not self.complete and not self.running and not self.cancelled
 
-    def clear(self):
+    def clear(self, keep_progress: bool = False):
         self.success = False
         self.error = False
         self.complete = False
         self.running = False
         self.cancelled = False
         self.subtitle_fixed = False
-        self.current_command = 0
+        if not keep_progress:
+            self.current_command = 0
 
 
 class Video(BaseModel):
@@ -162,6 +163,7 @@ class Video(BaseModel):
     work_path: Path = None
     format: Box = None
     interlaced: Union[str, bool] = False
+    interlace_confidence: float = 0.0  # share of idet's decided frames that agree with interlaced
     concat: bool = False
 
     hdr10_streams: list[Box] = Field(default_factory=list)
@@ -171,14 +173,35 @@ class Video(BaseModel):
     status: Status = Field(default_factory=Status)
     uuid: str = Field(default_factory=lambda: str(uuid.uuid4()))
 
+    _stream_cache: dict = PrivateAttr(default_factory=dict)
+    # Queue database still holding the FFprobe data left out when loading, see ff_queue.load_probe_data
+    _probe_database: Optional[Path] = PrivateAttr(default=None)
+
+    def _selected_stream(self) -> dict:
+        """
+        The selected video stream and its rotated size, looked up once and kept
+        until the streams are replaced or a different track is selected.
+        """
+        streams = self.streams
+        track = self.video_settings.selected_track
+        key = (id(streams), id(streams.video), len(streams.video), track) if streams else (None, track)
+        if self._stream_cache.get("key") != key:
+            by_index = {x.index: x for x in streams.video} if streams else {}
+            self._stream_cache = {
+                "key": key,
+                "stream": by_index.get(track),
+                "size": determine_rotation(streams, track) if streams else (0, 0),
+            }
+        return self._stream_cache
+
     @property
     def width(self):
-        w, _ = determine_rotation(self.streams, self.video_settings.selected_track)
+        w, _ = self._selected_stream()["size"]
         return w
 
     @property
     def height(self):
-        _, h = determine_rotation(self.streams, self.video_settings.selected_track)
+        _, h = self._selected_stream()["size"]
         return h
 
     @property
@@ -197,10 +220,7 @@ class Video(BaseModel):
 
     @property
     def current_video_stream(self):
-        try:
-            return [x for x in self.streams.video if x.index == self.video_settings.selected_track][0]
-        except IndexError:
-            return None
+        return self._selected_stream()["stream"]
 
     @property
     def color_space(self):
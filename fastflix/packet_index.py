@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Index of every packet of a video track, built from one FFprobe packet pass (no decoding)
+and saved as NumPy arrays, so keyframe and bitrate questions never need to read the file again.
+
+Index files are named after the same file key as the probe cache, so a changed file is indexed again.
+"""
+import hashlib
+import logging
+import time
+from pathlib import Path
+from subprocess import PIPE, run
+from typing import Optional, Union
+
+import numpy as np
+
+from fastflix.probe_cache import file_key, max_age
+from fastflix.shared import clean_file_string
+
+logger = logging.getLogger("fastflix")
+
+__all__ = ["PacketIndex", "build_packet_index", "get_packet_index"]
+
+
+class PacketIndex:
+    """Packets of one track in presentation order, times in seconds from the start of the file"""
+
+    def __init__(self, pts: np.ndarray, size: np.ndarray, keyframe: np.ndarray):
+        order = np.argsort(pts, kind="stable")
+        self.pts = pts[order]
+        self.size = size[order]
+        self.keyframe = keyframe[order]
+        self.keyframes = self.pts[self.keyframe]
+
+    def __len__(self):
+        return len(self.pts)
+
+    @property
+    def duration(self) -> float:
+        return float(self.pts[-1]) if len(self.pts) else 0.0
+
+    def keyframe_at_or_before(self, time: float) -> float:
+        position = np.searchsorted(self.keyframes, time, side="right") - 1
+        return float(self.keyframes[position]) if position >= 0 else 0.0
+
+    def keyframe_after(self, time: float, window: Optional[float] = None) -> Union[float, None]:
+        """First keyframe at or after the time, None if there is none (within the window)"""
+        position = np.searchsorted(self.keyframes, time, side="left")
+        if position >= len(self.keyframes):
+            return None
+        found = float(self.keyframes[position])
+        if window is not None and found > time + window:
+            return None
+        return found
+
+    def frame_at(self, time: float) -> int:
+        """Number of frames shown before the time, correct for variable frame rate video too"""
+        return int(np.searchsorted(self.pts, time, side="left"))
+
+    def bitrate(self, start: float, end: float) -> float:
+        """Average bits per second of the packets inside the window"""
+        if end <= start:
+            return 0.0
+        first, last = np.searchsorted(self.pts, [start, end], side="left")
+        return float(self.size[first:last].sum()) * 8 / (end - start)
+
+    def save(self, path: Path):
+        with open(path, "wb") as f:
+            np.savez_compressed(f, pts=self.pts, size=self.size, keyframe=self.keyframe)
+
+    @classmethod
+    def load(cls, path: Path) -> "PacketIndex":
+        with np.load(path) as data:
+            return cls(data["pts"], data["size"], data["keyframe"])
+
+
+def build_packet_index(ffprobe: Path, source: Path, track: int) -> Union[PacketIndex, None]:
+    command = [
+        f"{ffprobe}",
+        "-v",
+        "quiet",
+        "-select_streams",
+        f"{track}",
+        "-show_entries",
+        "packet=pts_time,size,flags:format=start_time",
+        "-print_format",
+        "csv",
+        f"{clean_file_string(source)}",
+    ]
+    logger.debug(f"Indexing packets: {' '.join(command)}")
+    try:
+        result = run(command, stdout=PIPE, stderr=PIPE, stdin=PIPE, encoding="utf-8")
+    except OSError:
+        logger.exception(f"Could not run FFprobe to index {source}")
+        return None
+    if result.returncode != 0:
+        logger.warning(f"Could not index packets of {source}: {result.stderr}")
+        return None
+
+    start, pts, size, keyframe = 0.0, [], [], []
+    for line in result.stdout.splitlines():
+        fields = line.split(",")
+        if fields[0] == "packet" and len(fields) >= 4 and fields[1] not in ("", "N/A"):
+            pts.append(float(fields[1]))
+            size.append(int(fields[2]))
+            keyframe.append("K" in fields[3])
+        elif fields[0] == "format" and len(fields) > 1 and fields[1] not in ("", "N/A"):
+            start = float(fields[1])
+    if not pts:
+        return None
+    return PacketIndex(
+        np.array(pts, dtype=np.float64) - start, np.array(size, dtype=np.uint32), np.array(keyframe, dtype=bool)
+    )
+
+
+def get_packet_index(
+    ffprobe: Path, source: Path, track: int, cache_dir: Path, build: bool = True
+) -> Union[PacketIndex, None]:
+    """The saved index for this exact file and track, built and saved first if build is set"""
+    try:
+        name = hashlib.blake2b(f"{file_key(source)}|{track}".encode("utf-8"), digest_size=16).hexdigest()
+    except OSError:
+        return None
+    path = Path(cache_dir) / f"{name}.npz"
+    if path.exists():
+        try:
+            index = PacketIndex.load(path)
+            path.touch()
+            return index
+        except (OSError, ValueError, KeyError):
+            logger.warning(f"Could not read packet index {path}, indexing again")
+    if not build:
+        return None
+
+    index = build_packet_index(ffprobe, source, track)
+    if index is None:
+        return None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        for old in path.parent.glob("*.npz"):
+            if old.stat().st_mtime < time.time() - max_age:
+                old.unlink()
+        index.save(path)
+    except OSError:
+        logger.warning(f"Could not save packet index to {path}")
+    return index
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+On disk cache of FFprobe output and the analysis done when a file is opened.
+
+Entries are keyed by the file's path, size, modification time and a hash of its first and last MiB,
+so an edited or replaced file is never matched, and are only used by the same FFprobe / FFmpeg versions.
+"""
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from contextlib import closing
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger("fastflix")
+
+__all__ = ["ProbeCache", "get_probe_cache"]
+
+hash_block_size = 1024 * 1024
+max_age = 60 * 60 * 24 * 180  # seconds, entries for files not opened in half a year are removed
+
+
+@lru_cache(maxsize=256)
+def content_hash(source: Path, size: int, mtime_ns: int) -> str:
+    """Opening a file looks it up several times, it is only read again once its size or modification time changed"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(source, "rb") as f:
+        digest.update(f.read(hash_block_size))
+        if size > hash_block_size * 2:
+            f.seek(-hash_block_size, 2)
+            digest.update(f.read(hash_block_size))
+    return digest.hexdigest()
+
+
+def file_key(source: Path) -> str:
+    source = Path(source).resolve()
+    stat = source.stat()
+    return f"{source}|{stat.st_size}|{stat.st_mtime_ns}|{content_hash(source, stat.st_size, stat.st_mtime_ns)}"
+
+
+class ProbeCache:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.enabled = True
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with closing(self.connect()) as db, db:
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS probe ("
+                    "file_key TEXT, name TEXT, tool_version TEXT, data TEXT, used REAL, "
+                    "PRIMARY KEY (file_key, name))"
+                )
+                db.execute("DELETE FROM probe WHERE used < ?", (time.time() - max_age,))
+        except sqlite3.Error:
+            logger.exception(f"Could not open probe cache {self.path}, files will be probed every time")
+            self.enabled = False
+
+    def connect(self) -> sqlite3.Connection:
+        # A connection per call, as analysis tasks can run on any thread
+        return sqlite3.connect(self.path, timeout=10)
+
+    def get(self, source: Path, name: str, tool_version: str) -> Optional[Any]:
+        if not self.enabled or not tool_version:
+            return None
+        try:
+            key = file_key(source)
+            with closing(self.connect()) as db, db:
+                row = db.execute(
+                    "SELECT data FROM probe WHERE file_key = ? AND name = ? AND tool_version = ?",
+                    (key, name, tool_version),
+                ).fetchone()
+                if row is None:
+                    return None
+                db.execute("UPDATE probe SET used = ? WHERE file_key = ? AND name = ?", (time.time(), key, name))
+            return json.loads(row[0])
+        except (OSError, sqlite3.Error, ValueError):
+            logger.exception(f"Could not read {name} for {source} from probe cache")
+            return None
+
+    def set(self, source: Path, name: str, tool_version: str, data: Any):
+        if not self.enabled or not tool_version:
+            return
+        try:
+            key = file_key(source)
+            with closing(self.connect()) as db, db:
+                db.execute(
+                    "INSERT OR REPLACE INTO probe (file_key, name, tool_version, data, used) VALUES (?, ?, ?, ?, ?)",
+                    (key, name, tool_version, json.dumps(data), time.time()),
+                )
+        except (OSError, sqlite3.Error, TypeError, ValueError):
+            logger.exception(f"Could not save {name} for {source} to probe cache")
+
+
+@lru_cache(maxsize=4)
+def get_probe_cache(data_path: Path) -> ProbeCache:
+    return ProbeCache(Path(data_path) / "probe_cache.sqlite")
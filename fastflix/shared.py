@@ -4,6 +4,7 @@ import logging
 import os
 import sys
 from datetime import datetime, timedelta
+from functools import lru_cache
 from distutils.version import StrictVersion
 from pathlib import Path
 from subprocess import run
@@ -25,15 +26,12 @@ except AttributeError:
     base_path = os.path.abspath(".")
     pyinstaller = False
 
-from PySide6 import QtCore, QtGui, QtWidgets
-
 from fastflix.language import t
 from fastflix.resources import get_bool_env
 
 DEVMODE = get_bool_env("DEVMODE")
 
 my_data = str(Path(pkg_resources.resource_filename(__name__, f"../data/icon.ico")).resolve())
-icon = QtGui.QIcon(my_data)
 
 logger = logging.getLogger("fastflix")
 no_border = (
@@ -42,32 +40,48 @@ no_border = (
 )
 
 
-class MyMessageBox(QtWidgets.QMessageBox):
-    def __init__(self):
-        QtWidgets.QMessageBox.__init__(self)
-        self.setSizeGripEnabled(True)
+@lru_cache(maxsize=1)
+def message_box_class():
+    """Qt is only loaded once a dialog is needed, so the core process and batch mode can run without it"""
+    from PySide6 import QtWidgets
+
+    class MyMessageBox(QtWidgets.QMessageBox):
+        def __init__(self):
+            QtWidgets.QMessageBox.__init__(self)
+            self.setSizeGripEnabled(True)
+
+        def event(self, e):
+            result = QtWidgets.QMessageBox.event(self, e)
+
+            self.setMinimumHeight(0)
+            self.setMaximumHeight(16777215)
+            self.setMinimumWidth(0)
+            self.setMaximumWidth(16777215)
+            self.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+
+            text_edit = self.findChild(QtWidgets.QTextEdit)
+            if text_edit is not None:
+                text_edit.setMinimumHeight(0)
+                text_edit.setMaximumHeight(16777215)
+                text_edit.setMinimumWidth(0)
+                text_edit.setMaximumWidth(16777215)
+                text_edit.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
 
-    def event(self, e):
-        result = QtWidgets.QMessageBox.event(self, e)
+            return result
 
-        self.setMinimumHeight(0)
-        self.setMaximumHeight(16777215)
-        self.setMinimumWidth(0)
-        self.setMaximumWidth(16777215)
-        self.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+    return MyMessageBox
 
-        text_edit = self.findChild(QtWidgets.QTextEdit)
-        if text_edit is not None:
-            text_edit.setMinimumHeight(0)
-            text_edit.setMaximumHeight(16777215)
-            text_edit.setMinimumWidth(0)
-            text_edit.setMaximumWidth(16777215)
-            text_edit.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
 
-        return result
+@lru_cache(maxsize=1)
+def window_icon():
+    from PySide6 import QtGui
+
+    return QtGui.QIcon(my_data)
 
 
 def message(msg, title=None):
+    from PySide6 import QtCore, QtWidgets
+
     sm = QtWidgets.QMessageBox()
     sm.setStyleSheet("font-size: 14px")
     sm.setText(msg)
@@ -75,15 +89,17 @@ def message(msg, title=None):
     if title:
         sm.setWindowTitle(title)
     sm.setStandardButtons(QtWidgets.QMessageBox.Ok)
-    sm.setWindowIcon(icon)
+    sm.setWindowIcon(window_icon())
     sm.exec_()
 
 
 def error_message(msg, details=None, traceback=False, title=None):
-    em = MyMessageBox()
+    from PySide6 import QtCore, QtWidgets
+
+    em = message_box_class()()
     em.setStyleSheet("font-size: 14px")
     em.setText(msg)
-    em.setWindowIcon(icon)
+    em.setWindowIcon(window_icon())
     em.setWindowFlags(em.windowFlags() | QtCore.Qt.WindowStaysOnTopHint)
     if title:
         em.setWindowTitle(title)
@@ -98,6 +114,8 @@ def error_message(msg, details=None, traceback=False, title=None):
 
 
 def yes_no_message(msg, title=None, yes_text=t("Yes"), no_text=t("No"), yes_action=None, no_action=None):
+    from PySide6 import QtCore, QtWidgets
+
     sm = QtWidgets.QMessageBox()
     sm.setStyleSheet("font-size: 14px")
     sm.setWindowTitle(t(title))
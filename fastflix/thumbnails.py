@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Preview frames already rendered for the slider positions, so scrubbing back and forth only shows them again
+and only a change to the filters renders new ones.
+
+Frames come from FFmpeg as PPM images on stdout and are turned into a QImage straight from that buffer,
+nothing is encoded to JPEG or written to disk.
+"""
+import hashlib
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from PySide6 import QtGui
+
+__all__ = ["ThumbnailCache", "thumbnail_key", "ppm_header", "frame_to_image"]
+
+
+def thumbnail_key(**parts) -> str:
+    """Short stable name for everything that changes the rendered picture"""
+    text = "|".join(f"{name}={parts[name]}" for name in sorted(parts))
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=12).hexdigest()
+
+
+def ppm_header(frame: bytes) -> Tuple[int, int, int]:
+    """Width, height and where the RGB24 pixels start in a binary PPM (P6) image"""
+    fields, position = [], 0
+    while len(fields) < 4:
+        while position < len(frame) and frame[position : position + 1].isspace():
+            position += 1
+        end = position
+        while end < len(frame) and not frame[end : end + 1].isspace():
+            end += 1
+        if end == position:
+            raise ValueError("Incomplete PPM header")
+        fields.append(frame[position:end])
+        position = end
+    if fields[0] != b"P6" or fields[3] != b"255":
+        raise ValueError("Not an 8-bit binary PPM image")
+    width, height = int(fields[1]), int(fields[2])
+    # Exactly one whitespace byte separates the header from the pixels
+    offset = position + 1
+    if len(frame) - offset < width * height * 3:
+        raise ValueError("PPM image is missing pixels")
+    return width, height, offset
+
+
+def frame_to_image(frame: bytes) -> QtGui.QImage:
+    width, height, offset = ppm_header(frame)
+    pixels = frame[offset : offset + width * height * 3]
+    # QImage only points at the buffer, copy it so the image outlives the bytes
+    return QtGui.QImage(pixels, width, height, width * 3, QtGui.QImage.Format_RGB888).copy()
+
+
+class ThumbnailCache:
+    """Least recently used frames by key, the oldest are dropped once max_items are stored"""
+
+    def __init__(self, max_items: int = 40):
+        self.max_items = max_items
+        self._frames = OrderedDict()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._frames
+
+    def __len__(self):
+        return len(self._frames)
+
+    def get(self, key: str) -> Optional[bytes]:
+        if key not in self._frames:
+            return None
+        self._frames.move_to_end(key)
+        return self._frames[key]
+
+    def set(self, key: str, frame: bytes):
+        self._frames[key] = frame
+        self._frames.move_to_end(key)
+        while len(self._frames) > self.max_items:
+            self._frames.popitem(last=False)
+
+    def clear(self):
+        self._frames.clear()
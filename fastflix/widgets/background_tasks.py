@@ -1,32 +1,64 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from threading import Lock
 from subprocess import PIPE, STDOUT, Popen, run, check_output
 from distutils.version import LooseVersion
+from typing import List, Tuple
 
 from PySide6 import QtCore
 
 from fastflix.language import t
 from fastflix.models.fastflix_app import FastFlixApp
+from fastflix.packet_index import get_packet_index
 from fastflix.shared import clean_file_string
 
 logger = logging.getLogger("fastflix")
 
-__all__ = ["ThumbnailCreator", "ExtractSubtitleSRT", "ExtractHDR10"]
+__all__ = ["ThumbnailCreator", "ExtractSubtitleSRT", "ExtractHDR10", "IndexPackets"]
 
 
 class ThumbnailCreator(QtCore.QThread):
-    def __init__(self, main, command=""):
+    """
+    Render preview frames in parallel, jobs are (key, FFmpeg arguments) with the most wanted first.
+    Each frame is handed back as (key, PPM image) through main.thumbnail_complete, empty if it failed.
+    Once cancelled, running FFmpeg processes are killed and nothing more is handed back.
+    """
+
+    max_workers = 4
+
+    def __init__(self, main, jobs: List[Tuple[str, List[str]]]):
         super().__init__(main)
         self.main = main
-        self.command = command
-
-    def run(self):
-        self.main.thread_logging_signal.emit(f"INFO:{t('Generating thumbnail')}: {self.command}")
-        result = run(self.command, stdin=PIPE, stdout=PIPE, stderr=STDOUT, shell=True)
-        if result.returncode > 0:
-            if "No such filter: 'zscale'" in result.stdout.decode(encoding="utf-8", errors="ignore"):
+        self.jobs = jobs
+        self.keys = {key for key, _ in jobs}
+        self.cancelled = False
+        self.processes = set()
+        self.lock = Lock()
+
+    def cancel(self):
+        with self.lock:
+            self.cancelled = True
+            for process in self.processes:
+                process.kill()
+
+    def render(self, key: str, command: List[str]):
+        with self.lock:
+            if self.cancelled:
+                return
+            self.main.thread_logging_signal.emit(f"INFO:{t('Generating thumbnail')}: {' '.join(command)}")
+            process = Popen(command, stdin=PIPE, stdout=PIPE, stderr=PIPE)
+            self.processes.add(process)
+        stdout, stderr = process.communicate()
+        with self.lock:
+            self.processes.discard(process)
+            if self.cancelled:
+                return
+        if process.returncode > 0 or not stdout:
+            errors = stderr.decode(encoding="utf-8", errors="ignore")
+            if "No such filter: 'zscale'" in errors:
                 self.main.thread_logging_signal.emit(
                     "ERROR:Could not generate thumbnail because you are using an outdated FFmpeg! "
                     "Please use FFmpeg 4.3+ built against the latest zimg libraries. "
@@ -34,11 +66,15 @@ class ThumbnailCreator(QtCore.QThread):
                     "(Linux distributions are often slow to update)"
                 )
             else:
-                self.main.thread_logging_signal.emit(f"ERROR:{t('Could not generate thumbnail')}: {result.stdout}")
+                self.main.thread_logging_signal.emit(f"ERROR:{t('Could not generate thumbnail')}: {errors}")
+            self.main.thumbnail_complete.emit(key, b"")
+            return
+        self.main.thumbnail_complete.emit(key, stdout)
 
-            self.main.thumbnail_complete.emit(0)
-        else:
-            self.main.thumbnail_complete.emit(1)
+    def run(self):
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(self.jobs) or 1)) as pool:
+            for job in self.jobs:
+                pool.submit(self.render, *job)
 
 
 class ExtractSubtitleSRT(QtCore.QThread):
@@ -169,3 +205,20 @@ class ExtractHDR10(QtCore.QThread):
         stdout, stderr = process_two.communicate()
         self.main.thread_logging_signal.emit(f"DEBUG: HDR10+ Extract: {stdout}")
         self.signal.emit(str(output))
+
+
+class IndexPackets(QtCore.QThread):
+    """Index the video track's packets ahead of time, so chunking and trimming can use its exact keyframes and frames"""
+
+    def __init__(self, main, ffprobe: Path, source: Path, track: int, cache_dir: Path):
+        super().__init__(main)
+        self.main = main
+        self.ffprobe = ffprobe
+        self.source = source
+        self.track = track
+        self.cache_dir = cache_dir
+
+    def run(self):
+        if get_packet_index(self.ffprobe, self.source, self.track, self.cache_dir):
+            logger.debug(f"Packet index ready for track {self.track} of {self.source}")
+            self.main.packet_index_complete.emit(f"{self.source}|{self.track}")
@@ -20,15 +20,16 @@ from pydantic import BaseModel, Field
 from PySide6 import QtCore, QtGui, QtWidgets
 
 from fastflix.encoders.common import helpers
+from fastflix.encoders.common.helpers import command_key
 from fastflix.exceptions import FastFlixInternalException, FlixError
+from fastflix.ff_queue import load_probe_data, save_queue
 from fastflix.flix import (
+    analyze_source,
     detect_hdr10_plus,
-    detect_interlaced,
     extract_attachments,
     generate_thumbnail_command,
     get_auto_crop,
     parse,
-    parse_hdr_details,
     get_concat_item,
 )
 from fastflix.language import t
@@ -44,8 +45,9 @@ from fastflix.resources import (
     get_text_color,
 )
 from fastflix.shared import error_message, message, time_to_number, yes_no_message, clean_file_string
+from fastflix.thumbnails import ThumbnailCache, frame_to_image, thumbnail_key
 from fastflix.windows_tools import show_windows_notification, prevent_sleep_mode, allow_sleep_mode
-from fastflix.widgets.background_tasks import ThumbnailCreator
+from fastflix.widgets.background_tasks import IndexPackets, ThumbnailCreator
 from fastflix.widgets.progress_bar import ProgressBar, Task
 from fastflix.widgets.video_options import VideoOptions
 from fastflix.widgets.windows.large_preview import LargePreview
@@ -58,11 +60,11 @@ only_int = QtGui.QIntValidator()
 
 Request = namedtuple(
     "Request",
-    ["request", "video_uuid", "command_uuid", "command", "work_dir", "log_name"],
-    defaults=[None, None, None, None, None],
+    ["request", "video_uuid", "command_uuid", "command", "work_dir", "log_name", "slot", "chunks"],
+    defaults=[None, None, None, None, None, 0, None],
 )
 
-Response = namedtuple("Response", ["status", "video_uuid", "command_uuid"])
+Response = namedtuple("Response", ["status", "video_uuid", "command_uuid", "slot"], defaults=[0])
 
 
 class CropWidgets(BaseModel):
@@ -123,7 +125,8 @@ class MainWidgets(BaseModel):
 
 class Main(QtWidgets.QWidget):
     completed = QtCore.Signal(int)
-    thumbnail_complete = QtCore.Signal(int)
+    thumbnail_complete = QtCore.Signal(str, bytes)
+    packet_index_complete = QtCore.Signal(str)
     close_event = QtCore.Signal()
     status_update_signal = QtCore.Signal(tuple)
     thread_logging_signal = QtCore.Signal(str)
@@ -139,6 +142,15 @@ class Main(QtWidgets.QWidget):
         self.loading_video = True
         self.scale_updating = False
         self.last_thumb_hash = ""
+        self.thumb_wanted = ""
+        self.thumb_pending = set()
+        self.thumbnail_cache = ThumbnailCache()
+        self.thumbnail_workers = []
+        self.last_command_key = None
+        self.last_commands = []
+        self.packet_index_ready = ""
+        self.queue_errored = False
+        self.detected_crop: Optional[Crop] = None
 
         self.large_preview = LargePreview(self)
 
@@ -207,8 +219,6 @@ class Main(QtWidgets.QWidget):
 
         self.buttons = []
 
-        self.thumb_file = Path(self.app.fastflix.config.work_path, "thumbnail_preview.jpg")
-
         self.video_options = VideoOptions(
             self,
             app=self.app,
@@ -219,6 +229,12 @@ class Main(QtWidgets.QWidget):
         # self.cancelled.connect(self.conversion_cancelled)
         self.close_event.connect(self.close)
         self.thumbnail_complete.connect(self.thumbnail_generated)
+        self.packet_index_complete.connect(self.packet_index_done)
+        # Settings can change many times a second while typing, only preview once they settle
+        self.thumbnail_timer = QtCore.QTimer(self)
+        self.thumbnail_timer.setSingleShot(True)
+        self.thumbnail_timer.setInterval(250)
+        self.thumbnail_timer.timeout.connect(self.generate_thumbnail)
         self.status_update_signal.connect(self.status_update)
         self.thread_logging_signal.connect(self.thread_logger)
         self.encoding_worker = None
@@ -407,7 +423,7 @@ class Main(QtWidgets.QWidget):
             logger.info("Resuming FFmpeg conversion")
 
     def config_update(self):
-        self.thumb_file = Path(self.app.fastflix.config.work_path, "thumbnail_preview.jpg")
+        self.video_options.status.refresh_slots()
         self.change_output_types()
         self.page_update(build_thumbnail=True)
 
@@ -1031,58 +1047,65 @@ class Main(QtWidgets.QWidget):
         if not self.input_video or not self.initialized or self.loading_video:
             return
 
-        start_pos = self.start_time or self.app.fastflix.current_video.duration // 10
-
-        blocks = math.ceil(
-            (self.app.fastflix.current_video.duration - start_pos) / (self.app.fastflix.config.crop_detect_points + 1)
-        )
-        if blocks < 1:
-            blocks = 1
-
-        times = [
-            x
-            for x in range(int(start_pos), int(self.app.fastflix.current_video.duration), blocks)
-            if x < self.app.fastflix.current_video.duration
-        ][: self.app.fastflix.config.crop_detect_points]
-
-        if not times:
-            return
+        if self.detected_crop is not None and not self.start_time:
+            # Already found while opening the file, from the same points in the video
+            r, b, l, tp = (
+                self.detected_crop.right,
+                self.detected_crop.bottom,
+                self.detected_crop.left,
+                self.detected_crop.top,
+            )
+        else:
+            start_pos = self.start_time or self.app.fastflix.current_video.duration // 10
 
-        self.app.processEvents()
-        result_list = []
-        tasks = [
-            Task(
-                f"{t('Auto Crop - Finding black bars at')} {self.number_to_time(x)}",
-                get_auto_crop,
-                dict(
-                    source=self.source_material,
-                    video_width=self.app.fastflix.current_video.width,
-                    video_height=self.app.fastflix.current_video.height,
-                    input_track=self.original_video_track,
-                    start_time=x,
-                    end_time=self.end_time,
-                    result_list=result_list,
-                ),
+            blocks = math.ceil(
+                (self.app.fastflix.current_video.duration - start_pos)
+                / (self.app.fastflix.config.crop_detect_points + 1)
             )
-            for x in times
-        ]
-        ProgressBar(self.app, tasks)
+            if blocks < 1:
+                blocks = 1
 
-        smallest = (self.app.fastflix.current_video.height + self.app.fastflix.current_video.width) * 2
-        selected = result_list[0]
-        for result in result_list:
-            if (total := sum(result)) < smallest:
-                selected = result
-                smallest = total
+            times = [
+                x
+                for x in range(int(start_pos), int(self.app.fastflix.current_video.duration), blocks)
+                if x < self.app.fastflix.current_video.duration
+            ][: self.app.fastflix.config.crop_detect_points]
 
-        r, b, l, tp = selected
+            if not times:
+                return
 
-        if tp + b > self.app.fastflix.current_video.height * 0.9 or r + l > self.app.fastflix.current_video.width * 0.9:
-            logger.warning(
-                f"{t('Autocrop tried to crop too much')}"
-                f" ({t('left')} {l}, {t('top')} {tp}, {t('right')} {r}, {t('bottom')} {b}), {t('ignoring')}"
+            self.app.processEvents()
+            result_list = []
+            ProgressBar(
+                self.app,
+                [
+                    Task(
+                        t("Auto Crop"),
+                        get_auto_crop,
+                        dict(
+                            source=self.source_material,
+                            video_width=self.app.fastflix.current_video.width,
+                            video_height=self.app.fastflix.current_video.height,
+                            input_track=self.original_video_track,
+                            start_times=times,
+                            result_list=result_list,
+                        ),
+                    )
+                ],
             )
-            return
+            if not result_list:
+                return
+            r, b, l, tp = result_list[0]
+
+            if (
+                tp + b > self.app.fastflix.current_video.height * 0.9
+                or r + l > self.app.fastflix.current_video.width * 0.9
+            ):
+                logger.warning(
+                    f"{t('Autocrop tried to crop too much')}"
+                    f" ({t('left')} {l}, {t('top')} {tp}, {t('right')} {r}, {t('bottom')} {b}), {t('ignoring')}"
+                )
+                return
 
         # Hack to stop thumb gen
         self.loading_video = True
@@ -1279,6 +1302,7 @@ class Main(QtWidgets.QWidget):
     def clear_current_video(self):
         self.loading_video = True
         self.app.fastflix.current_video = None
+        self.detected_crop = None
         self.input_video = None
         self.source_video_path_widget.setText("")
         self.video_path_widget.setText(t("No Source Selected"))
@@ -1314,8 +1338,10 @@ class Main(QtWidgets.QWidget):
     @reusables.log_exception("fastflix", show_traceback=True)
     def reload_video_from_queue(self, video: Video):
         self.loading_video = True
+        load_probe_data(video)
 
         self.app.fastflix.current_video = video
+        self.detected_crop = None
         self.app.fastflix.current_video.work_path.mkdir(parents=True, exist_ok=True)
         extract_attachments(app=self.app)
         self.input_video = video.source
@@ -1393,16 +1419,16 @@ class Main(QtWidgets.QWidget):
         self.output_video_path_widget.setDisabled(False)
         self.output_path_button.setDisabled(False)
         self.app.fastflix.current_video = Video(source=self.input_video, work_path=self.get_temp_work_path())
+        parse_task = t("Parse Video details")
         tasks = [
-            Task(t("Parse Video details"), parse),
-            Task(t("Extract covers"), extract_attachments),
-            Task(t("Detecting Interlace"), detect_interlaced, dict(source=self.source_material)),
-            Task(t("Determine HDR details"), parse_hdr_details),
-            Task(t("Detect HDR10+"), detect_hdr10_plus),
+            Task(parse_task, parse),
+            Task(t("Extract covers"), extract_attachments, depends_on=[parse_task]),
+            Task(t("Detecting interlace, black bars and HDR details"), analyze_source, depends_on=[parse_task]),
+            Task(t("Detect HDR10+"), detect_hdr10_plus, depends_on=[parse_task]),
         ]
 
         try:
-            ProgressBar(self.app, tasks)
+            ProgressBar(self.app, tasks, concurrent=True)
         except FlixError:
             error_message(f"{t('Not a video file')}<br>{self.input_video}")
             self.clear_current_video()
@@ -1412,6 +1438,8 @@ class Main(QtWidgets.QWidget):
             self.clear_current_video()
             error_message(f"Could not properly read the file {self.input_video}")
             return
+        # The video settings are rebuilt from the widgets, keep the crop found while analyzing for auto crop
+        self.detected_crop = self.app.fastflix.current_video.video_settings.crop
 
         hdr10_indexes = [x.index for x in self.app.fastflix.current_video.hdr10_streams]
         text_video_tracks = [
@@ -1468,9 +1496,16 @@ class Main(QtWidgets.QWidget):
             self.widgets.video_title.setText("")
 
         self.widgets.deinterlace.setChecked(self.app.fastflix.current_video.video_settings.deinterlace)
+        self.widgets.deinterlace.setToolTip(
+            f'{t("Enables the yadif filter.")}\n'
+            f'{t("Automatically enabled when an interlaced video is detected")}\n'
+            f'{t("Detected")}: {self.app.fastflix.current_video.interlaced or t("Progressive")} '
+            f"({self.app.fastflix.current_video.interlace_confidence:.0%})"
+        )
 
         self.video_options.new_source()
         self.enable_all()
+        self.index_packets()
         # self.widgets.convert_button.setDisabled(False)
         # self.widgets.convert_button.setStyleSheet("background-color:green;")
         self.loading_video = False
@@ -1528,11 +1563,15 @@ class Main(QtWidgets.QWidget):
 
     @property
     def preview_place(self) -> Union[float, int]:
+        return self.preview_place_at(self.widgets.thumb_time.value())
+
+    def preview_place_at(self, position: int) -> Union[float, int]:
         ticks = self.app.fastflix.current_video.duration / 10
-        return (self.widgets.thumb_time.value() - 1) * ticks
+        return (position - 1) * ticks
 
     @reusables.log_exception("fastflix", show_traceback=False)
     def generate_thumbnail(self):
+        """Show the preview at the slider position, rendering it and any other positions not seen yet"""
         if not self.input_video or self.loading_video:
             return
 
@@ -1552,29 +1591,67 @@ class Main(QtWidgets.QWidget):
             start_filters="select=eq(pict_type\\,I)" if self.widgets.thumb_key.isChecked() else None,
             custom_filters=custom_filters,
             enable_opencl=self.app.fastflix.opencl_support,
+            raw_filters=True,
             **settings,
         )
 
-        thumb_command = generate_thumbnail_command(
-            config=self.app.fastflix.config,
-            source=self.source_material,
-            output=self.thumb_file,
-            filters=filters,
-            enable_opencl=self.app.fastflix.opencl_support,
-            start_time=self.preview_place if not self.app.fastflix.current_video.concat else None,
-            input_track=self.app.fastflix.current_video.video_settings.selected_track,
-        )
-        try:
-            self.thumb_file.unlink()
-        except OSError:
-            pass
-        worker = ThumbnailCreator(self, thumb_command)
-        worker.start()
+        current = self.widgets.thumb_time.value()
+        # The slider position first, so it is rendered before the prefetched ones
+        wanted = []
+        for position in [current] + [x for x in range(1, 11) if x != current]:
+            source = self.source_material_at(position)
+            start_time = self.preview_place_at(position) if not self.app.fastflix.current_video.concat else None
+            key = thumbnail_key(
+                position=position,
+                source=source,
+                filters=filters,
+                start_time=start_time,
+                track=self.app.fastflix.current_video.video_settings.selected_track,
+                opencl=self.app.fastflix.opencl_support,
+            )
+            wanted.append((key, source, start_time))
+        self.thumb_wanted = wanted[0][0]
+        if self.thumb_wanted in self.thumbnail_cache:
+            self.show_thumbnail(self.thumbnail_cache.get(self.thumb_wanted))
+
+        # Renders for settings that are no longer shown at any position are superseded
+        wanted_keys = {key for key, _, _ in wanted}
+        for worker in self.thumbnail_workers:
+            if not worker.keys & wanted_keys:
+                self.cancel_thumbnails(worker)
+        self.thumbnail_workers = [worker for worker in self.thumbnail_workers if not worker.isFinished()]
+
+        jobs = []
+        for key, source, start_time in wanted:
+            if key in self.thumbnail_cache or key in self.thumb_pending:
+                continue
+            thumb_command = generate_thumbnail_command(
+                config=self.app.fastflix.config,
+                source=source,
+                filters=filters,
+                enable_opencl=self.app.fastflix.opencl_support,
+                start_time=start_time,
+                input_track=self.app.fastflix.current_video.video_settings.selected_track,
+            )
+            self.thumb_pending.add(key)
+            jobs.append((key, thumb_command))
+
+        if jobs:
+            worker = ThumbnailCreator(self, jobs)
+            self.thumbnail_workers.append(worker)
+            worker.start()
+
+    def cancel_thumbnails(self, worker: ThumbnailCreator):
+        worker.cancel()
+        self.thumb_pending -= worker.keys
 
     @property
     def source_material(self):
+        return self.source_material_at(self.widgets.thumb_time.value())
+
+    def source_material_at(self, position: int):
         if self.app.fastflix.current_video.concat:
-            return get_concat_item(self.input_video, self.widgets.thumb_time.value())
+            return get_concat_item(self.input_video, position)
         return self.input_video
 
     @staticmethod
@@ -1586,11 +1663,24 @@ class Main(QtWidgets.QWidget):
             logger.warning(text)
 
     @reusables.log_exception("fastflix", show_traceback=False)
-    def thumbnail_generated(self, success=False):
-        if not success or not self.thumb_file.exists():
+    def thumbnail_generated(self, key: str, frame: bytes):
+        self.thumb_pending.discard(key)
+        if frame:
+            self.thumbnail_cache.set(key, frame)
+        if key != self.thumb_wanted:
+            return
+        if not frame:
+            self.widgets.preview.setText(t("Error Updating Thumbnail"))
+            return
+        self.show_thumbnail(frame)
+
+    def show_thumbnail(self, frame: bytes):
+        try:
+            pixmap = QtGui.QPixmap.fromImage(frame_to_image(frame))
+        except ValueError:
+            logger.exception("Could not read the thumbnail FFmpeg returned")
             self.widgets.preview.setText(t("Error Updating Thumbnail"))
             return
-        pixmap = QtGui.QPixmap(str(self.thumb_file))
         pixmap = pixmap.scaled(420, 260, QtCore.Qt.KeepAspectRatio)
         self.widgets.preview.setPixmap(pixmap)
 
@@ -1655,11 +1745,19 @@ class Main(QtWidgets.QWidget):
             error_message(str(err))
             return False
 
+        # Page updates that only move the preview or repeat the same settings reuse the last commands.
+        # NVEncC trims and chunk cut points come from the packet index once it is ready, so it is part of the key
+        key = (command_key(self.app.fastflix), self.packet_index_ready)
+        if key == self.last_command_key:
+            self.app.fastflix.current_video.video_settings.conversion_commands = self.last_commands
+            return True
+
         commands = self.current_encoder.build(fastflix=self.app.fastflix)
         if not commands:
             return False
         self.video_options.commands.update_commands(commands)
         self.app.fastflix.current_video.video_settings.conversion_commands = commands
+        self.last_command_key, self.last_commands = key, commands
         return True
 
     def interlace_update(self):
@@ -1686,6 +1784,7 @@ class Main(QtWidgets.QWidget):
             return
         self.loading_video = True
         self.app.fastflix.current_video.video_settings.selected_track = self.original_video_track
+        self.detected_crop = None  # found for the previous track
         self.widgets.crop.top.setText("0")
         self.widgets.crop.left.setText("0")
         self.widgets.crop.right.setText("0")
@@ -1693,8 +1792,27 @@ class Main(QtWidgets.QWidget):
         self.widgets.scale.width.setText(str(self.app.fastflix.current_video.width))
         self.widgets.scale.height.setText(str(self.app.fastflix.current_video.height))
         self.loading_video = False
+        self.index_packets()
         self.page_update(build_thumbnail=True)
 
+    def packet_index_done(self, name: str):
+        self.packet_index_ready = name
+        video = self.app.fastflix.current_video
+        if video and name == f"{video.source}|{video.video_settings.selected_track}" and not self.loading_video:
+            self.build_commands()
+
+    def index_packets(self):
+        video = self.app.fastflix.current_video
+        if video.concat:
+            return
+        IndexPackets(
+            self,
+            self.app.fastflix.config.ffprobe,
+            video.source,
+            video.video_settings.selected_track,
+            self.app.fastflix.data_path / "packet_index",
+        ).start()
+
     def page_update(self, build_thumbnail=True):
         if not self.initialized or self.loading_video or not self.app.fastflix.current_video:
             return
@@ -1711,10 +1829,13 @@ class Main(QtWidgets.QWidget):
             if new_hash == self.last_thumb_hash:
                 return
             self.last_thumb_hash = new_hash
-            self.generate_thumbnail()
+            self.thumbnail_timer.start()
 
     def close(self, no_cleanup=False, from_container=False):
         self.app.fastflix.shutting_down = True
+        self.thumbnail_timer.stop()
+        for worker in self.thumbnail_workers:
+            self.cancel_thumbnails(worker)
         if not no_cleanup:
             try:
                 shutil.rmtree(self.temp_dir, ignore_errors=True)
@@ -1817,20 +1938,17 @@ class Main(QtWidgets.QWidget):
                 if not self.add_to_queue():
                     return
 
-        for video in self.app.fastflix.conversion_list:
-            if video.status.ready:
-                video_to_send: Video = video
-                break
-        else:
+        if not self.next_ready_video():
             error_message(t("There are no videos to start converting"))
             return
 
         logger.debug(t("Starting conversion process"))
 
+        self.queue_errored = False
         self.app.fastflix.currently_encoding = True
         prevent_sleep_mode()
         self.set_convert_button()
-        self.send_video_request_to_worker_queue(video_to_send)
+        self.fill_free_slots()
         self.disable_all()
         self.video_options.show_status()
 
@@ -1951,10 +2069,20 @@ class Main(QtWidgets.QWidget):
     def status_update(self, status_response):
         response = Response(*status_response)
         logger.debug(f"Updating queue from command worker: {response}")
+        if response.status == "rejected":
+            # The worker's slot was still winding down, put the video back in line and try again shortly
+            logger.warning(f"Slot {response.slot} was busy, {response.video_uuid} will be sent again")
+            if self.app.fastflix.encoding_slots.get(response.slot) == response.video_uuid:
+                self.app.fastflix.encoding_slots.pop(response.slot)
+            for video in self.app.fastflix.conversion_list:
+                if response.video_uuid == video.uuid:
+                    video.status.running = False
+            self.video_options.update_queue()
+            QtCore.QTimer.singleShot(1_000, self.resend_rejected)
+            return
+        self.app.fastflix.encoding_slots.pop(response.slot, None)
 
         video_to_send: Optional[Video] = None
-        errored = False
-        same_video = False
 
         for video in self.app.fastflix.conversion_list:
             if response.video_uuid == video.uuid:
@@ -1962,7 +2090,11 @@ class Main(QtWidgets.QWidget):
 
                 if response.status == "cancelled":
                     video.status.cancelled = True
-                    self.end_encoding()
+                    save_queue(
+                        self.app.fastflix.conversion_list, self.app.fastflix.queue_path, self.app.fastflix.config
+                    )
+                    if not self.app.fastflix.encoding_slots:
+                        self.end_encoding()
                     self.conversion_cancelled(video)
                     self.video_options.update_queue()
                     return
@@ -1970,7 +2102,6 @@ class Main(QtWidgets.QWidget):
                 if response.status == "complete":
                     video.status.current_command += 1
                     if len(video.video_settings.conversion_commands) > video.status.current_command:
-                        same_video = True
                         video_to_send = video
                         break
                     else:
@@ -1978,31 +2109,37 @@ class Main(QtWidgets.QWidget):
 
                 if response.status == "error":
                     video.status.error = True
-                    errored = True
+                    if not self.video_options.queue.ignore_errors.isChecked():
+                        self.queue_errored = True
                 break
 
-        if errored and not self.video_options.queue.ignore_errors.isChecked():
-            self.conversion_complete(success=False)
-            self.end_encoding()
+        # Keep the saved queue in step with the encode, so it can continue from here after a crash
+        save_queue(self.app.fastflix.conversion_list, self.app.fastflix.queue_path, self.app.fastflix.config)
+
+        if video_to_send:
+            # The rest of a video's commands always run in the slot it started in
+            self.send_video_request_to_worker_queue(video_to_send, slot=response.slot)
             return
 
-        if not video_to_send:
-            for video in self.app.fastflix.conversion_list:
-                if video.status.ready:
-                    video_to_send = video
-                    # TODO ensure command int is in command list?
-                    break
+        if not self.queue_errored and not self.app.fastflix.conversion_paused:
+            self.fill_free_slots()
 
-        if not video_to_send:
-            self.conversion_complete(success=True)
-            self.end_encoding()
+        if self.app.fastflix.encoding_slots:
+            self.video_options.update_queue()
             return
 
-        self.app.fastflix.currently_encoding = True
-        if not same_video and self.app.fastflix.conversion_paused:
-            return self.end_encoding()
+        if self.queue_errored:
+            self.conversion_complete(success=False)
+        elif not self.app.fastflix.conversion_paused:
+            self.conversion_complete(success=True)
+        self.end_encoding()
 
-        self.send_video_request_to_worker_queue(video_to_send)
+    def resend_rejected(self):
+        if not self.app.fastflix.currently_encoding or self.queue_errored or self.app.fastflix.conversion_paused:
+            return
+        self.fill_free_slots()
+        if not self.app.fastflix.encoding_slots:
+            self.end_encoding()
 
     def end_encoding(self):
         self.app.fastflix.currently_encoding = False
@@ -2011,24 +2148,47 @@ class Main(QtWidgets.QWidget):
         self.video_options.update_queue()
         self.set_convert_button()
 
+    @property
+    def free_slots(self) -> list[int]:
+        return [
+            slot
+            for slot in range(max(self.app.fastflix.config.concurrent_encodes, 1))
+            if slot not in self.app.fastflix.encoding_slots
+        ]
+
+    def next_ready_video(self) -> Optional[Video]:
+        for video in self.app.fastflix.conversion_list:
+            if video.status.ready:
+                return video
+        return None
+
+    def fill_free_slots(self) -> bool:
+        sent = False
+        for slot in self.free_slots:
+            video = self.next_ready_video()
+            if not video:
+                break
+            self.send_video_request_to_worker_queue(video, slot=slot)
+            sent = True
+        return sent
+
     def send_next_video(self) -> bool:
-        if not self.app.fastflix.currently_encoding:
-            for video in self.app.fastflix.conversion_list:
-                if video.status.ready:
-                    video.status.running = True
-                    self.send_video_request_to_worker_queue(video)
-                    self.app.fastflix.currently_encoding = True
-                    prevent_sleep_mode()
-                    self.set_convert_button()
-                    return True
+        self.queue_errored = False
+        sent = self.fill_free_slots()
+        if self.app.fastflix.encoding_slots:
+            self.app.fastflix.currently_encoding = True
+            prevent_sleep_mode()
+            self.set_convert_button()
+            return sent
         self.app.fastflix.currently_encoding = False
         allow_sleep_mode()
         self.set_convert_button()
         return False
 
-    def send_video_request_to_worker_queue(self, video: Video):
+    def send_video_request_to_worker_queue(self, video: Video, slot: int = 0):
         command = video.video_settings.conversion_commands[video.status.current_command]
         self.app.fastflix.currently_encoding = True
+        self.app.fastflix.encoding_slots[slot] = video.uuid
         prevent_sleep_mode()
 
         # logger.info(f"Sending video {video.uuid} command {command.uuid} called from {inspect.stack()}")
@@ -2038,12 +2198,15 @@ class Main(QtWidgets.QWidget):
                 request="execute",
                 video_uuid=video.uuid,
                 command_uuid=command.uuid,
-                command=command.command,
+                command=command.run_args,
                 work_dir=str(video.work_path),
                 log_name=video.video_settings.video_title or video.video_settings.output_path.stem,
+                slot=slot,
+                chunks=command.chunks.dict() if command.chunks else None,
             )
         )
         video.status.running = True
+        save_queue(self.app.fastflix.conversion_list, self.app.fastflix.queue_path, self.app.fastflix.config)
         self.video_options.update_queue()
 
     def find_video(self, uuid) -> Video:
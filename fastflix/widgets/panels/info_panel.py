@@ -10,6 +10,7 @@ from typing import Union
 from box import Box, BoxList
 from PySide6 import QtCore, QtGui, QtWidgets
 
+from fastflix.flix import full_probe
 from fastflix.language import t
 from fastflix.models.encode import AttachmentTrack
 from fastflix.models.fastflix_app import FastFlixApp
@@ -33,9 +34,13 @@ class InfoPanel(QtWidgets.QTabWidget):
         if not self.app.fastflix.current_video:
             return
 
-        all_stream = []
-        for x in self.app.fastflix.current_video.streams.values():
-            all_stream.extend(x)
+        # Queued videos only keep the fields FastFlix uses, show everything FFprobe reported
+        if probed := full_probe(self.app):
+            all_stream = list(probed.streams)
+        else:
+            all_stream = []
+            for x in self.app.fastflix.current_video.streams.values():
+                all_stream.extend(x)
 
         for stream in sorted(all_stream, key=lambda z: z["index"]):
             widget = QtWidgets.QTextBrowser(self)
@@ -297,7 +297,8 @@ class EncodingQueue(FlixList):
             if video.status.complete:
                 remove_vids.append(video)
             else:
-                video.status.clear()
+                # Anything that was encoding when FastFlix stopped continues from the command it was on
+                video.status.clear(keep_progress=video.status.running)
 
         for video in remove_vids:
             new_queue.remove(video)
@@ -4,22 +4,23 @@ import datetime
 import logging
 import time
 from datetime import timedelta
+from queue import Empty
 from typing import Optional
 
 from PySide6 import QtCore, QtWidgets
 
+from fastflix.command_runner import ProgressEvent
 from fastflix.exceptions import FlixError
 from fastflix.language import t
 from fastflix.models.fastflix_app import FastFlixApp
 from fastflix.models.video import Video
-from fastflix.shared import time_to_number, timedelta_to_str
+from fastflix.shared import timedelta_to_str
 
 logger = logging.getLogger("fastflix")
 
 
 class StatusPanel(QtWidgets.QWidget):
-    speed = QtCore.Signal(str)
-    bitrate = QtCore.Signal(str)
+    progress_signal = QtCore.Signal(object)
     nvencc_signal = QtCore.Signal(str)
     tick_signal = QtCore.Signal()
 
@@ -38,6 +39,9 @@ class StatusPanel(QtWidgets.QWidget):
         self.hide_nal = QtWidgets.QCheckBox(t("Hide NAL unit messages"))
         self.hide_nal.setChecked(True)
 
+        self.slot_selector = QtWidgets.QComboBox()
+        self.slot_selector.setToolTip(t("Which concurrent encode to show the output of"))
+
         self.eta_label = QtWidgets.QLabel(f"{t('Time Left')}: N/A")
         self.eta_label.setToolTip(t("Estimated time left for current command"))
         self.eta_label.setStyleSheet("QLabel{margin-right:50px}")
@@ -53,6 +57,7 @@ class StatusPanel(QtWidgets.QWidget):
         h_box.addWidget(self.time_elapsed_label)
         h_box.addWidget(self.size_label)
         h_box.addStretch(1)
+        h_box.addWidget(self.slot_selector, alignment=QtCore.Qt.AlignRight)
         h_box.addWidget(self.hide_nal, alignment=QtCore.Qt.AlignRight)
 
         layout.addLayout(h_box, 0, 0)
@@ -61,17 +66,44 @@ class StatusPanel(QtWidgets.QWidget):
         layout.addWidget(self.inner_widget, 1, 0)
         self.setLayout(layout)
 
-        self.speed.connect(self.update_speed)
-        self.bitrate.connect(self.update_bitrate)
+        self.refresh_slots()
+        self.slot_selector.currentIndexChanged.connect(self.change_slot)
+
+        self.progress_updater = ProgressUpdater(self, self.app.fastflix.progress_queue, self.progress_signal)
+        self.progress_updater.start()
+
+        self.progress_signal.connect(self.update_progress)
         self.nvencc_signal.connect(self.update_nvencc)
         self.main.status_update_signal.connect(self.on_status_update)
         self.tick_signal.connect(self.update_time_elapsed)
 
     def cleanup(self):
         self.inner_widget.log_updater.terminate()
+        self.progress_updater.terminate()
         self.ticker_thread.stop_signal.emit()
         self.ticker_thread.terminate()
 
+    def refresh_slots(self):
+        self.slot_selector.blockSignals(True)
+        self.slot_selector.clear()
+        slot_count = max(self.app.fastflix.config.concurrent_encodes, 1)
+        self.slot_selector.addItems([f"{t('Slot')} {i + 1}" for i in range(slot_count)])
+        self.slot_selector.setCurrentIndex(min(self.inner_widget.slot, slot_count - 1))
+        self.slot_selector.setVisible(slot_count > 1)
+        self.slot_selector.blockSignals(False)
+
+    def change_slot(self, index):
+        if index < 0 or index == self.inner_widget.slot:
+            return
+        self.inner_widget.slot = index
+        self.inner_widget.setText("")
+        self.current_video = None
+        if video_uuid := self.app.fastflix.encoding_slots.get(index):
+            try:
+                self.current_video = self.main.find_video(video_uuid)
+            except FlixError:
+                pass
+
     def get_movie_length(self):
         if not self.current_video:
             return 0
@@ -79,50 +111,23 @@ class StatusPanel(QtWidgets.QWidget):
             self.current_video.video_settings.end_time or self.current_video.duration
         ) - self.current_video.video_settings.start_time
 
-    def update_speed(self, combined):
-        if not combined:
-            self.eta_label.setText(f"{t('Time Left')}: N/A")
+    def update_progress(self, event: ProgressEvent):
+        if event.slot != self.inner_widget.slot:
             return
-        try:
-            time_passed, speed = combined.split("|")
-            if speed == "N/A":
-                self.eta_label.setText(f"{t('Time Left')}: N/A")
-                return
-            time_passed = time_to_number(time_passed)
-            speed = float(speed)
-            if not speed:
-                return
-            assert speed > 0.0001, speed
-            length = self.get_movie_length()
-            if not length:
-                return
-            data = timedelta(seconds=(length - time_passed) // speed)
-        except Exception:
-            logger.exception("can't update size ETA")
-            self.eta_label.setText(f"{t('Time Left')}: N/A")
-        else:
-            if not speed:
-                self.eta_label.setText(f"{t('Time Left')}: N/A")
-            self.eta_label.setText(f"{t('Time Left')}: {timedelta_to_str(data)}")
+        length = self.get_movie_length()
+        time_passed = event.out_time_us / 1_000_000
 
-    def update_bitrate(self, bitrate):
-        if not bitrate or bitrate.strip() == "N/A":
-            self.size_label.setText(f"{t('Size Estimate')}: N/A")
-            return
-        try:
-            bitrate, _ = bitrate.split("k", 1)
-            bitrate = float(bitrate)
-            size_eta = (self.get_movie_length() * bitrate) / 8000
-        except AttributeError:
-            self.size_label.setText(f"{t('Size Estimate')}: N/A")
-        except Exception:
-            logger.exception(f"can't update bitrate: {bitrate} - length {self.get_movie_length()}")
-            self.size_label.setText(f"{t('Size Estimate')}: N/A")
+        if event.speed > 0.0001 and length:
+            data = timedelta(seconds=max(length - time_passed, 0) // event.speed)
+            self.eta_label.setText(f"{t('Time Left')}: {timedelta_to_str(data)}")
         else:
-            if not size_eta:
-                self.size_label.setText(f"{t('Size Estimate')}: N/A")
+            self.eta_label.setText(f"{t('Time Left')}: N/A")
 
+        if event.total_size and time_passed and length:
+            size_eta = (event.total_size / time_passed) * length / 1_000_000
             self.size_label.setText(f"{t('Size Estimate')}: {size_eta:.2f}MB")
+        else:
+            self.size_label.setText(f"{t('Size Estimate')}: N/A")
 
     def update_nvencc(self, raw_line):
         """
@@ -172,6 +177,7 @@ class Logs(QtWidgets.QTextBrowser):
         self.main = main
         self.status_panel = parent
         self.current_video = None
+        self.slot = 0
         self.log_signal.connect(self.update_text)
         self.clear_window.connect(self.blank)
         self.timer_signal.connect(self.timer_update)
@@ -184,26 +190,16 @@ class Logs(QtWidgets.QTextBrowser):
             return
         if self.status_panel.hide_nal.isChecked() and msg.lstrip().startswith("Last message repeated"):
             return
-        if msg.startswith("frame="):
-            try:
-                frame = {}
-                output = [i for i in (x.strip().split() for x in msg.split("="))]
-                output[-1].append([])  # no final value
-                for i in range(0, len(output) - 1):
-                    frame[output[i][-1]] = output[i + 1][:-1]
-                for k in frame:
-                    if len(frame[k]) == 1:
-                        frame[k] = frame[k][0]
-                self.status_panel.speed.emit(f"{frame.get('time', '')}|{frame.get('speed', '').rstrip('x')}")
-                self.status_panel.bitrate.emit(frame.get("bitrate", ""))
-            except Exception:
-                pass
-        elif "remain" in msg:
+        # FFmpeg progress arrives separately on the progress queue, only rigaya encoders need parsing here
+        if "remain" in msg:
             self.status_panel.nvencc_signal.emit(msg)
         self.append(msg)
 
     def blank(self, data):
         _, video_uuid, command_uuid = data.split(":")
+        self.status_panel.slot_selector.blockSignals(True)
+        self.status_panel.slot_selector.setCurrentIndex(self.slot)
+        self.status_panel.slot_selector.blockSignals(False)
         try:
             self.parent.current_video = self.main.find_video(video_uuid)
             self.current_command = self.main.find_command(self.parent.current_video, command_uuid)
@@ -268,13 +264,44 @@ class LogUpdater(QtCore.QThread):
 
     def run(self):
         while True:
-            msg = self.log_queue.get()
+            slot, msg = self.log_queue.get()
             if msg.startswith("CLEAR_WINDOW"):
-                self.parent.clear_window.emit(msg)
-                self.parent.timer_signal.emit("START")
+                # Follow the newest encode unless the slot being watched is still running
+                if slot == self.parent.slot or self.parent.slot not in self.parent.app.fastflix.encoding_slots:
+                    self.parent.slot = slot
+                    self.parent.clear_window.emit(msg)
+                    self.parent.timer_signal.emit("START")
+            elif slot != self.parent.slot:
+                continue
             elif msg == "STOP_TIMER":
                 self.parent.timer_signal.emit("STOP")
             elif msg == "UPDATE_QUEUE":
                 self.parent.status_panel.main.video_options.update_queue(currently_encoding=self.parent.converting)
             else:
                 self.parent.log_signal.emit(msg)
+
+
+class ProgressUpdater(QtCore.QThread):
+    def __init__(self, parent, progress_queue, progress_signal):
+        super().__init__(parent)
+        self.progress_queue = progress_queue
+        self.progress_signal = progress_signal
+
+    def __del__(self):
+        self.wait()
+
+    def run(self):
+        if self.progress_queue is None:
+            return
+        while True:
+            event = self.progress_queue.get()
+            # Only the newest state matters, skip anything that piled up while the GUI was busy
+            latest = {event.slot: event}
+            while not self.progress_queue.empty():
+                try:
+                    event = self.progress_queue.get_nowait()
+                except Empty:
+                    break
+                latest[event.slot] = event
+            for event in latest.values():
+                self.progress_signal.emit(event)
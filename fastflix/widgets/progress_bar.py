@@ -1,11 +1,13 @@
 # -*- coding: utf-8 -*-
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import Callable
 
 import reusables
 from PySide6 import QtCore, QtWidgets
 
+from fastflix.exceptions import FastFlixInternalException
 from fastflix.language import t
 
 logger = logging.getLogger("fastflix")
@@ -16,11 +18,13 @@ class Task:
     name: str
     command: Callable
     kwargs: dict = field(default_factory=dict)
+    depends_on: list[str] = field(default_factory=list)  # names of tasks that have to finish first
 
 
 class ProgressBar(QtWidgets.QFrame):
     progress_signal = QtCore.Signal(int)
     stop_signal = QtCore.Signal()
+    task_finished = QtCore.Signal(object)
 
     def __init__(
         self,
@@ -29,12 +33,17 @@ class ProgressBar(QtWidgets.QFrame):
         signal_task: bool = False,
         auto_run: bool = True,
         can_cancel: bool = False,
+        concurrent: bool = False,
+        max_workers: int = 4,
     ):
         super().__init__(None)
         self.app = app
 
         self.tasks = tasks
         self.signal_task = signal_task
+        self.concurrent = concurrent
+        self.max_workers = max_workers
+        self.can_cancel = can_cancel
         self.cancelled = False
 
         self.setObjectName("ProgressBar")
@@ -82,6 +91,9 @@ class ProgressBar(QtWidgets.QFrame):
             self.tasks[0].kwargs["stop_signal"] = self.stop_signal
             self.tasks[0].command(config=self.app.fastflix.config, app=self.app, **self.tasks[0].kwargs)
 
+        elif self.concurrent:
+            self.run_concurrent()
+
         else:
             for i, task in enumerate(self.tasks, start=1):
                 self.status.setText(task.name)
@@ -97,6 +109,63 @@ class ProgressBar(QtWidgets.QFrame):
                 if self.cancelled:
                     return
 
+    def run_concurrent(self):
+        """
+        Run every task whose dependencies are done on a thread pool. Each finished task is reported back with a
+        signal, and a local event loop keeps the GUI painted meanwhile without letting user input reach
+        anything that depends on tasks still running.
+        The first exception raised by a task is raised again here once the running tasks have stopped.
+        """
+        self.waiting = list(self.tasks)
+        self.finished = set()
+        self.running: dict[Future, Task] = {}
+        self.error = None
+        self.loop = QtCore.QEventLoop()
+        self.task_finished.connect(self.concurrent_task_done, QtCore.Qt.QueuedConnection)
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(self.tasks))) as self.executor:
+            self.start_ready_tasks()
+            if self.running:
+                self.loop.exec(
+                    QtCore.QEventLoop.AllEvents if self.can_cancel else QtCore.QEventLoop.ExcludeUserInputEvents
+                )
+        self.task_finished.disconnect(self.concurrent_task_done)
+
+        if self.app.fastflix.shutting_down:
+            self.close()
+        if self.error:
+            raise self.error
+
+    def start_ready_tasks(self):
+        if not self.error and not self.cancelled and not self.app.fastflix.shutting_down:
+            for task in [x for x in self.waiting if all(name in self.finished for name in x.depends_on)]:
+                self.waiting.remove(task)
+                future = self.executor.submit(self.run_task, task)
+                self.running[future] = task
+                # Called on the worker thread, the signal brings it back to the GUI thread
+                future.add_done_callback(self.task_finished.emit)
+            if self.waiting and not self.running:
+                self.error = FastFlixInternalException(f"Tasks have unmet dependencies: {self.waiting}")
+        if self.running:
+            self.status.setText(", ".join(task.name for task in self.running.values()))
+        else:
+            self.loop.quit()
+
+    def concurrent_task_done(self, future: Future):
+        task = self.running.pop(future)
+        if future.exception() and not self.error:
+            self.error = future.exception()
+        self.finished.add(task.name)
+        self.progress_bar.setValue(int(len(self.finished) / len(self.tasks) * 100))
+        self.start_ready_tasks()
+
+    def run_task(self, task: Task):
+        try:
+            task.command(config=self.app.fastflix.config, app=self.app, **task.kwargs)
+        except Exception:
+            logger.exception(f"Could not run task {task.name} with config {self.app.fastflix.config}")
+            raise
+
     def update_progress(self, value):
         self.progress_bar.setValue(value)
         self.app.processEvents()
@@ -30,6 +30,7 @@ known_language_list = [
     "Polish",
 ]
 possible_detect_points = ["1", "2", "4", "6", "8", "10", "15", "20", "25", "50", "100"]
+possible_concurrent_encodes = ["1", "2", "3", "4", "6", "8", "12", "16"]
 
 
 class Settings(QtWidgets.QWidget):
@@ -128,6 +129,16 @@ class Settings(QtWidgets.QWidget):
         except ValueError:
             self.crop_detect_points_widget.setCurrentIndex(5)
 
+        self.concurrent_encodes_widget = QtWidgets.QComboBox()
+        self.concurrent_encodes_widget.addItems(possible_concurrent_encodes)
+        self.concurrent_encodes_widget.setToolTip(t("Number of queue items to encode at the same time"))
+        try:
+            self.concurrent_encodes_widget.setCurrentIndex(
+                possible_concurrent_encodes.index(str(self.app.fastflix.config.concurrent_encodes))
+            )
+        except ValueError:
+            self.concurrent_encodes_widget.setCurrentIndex(0)
+
         nvencc_label = QtWidgets.QLabel(
             link("https://github.com/rigaya/NVEnc/releases", "NVEncC", app.fastflix.config.theme)
         )
@@ -231,6 +242,8 @@ class Settings(QtWidgets.QWidget):
         layout.addWidget(self.theme, 10, 1)
         layout.addWidget(QtWidgets.QLabel(t("Crop Detect Points")), 11, 0, 1, 1)
         layout.addWidget(self.crop_detect_points_widget, 11, 1, 1, 1)
+        layout.addWidget(QtWidgets.QLabel(t("Concurrent Encodes")), 20, 0, 1, 1)
+        layout.addWidget(self.concurrent_encodes_widget, 20, 1, 1, 1)
 
         button_layout = QtWidgets.QHBoxLayout()
         button_layout.addStretch()
@@ -275,6 +288,7 @@ class Settings(QtWidgets.QWidget):
         self.app.fastflix.config.logging_level = log_level
         logger.setLevel(log_level)
         self.app.fastflix.config.crop_detect_points = int(self.crop_detect_points_widget.currentText())
+        self.app.fastflix.config.concurrent_encodes = int(self.concurrent_encodes_widget.currentText())
 
         new_nvencc = Path(self.nvencc_path.text()) if self.nvencc_path.text().strip() else None
         if str(self.app.fastflix.config.nvencc) != str(new_nvencc):
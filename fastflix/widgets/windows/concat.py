@@ -1,5 +1,8 @@
 # -*- coding: utf-8 -*-
+from bisect import bisect
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import Optional
 import os
 import logging
 import secrets
@@ -10,7 +13,6 @@ from PySide6.QtWidgets import QAbstractItemView
 from fastflix.language import t
 from fastflix.flix import probe
 from fastflix.shared import yes_no_message, error_message
-from fastflix.widgets.progress_bar import ProgressBar, Task
 
 logger = logging.getLogger("fastflix")
 
@@ -18,6 +20,53 @@ logger = logging.getLogger("fastflix")
 BAD_FILES = ("Thumbs.db",)
 
 
+def video_details(app, file: Path) -> Optional[tuple[str, str]]:
+    """Resolution and codec of the last video stream, or None if it is not a video or image file"""
+    try:
+        details = probe(app, file)
+    except Exception:
+        return None
+    data = None
+    for stream in details.get("streams", []):
+        if stream.codec_type == "video":
+            data = (f"{stream.width}x{stream.height}", stream.codec_name)
+    return data
+
+
+class FolderProbe(QtCore.QThread):
+    """Probe the files of a folder on a small thread pool, sending each result back as soon as it is ready"""
+
+    found = QtCore.Signal(int, str, str, str)
+    skipped = QtCore.Signal(str)
+    progress = QtCore.Signal(int, int)
+
+    def __init__(self, parent, app, files: list[Path], workers: int = min(8, os.cpu_count() or 4)):
+        super().__init__(parent)
+        self.app = app
+        self.files = files
+        self.workers = workers
+        self.cancelled = False
+
+    def run(self):
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(video_details, self.app, file): i for i, file in enumerate(self.files)}
+            for done, future in enumerate(as_completed(futures), start=1):
+                if self.cancelled:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    return
+                position = futures[future]
+                file = self.files[position]
+                if data := future.result():
+                    self.found.emit(position, file.name, *data)
+                else:
+                    logger.warning(f"Skipping {file.name} as it is not a video/image file")
+                    self.skipped.emit(file.name)
+                self.progress.emit(done, len(self.files))
+
+    def cancel(self):
+        self.cancelled = True
+
+
 class MyModel(QtGui.QStandardItemModel):
     def dropMimeData(self, data, action, row, col, parent):
         """
@@ -62,10 +111,13 @@ class ConcatTable(QtWidgets.QTableView):
         for item in items:
             self.add_item(*item)
 
-    def add_item(self, name, resolution, codec):
+    def add_item(self, name, resolution, codec, row=None, position=None):
         filename = QtGui.QStandardItem(name)
         filename.setEditable(False)
         filename.setDropEnabled(False)
+        if position is not None:
+            # Where the file is in the folder, moves along with the row when it is dragged or removed
+            filename.setData(position, QtCore.Qt.UserRole)
 
         res = QtGui.QStandardItem(resolution)
         res.setEditable(False)
@@ -80,7 +132,10 @@ class ConcatTable(QtWidgets.QTableView):
         remove.setDropEnabled(False)
         remove.option_name = name
 
-        self.model.appendRow([filename, res, form, remove])
+        if row is None:
+            self.model.appendRow([filename, res, form, remove])
+        else:
+            self.model.insertRow(row, [filename, res, form, remove])
 
         x_button = CloseButton(self, "X", name)
         x_button.clicked.connect(x_button.close_item)
@@ -91,6 +146,12 @@ class ConcatTable(QtWidgets.QTableView):
         for i in range(self.model.rowCount()):
             yield self.model.index(i, 0).data()
 
+    def row_for_position(self, position: int) -> int:
+        """Row to insert a file at so the rows stay in folder order"""
+        return bisect(
+            range(self.model.rowCount()), position, key=lambda i: self.model.index(i, 0).data(QtCore.Qt.UserRole)
+        )
+
     def remove_item(self, name):
         for i, text in enumerate(self.get_items()):
             if text == name:
@@ -146,6 +207,13 @@ class ConcatWindow(QtWidgets.QWidget):
         save_buttom = QtWidgets.QPushButton(t("Load"))
         save_buttom.clicked.connect(self.save)
 
+        self.prober: Optional[FolderProbe] = None
+        self.skipped = []
+        self.status_label = QtWidgets.QLabel()
+        self.cancel_button = QtWidgets.QPushButton(t("Cancel"))
+        self.cancel_button.clicked.connect(self.cancel_probe)
+        self.cancel_button.hide()
+
         top_bar = QtWidgets.QHBoxLayout()
         top_bar.addWidget(folder_button)
         top_bar.addStretch(1)
@@ -156,14 +224,19 @@ class ConcatWindow(QtWidgets.QWidget):
         layout.addLayout(top_bar)
 
         layout.addWidget(self.concat_area)
-        layout.addWidget(QtWidgets.QLabel(t("Drag and Drop to reorder - All items need to be same dimensions")))
+        bottom_bar = QtWidgets.QHBoxLayout()
+        bottom_bar.addWidget(QtWidgets.QLabel(t("Drag and Drop to reorder - All items need to be same dimensions")))
+        bottom_bar.addStretch(1)
+        bottom_bar.addWidget(self.status_label)
+        bottom_bar.addWidget(self.cancel_button)
+        layout.addLayout(bottom_bar)
         self.setLayout(layout)
 
     def set_folder_name(self, name):
         self.base_folder_label.setText(f'{t("Base Folder")}: {name}')
 
     def select_folder(self):
-        if self.concat_area.table.model.rowCount() > 0:
+        if self.concat_area.table.model.rowCount() > 0 or self.prober:
             if not yes_no_message(
                 f"{t('There are already items in this list')},\n"
                 f"{t('if you open a new directory, they will all be removed.')}\n\n"
@@ -174,58 +247,75 @@ class ConcatWindow(QtWidgets.QWidget):
         folder_name = QtWidgets.QFileDialog.getExistingDirectory(self, dir=self.folder_name)
         if not folder_name:
             return
+        self.stop_probe()
         self.folder_name = folder_name
         self.set_folder_name(folder_name)
+        self.concat_area.table.update_items([])
+
+        file_list = [
+            x
+            for x in sorted(Path(folder_name).glob("*"), key=lambda x: x.name)
+            if x.is_file() and x.name not in BAD_FILES
+        ]
+        if not file_list:
+            return
 
-        def check_to_add(file, list_of_items, bad_items, **_):
-            try:
-                data = None
-                details = probe(self.app, file)
-                for stream in details.streams:
-                    if stream.codec_type == "video":
-                        data = (file.name, f"{stream.width}x{stream.height}", stream.codec_name)
-                if not data:
-                    raise Exception()
-            except Exception:
-                logger.warning(f"Skipping {file.name} as it is not a video/image file")
-                bad_items.append(file.name)
-            else:
-                list_of_items.append(data)
-
-        items = []
-        skipped = []
-        tasks = []
-        file_list = sorted(Path(folder_name).glob("*"), key=lambda x: x.name)
-        for file in file_list:
-            if file.is_file():
-                if file.name in BAD_FILES:
-                    continue
-                tasks.append(
-                    Task(
-                        f"Evaluating {file.name}",
-                        command=check_to_add,
-                        kwargs={"file": file, "list_of_items": items, "bad_items": skipped},
-                    )
-                )
-            if len(tasks) > 100:
-                error_message(t("There are more than 100 files, skipping pre-processing."))
-                return self.save((x.name for x in file_list if x.name not in BAD_FILES))
-
-        ProgressBar(self.app, tasks, can_cancel=True, auto_run=True)
-
-        self.concat_area.table.update_items(items)
-        if skipped:
+        # Results come back in any order, keep the rows sorted by where the file is in the folder
+        self.skipped = []
+        self.prober = FolderProbe(self, self.app, file_list)
+        self.prober.found.connect(self.probe_found)
+        self.prober.skipped.connect(self.skipped.append)
+        self.prober.progress.connect(self.probe_progress)
+        self.prober.finished.connect(self.probe_finished)
+        self.status_label.setText(f"{t('Evaluating')} 0 / {len(file_list)}")
+        self.cancel_button.show()
+        self.prober.start()
+
+    def probe_found(self, position, name, resolution, codec):
+        table = self.concat_area.table
+        table.add_item(name, resolution, codec, row=table.row_for_position(position), position=position)
+
+    def probe_progress(self, done, total):
+        self.status_label.setText(f"{t('Evaluating')} {done} / {total}")
+
+    def probe_finished(self):
+        cancelled = self.prober.cancelled if self.prober else True
+        self.prober = None
+        self.cancel_button.hide()
+        self.status_label.setText(t("Cancelled") if cancelled else "")
+        if self.skipped and not cancelled:
             error_message(
                 "".join(
                     [
                         f"{t('The following items were excluded as they could not be identified as image or video files')}:\n",
-                        "\n".join(skipped[:20]),
-                        f"\n\n+ {len(skipped[20:])} {t('more')}..." if len(skipped) > 20 else "",
+                        "\n".join(self.skipped[:20]),
+                        f"\n\n+ {len(self.skipped[20:])} {t('more')}..." if len(self.skipped) > 20 else "",
                     ]
                 )
             )
 
+    def stop_probe(self):
+        if not self.prober:
+            return
+        prober, self.prober = self.prober, None
+        prober.cancel()
+        for signal in (prober.found, prober.skipped, prober.progress, prober.finished):
+            signal.disconnect()
+        # Probes already running are left to finish in the background instead of blocking the window
+        prober.finished.connect(prober.deleteLater)
+        self.cancel_button.hide()
+        self.status_label.setText("")
+
+    def cancel_probe(self):
+        if self.prober:
+            self.prober.cancel()
+
+    def closeEvent(self, event):
+        self.stop_probe()
+        super().closeEvent(event)
+
     def save(self, file_list=None):
+        self.stop_probe()
         concat_file = self.app.fastflix.config.work_path / f"concat_{secrets.token_hex(4)}.txt"
         with open(concat_file, "w") as f:
             f.write(
@@ -1,9 +1,6 @@
 # -*- coding: utf-8 -*-
 import logging
-from pathlib import Path
 from subprocess import run, PIPE
-from typing import Optional
-import secrets
 
 from PySide6 import QtWidgets, QtCore, QtGui
 
@@ -12,6 +9,7 @@ from fastflix.flix import (
 )
 from fastflix.encoders.common import helpers
 from fastflix.resources import get_icon
+from fastflix.thumbnails import frame_to_image
 from fastflix.language import t
 
 __all__ = ["LargePreview"]
@@ -44,7 +42,6 @@ class LargePreview(QtWidgets.QWidget):
         self.setMaximumHeight(size.height())
         self.setMinimumSize(400, 400)
         self.current_image = QtGui.QPixmap(get_icon("onyx-cover", self.main.app.fastflix.config.theme))
-        self.last_path: Optional[Path] = None
         self.last_command = "NOPE"
         self.setWindowTitle(t("Preview - Press Q to Exit"))
 
@@ -65,15 +62,13 @@ class LargePreview(QtWidgets.QWidget):
         filters = helpers.generate_filters(
             enable_opencl=self.main.app.fastflix.opencl_support,
             start_filters="select=eq(pict_type\\,I)" if self.main.widgets.thumb_key.isChecked() else None,
+            raw_filters=True,
             **settings,
         )
 
-        output = self.main.app.fastflix.config.work_path / f"large_preview_{secrets.token_hex(16)}.tiff"
-
         thumb_command = generate_thumbnail_command(
             config=self.main.app.fastflix.config,
             source=self.main.source_material,
-            output=output,
             filters=filters,
             start_time=self.main.preview_place,
             enable_opencl=self.main.app.fastflix.opencl_support,
@@ -82,20 +77,18 @@ class LargePreview(QtWidgets.QWidget):
         if thumb_command == self.last_command:
             return
 
-        logger.info(f"Generating large thumbnail: {thumb_command}")
+        logger.info(f"Generating large thumbnail: {' '.join(thumb_command)}")
 
-        thumb_run = run(thumb_command, shell=True, stderr=PIPE, stdout=PIPE)
+        thumb_run = run(thumb_command, stdin=PIPE, stderr=PIPE, stdout=PIPE)
         if thumb_run.returncode > 0:
-            logger.warning(f"Could not generate large thumbnail: {thumb_run.stdout} |----| {thumb_run.stderr}")
+            logger.warning(f"Could not generate large thumbnail: {thumb_run.stderr}")
             return
 
-        self.current_image = QtGui.QPixmap(str(output))
-        if self.last_path:
-            try:
-                self.last_path.unlink(missing_ok=True)
-            except OSError:
-                logger.warning(f"Could not delete last large preview {self.last_path}")
-        self.last_path = output
+        try:
+            self.current_image = QtGui.QPixmap.fromImage(frame_to_image(thumb_run.stdout))
+        except ValueError:
+            logger.warning(f"Could not read large thumbnail: {thumb_run.stderr}")
+            return
         self.label.setPixmap(self.current_image)
         self.resize(self.current_image.width(), self.current_image.height())
 
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+Recorded FFprobe output loaded into FastFlix / Video models the same way batch encoding does,
+without FFmpeg or any other tool installed.
+
+Regenerate the golden snapshots after an intended command change with:
+
+    FF_UPDATE_SNAPSHOTS=1 pytest tests/benchmarks
+"""
+import json
+import os
+import secrets
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from box import Box
+
+from fastflix import flix
+from fastflix.batch import audio_tracks, encoder_for_profile, subtitle_tracks
+from fastflix.encoders.common.plugin import encoder_plugins
+from fastflix.models.config import Config
+from fastflix.models.encode import setting_types
+from fastflix.models.fastflix import FastFlix
+from fastflix.models.video import Video
+
+fixtures = Path(__file__).parent / "fixtures"
+snapshots = Path(__file__).parent / "snapshots"
+
+# Name of the test source: recorded FFprobe output it uses
+sources = {
+    "sdr": "sdr",
+    "hdr10": "hdr10",
+    "hdr10plus": "hdr10plus",
+    "many_tracks": "many_tracks",
+    "concat": "sdr",
+}
+
+encoders = sorted(encoder_plugins())
+
+
+def encoder_id(encoder: str) -> str:
+    return encoder_plugins()[encoder].__name__.split(".")[2]
+
+
+def load_fastflix(source: str, encoder: str, concat_dir: Path) -> FastFlix:
+    config = Config(
+        ffmpeg=Path("ffmpeg"),
+        ffprobe=Path("ffprobe"),
+        hdr10plus_parser=None,
+        nvencc=Path("NVEncC64"),
+        qsvencc=Path("QSVEncC64"),
+        vceencc=Path("VCEEncC64"),
+        work_path=Path("/work"),
+    )
+    fastflix = FastFlix(config=config, data_path=concat_dir)
+    plugin = encoder_plugins()[encoder]
+    probed = Box(json.loads((fixtures / f"{sources[source]}.json").read_text()))
+
+    path = Path("/videos", f"{source}.mkv")
+    if source == "concat":
+        path = concat_dir / "concat.txt"
+        parts = [concat_dir / f"part_{i:02}.mkv" for i in range(1, 4)]
+        for part in parts:
+            part.touch()
+        path.write_text("".join(f"file '{part}'\n" for part in parts))
+
+    fastflix.current_video = Video(source=path, work_path=Path("/work/temp"))
+    app = SimpleNamespace(fastflix=fastflix)
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(flix, "probe", lambda *_: probed)
+        patch.setattr(flix, "probe_frame_hdr10", lambda *_: None)
+        flix.parse(app)
+        flix.parse_hdr_details(app)
+
+    video = fastflix.current_video
+    settings = video.video_settings
+    settings.output_path = Path("/output", f"{source}-fastflix.{plugin.video_extension}")
+    settings.video_encoder_settings = setting_types[encoder_for_profile(encoder)]()
+    if source == "hdr10plus":
+        video.hdr10_plus = [0]
+        if "hdr10plus_metadata" in settings.video_encoder_settings.__fields__:
+            settings.video_encoder_settings.hdr10plus_metadata = "/work/temp/hdr10plus_metadata.json"
+    if plugin.enable_audio:
+        settings.audio_tracks = audio_tracks(fastflix)
+        if source == "many_tracks":
+            for track in settings.audio_tracks[::3]:
+                track.conversion_codec, track.conversion_bitrate, track.downmix = "libopus", "256k", "stereo"
+    if plugin.enable_subtitles:
+        settings.subtitle_tracks = subtitle_tracks(fastflix, first_outdex=len(settings.audio_tracks) + 1)
+    return fastflix
+
+
+@pytest.fixture(autouse=True)
+def fixed_tokens(monkeypatch):
+    """Pass log and chunk names are random, keep them the same for the snapshots"""
+    monkeypatch.setattr(secrets, "token_hex", lambda size=16: "0" * size * 2)
+
+
+@pytest.fixture
+def load(tmp_path):
+    return lambda source, encoder: load_fastflix(source, encoder, tmp_path)
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    def compare(name: str, text: str):
+        text = text.replace(str(tmp_path), "<tmp>")
+        if os.sep == "\\":
+            text = text.replace("\\", "/")
+        path = snapshots / f"{name}.txt"
+        if os.getenv("FF_UPDATE_SNAPSHOTS"):
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text, encoding="utf-8")
+        assert path.exists(), f"No snapshot {path}, create it with FF_UPDATE_SNAPSHOTS=1"
+        assert text == path.read_text(encoding="utf-8")
+
+    return compare
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from fastflix.encoders.common import encc_helpers
+from fastflix.encoders.common.audio import build_audio
+from fastflix.encoders.common.helpers import generate_filters
+from fastflix.encoders.common.plugin import encoder_plugins
+from fastflix.encoders.common.subtitles import build_subtitle
+
+from .conftest import encoder_id, encoders, sources
+
+
+def timed(benchmark, function, *args, **kwargs):
+    # Fixed rounds keep the whole suite fast, the builders only take a few milliseconds
+    return benchmark.pedantic(function, args=args, kwargs=kwargs, rounds=20, iterations=5, warmup_rounds=1)
+
+
+def commands_text(commands) -> str:
+    return "".join(f"# {command.name}\n{command.command}\n" for command in commands)
+
+
+@pytest.mark.parametrize("source", sources)
+@pytest.mark.parametrize("encoder", encoders, ids=encoder_id)
+def test_build_snapshot(load, snapshot, encoder, source):
+    fastflix = load(source, encoder)
+    commands = encoder_plugins()[encoder].build(fastflix)
+    assert commands
+    snapshot(f"{source}/{encoder_id(encoder)}", commands_text(commands))
+
+
+@pytest.mark.parametrize("encoder", encoders, ids=encoder_id)
+def test_build_speed(benchmark, load, encoder):
+    fastflix = load("many_tracks", encoder)
+    assert timed(benchmark, encoder_plugins()[encoder].build, fastflix)
+
+
+def test_generate_filters_speed(benchmark, load):
+    settings = load("hdr10", "HEVC (x265)").current_video.video_settings
+    settings.crop = {"width": 3840, "height": 1600, "top": 280, "left": 0}
+    settings.scale = "1920:-8"
+    settings.remove_hdr = True
+    settings.deinterlace = True
+    assert timed(benchmark, generate_filters, **settings.dict())
+
+
+def test_build_audio_speed(benchmark, load):
+    settings = load("many_tracks", "HEVC (x265)").current_video.video_settings
+    assert timed(benchmark, build_audio, settings.audio_tracks)
+
+
+def test_build_subtitle_speed(benchmark, load):
+    settings = load("many_tracks", "HEVC (x265)").current_video.video_settings
+    assert timed(benchmark, build_subtitle, settings.subtitle_tracks)
+
+
+def test_encc_build_audio_speed(benchmark, load):
+    video = load("many_tracks", "HEVC (NVEncC)").current_video
+    assert timed(benchmark, encc_helpers.build_audio, video.video_settings.audio_tracks, video.streams.audio)
+
+
+def test_encc_build_subtitle_speed(benchmark, load):
+    video = load("many_tracks", "HEVC (NVEncC)").current_video
+    subtitles = video.video_settings.subtitle_tracks
+    assert timed(benchmark, encc_helpers.build_subtitle, subtitles, video.streams.subtitle, video.height)
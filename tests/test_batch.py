@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from box import Box
+
+from fastflix import batch, flix
+from fastflix.batch import encoder_for_profile
+from fastflix.encoders.common.plugin import encoder_plugins
+from fastflix.models.config import Config
+from fastflix.models.encode import setting_types
+from fastflix.models.fastflix import FastFlix
+
+probe_fixture = Path(__file__).parent / "benchmarks" / "fixtures" / "sdr.json"
+
+
+def test_every_profile_encoder_has_a_builder():
+    for encoder, settings in setting_types.items():
+        name = settings.__fields__["name"].default
+        assert encoder_for_profile(name) == encoder
+        assert callable(encoder_plugins()[name].build)
+        assert Path(encoder_plugins()[name].icon).exists()
+
+
+def test_batch_does_not_load_qt():
+    # Run in a fresh interpreter, other tests in the same session import the GUI
+    check = (
+        "import sys, fastflix.batch as batch\n"
+        "for plugin in batch.encoder_plugins().values(): plugin.build\n"
+        "assert not [x for x in sys.modules if x.startswith(('PySide6', 'fastflix.widgets'))]\n"
+        "assert not [x for x in sys.modules if x.endswith('.settings_panel')]\n"
+    )
+    subprocess.run([sys.executable, "-c", check], check=True)
+
+
+class FakeRunner:
+    error_detected = False
+
+    def is_alive(self):
+        return False
+
+
+class FakeSlot:
+    """Stands in for the conversion worker's EncodeSlot, any command for a source named broken fails"""
+
+    started = []
+
+    def __init__(self, slot, log_queue, progress_queue=None):
+        self.slot = slot
+        self.runner = FakeRunner()
+        self.busy = False
+
+    def start_command(self, command, work_dir, log_name, priority, chunks=None):
+        self.started.append((log_name, command))
+        self.runner.error_detected = log_name.startswith("broken")
+
+    def finish(self):
+        pass
+
+
+def test_batch_encodes_queue(tmp_path, monkeypatch):
+    probed = Box(json.loads(probe_fixture.read_text()))
+    monkeypatch.setattr(flix, "probe", lambda *_: probed)
+    monkeypatch.setattr(flix, "probe_frame_hdr10", lambda *_: None)
+    monkeypatch.setattr(batch, "analyze_source", lambda *_, **__: None)
+    monkeypatch.setattr(batch, "detect_hdr10_plus", lambda *_, **__: None)
+    monkeypatch.setattr(batch, "EncodeSlot", FakeSlot)
+    monkeypatch.setattr(batch, "log_path", tmp_path / "logs")
+    config = Config(work_path=tmp_path / "work", ffmpeg=Path("ffmpeg"), ffprobe=Path("ffprobe"))
+    fastflix = FastFlix(config=config, data_path=tmp_path)
+    encoder = encoder_for_profile(config.profile.encoder)
+
+    videos = [
+        batch.prepare_video(fastflix, encoder, tmp_path / name, tmp_path / "out") for name in ("good.mkv", "broken.mkv")
+    ]
+    assert batch.run_queue(videos, jobs=2, priority="Normal", verbose=False) == 1
+
+    good, broken = videos
+    assert [command[-1] for _, command in FakeSlot.started] == [
+        str(good.video_settings.output_path),
+        str(broken.video_settings.output_path),
+    ]
+    assert FakeSlot.started[0][1][:2] == ["ffmpeg", "-y"]
+    # Work files are only kept for the failed encode
+    assert not good.work_path.exists() and broken.work_path.exists()
+
+    FakeSlot.started.clear()
+    assert batch.run_queue(videos[:1], jobs=1, priority="Normal", verbose=False) == 0
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+import sys
+from pathlib import Path
+from queue import Queue
+
+import numpy as np
+
+from fastflix.command_runner import ChunkedRunner
+from fastflix.encoders.common import chunked
+from fastflix.encoders.common.helpers import Command
+from fastflix.models.config import Config
+from fastflix.models.encode import x265Settings
+from fastflix.models.fastflix import FastFlix
+from fastflix.models.video import Video, VideoSettings
+from fastflix.packet_index import PacketIndex
+
+
+def make_fastflix(tmp_path: Path, chunks: str = "4") -> FastFlix:
+    fastflix = FastFlix(config=Config(work_path=tmp_path), data_path=tmp_path)
+    fastflix.current_video = Video(
+        source=tmp_path / "movie.mkv",
+        duration=400,
+        work_path=tmp_path / "work",
+        video_settings=VideoSettings(
+            output_path=tmp_path / "movie-fastflix.mkv", video_encoder_settings=x265Settings(chunks=chunks)
+        ),
+    )
+    return fastflix
+
+
+def keyframes_every(seconds: float, duration: float) -> PacketIndex:
+    pts = np.arange(0, duration, 0.5)
+    return PacketIndex(pts, np.full(len(pts), 1000, dtype=np.uint32), pts % seconds == 0)
+
+
+def test_chunk_boundaries(tmp_path, monkeypatch):
+    monkeypatch.setattr(chunked, "get_packet_index", lambda *_: keyframes_every(7, 400))
+    fastflix = make_fastflix(tmp_path)
+
+    # Cut at the first keyframe after each quarter
+    assert chunked.chunk_boundaries(fastflix) == [(0, 105.0), (105.0, 203.0), (203.0, 301.0), (301.0, 400)]
+
+    fastflix.current_video.video_settings.end_time = 50
+    assert chunked.chunk_boundaries(fastflix) == []
+    fastflix.current_video.video_settings.end_time = 0
+    fastflix.current_video.concat = True
+    assert chunked.chunk_boundaries(fastflix) == []
+    assert chunked.chunk_boundaries(make_fastflix(tmp_path, chunks="1")) == []
+
+
+def test_build_chunked(tmp_path, monkeypatch):
+    monkeypatch.setattr(chunked, "get_packet_index", lambda *_: keyframes_every(7, 400))
+    fastflix = make_fastflix(tmp_path, chunks="2")
+    fastflix.current_video.video_settings.video_encoder_settings.chunk_workers = "2"
+    built = []
+
+    def build(ff: FastFlix):
+        settings = ff.current_video.video_settings
+        built.append((settings.start_time, settings.end_time, settings.video_encoder_settings.chunks))
+        return [Command(command=f'ffmpeg -ss {settings.start_time} -i movie.mkv "{settings.output_path}"')]
+
+    commands = chunked.build_chunked(fastflix, build, chunked.chunk_boundaries(fastflix))
+
+    assert built == [(0, 203.0, "1"), (203.0, 400, "1")]
+    assert fastflix.current_video.video_settings.start_time == 0
+    plan = commands[0].chunks
+    assert plan.workers == 2
+    assert [Path(x).name for x in plan.outputs] == ["chunk_0000.mkv", "chunk_0001.mkv"]
+    assert plan.args[1][0][-1] == plan.outputs[1]
+    assert commands[1].args[-1] == str(fastflix.current_video.video_settings.output_path)
+
+
+def write_output(marker: Path, output: Path) -> list[str]:
+    code = f"open({str(marker)!r}, 'a').write('ran\\n'); open({str(output)!r}, 'w').write('video')"
+    return [sys.executable, "-c", code]
+
+
+def test_chunked_runner_resumes(tmp_path):
+    chunk_dir = tmp_path / "o'brien"
+    chunk_dir.mkdir()
+    outputs = [chunk_dir / f"chunk_{i:04}.mkv" for i in range(3)]
+    markers = [tmp_path / f"ran_{i}.txt" for i in range(3)]
+    checkpoint_file = chunk_dir / "completed_chunks.txt"
+
+    # Chunk 0 finished in an earlier run, chunk 1 was recorded but its output is gone
+    outputs[0].write_text("video")
+    checkpoint_file.write_text("0\n1\n")
+    plan = {
+        "commands": [["chunk"]] * 3,
+        "args": [[write_output(marker, output)] for marker, output in zip(markers, outputs)],
+        "outputs": [str(x) for x in outputs],
+        "concat_file": str(chunk_dir / "chunks.txt"),
+        "checkpoint_file": str(checkpoint_file),
+        "workers": 2,
+    }
+    runner = ChunkedRunner(Queue())
+    runner.start_exec(plan, work_dir=str(tmp_path))
+    runner.manager.join(timeout=30)
+
+    assert runner.success_detected and not runner.error_detected
+    assert [x.exists() for x in markers] == [False, True, True]
+    assert sorted(checkpoint_file.read_text().split()) == ["0", "1", "1", "2"]
+    concat_lines = (chunk_dir / "chunks.txt").read_text().splitlines()
+    assert concat_lines[0] == f"file '{tmp_path.as_posix()}/o'\\''brien/chunk_0000.mkv'"
+    assert len(concat_lines) == 3
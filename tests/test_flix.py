@@ -1,9 +1,24 @@
 # -*- coding: utf-8 -*-
 from pathlib import Path
+from subprocess import CompletedProcess
 
+import numpy as np
 from box import Box
 
-from fastflix.flix import parse, parse_hdr_details
+from fastflix import flix
+from fastflix.flix import (
+    compact_stream,
+    crop_from_frames,
+    crop_to_source,
+    get_auto_crop,
+    interlace_decision,
+    load_ffmpeg_capabilities,
+    parse,
+    parse_hdr_details,
+    parse_source_analysis,
+    save_ffmpeg_capabilities,
+)
+from fastflix.models.fastflix import FastFlix
 from fastflix.models.config import Config
 from fastflix.models.video import Video
 
@@ -23,3 +38,111 @@ fake_app.fastflix.config = Config()
 #     assert fake_app.fastflix.current_video.streams.audio[0].codec_name == "aac"
 #     parse_hdr_details(fake_app)
 #     assert len(fake_app.fastflix.current_video.hdr10_streams) == 1
+
+
+def test_parse_source_analysis():
+    stderr = "\n".join(
+        [
+            "[Parsed_showinfo_2 @ 0x1] n:   0 pts:      0 pts_time:0       i:P iskey:1 type:I",
+            "[Parsed_showinfo_2 @ 0x1]   side data - mastering display: has_primaries:1 has_luminance:1 "
+            "r(x,y):(0.6800, 0.3200) g(x,y):(0.2650, 0.6900) b(x,y):(0.1500, 0.0600) wp(x,y):(0.3127, 0.3290) "
+            "min_luminance=0.000100, max_luminance=1000.000000",
+            "[Parsed_showinfo_2 @ 0x1]   side data - Content Light Level information: MaxCLL=1000, MaxFALL=400",
+            "[Parsed_idet_0 @ 0x4] Single frame detection: TFF:     2 BFF:     0 Progressive:    40 Undetermined:     8",
+            "[Parsed_idet_3 @ 0x5] Single frame detection: TFF:     1 BFF:     0 Progressive:    45 Undetermined:     4",
+        ]
+    )
+    results = parse_source_analysis(stderr)
+    assert results["interlace"] == {"tff": 3, "bff": 0, "progressive": 85}
+    assert results["master_display"] == {
+        "red": "(34000,16000)",
+        "green": "(13250,34500)",
+        "blue": "(7500,3000)",
+        "white": "(15635,16450)",
+        "luminance": "(10000000,1)",
+    }
+    assert results["cll"] == "1000,400"
+
+
+def test_ffmpeg_capabilities_cache(tmp_path):
+    ffmpeg, ffprobe = tmp_path / "ffmpeg", tmp_path / "ffprobe"
+    ffmpeg.write_text("ffmpeg")
+    ffprobe.write_text("ffprobe")
+    config = Box(ffmpeg=ffmpeg, ffprobe=ffprobe)
+    app = Box(fastflix=FastFlix(data_path=tmp_path, ffmpeg_version="6.0", ffmpeg_config=["libx265"]))
+    assert not load_ffmpeg_capabilities(app, config)
+    save_ffmpeg_capabilities(app, config)
+
+    fresh = Box(fastflix=FastFlix(data_path=tmp_path))
+    assert load_ffmpeg_capabilities(fresh, config)
+    assert fresh.fastflix.ffmpeg_version == "6.0"
+    assert fresh.fastflix.ffmpeg_config == ["libx265"]
+
+    # A new FFmpeg build means checking it again
+    ffmpeg.write_text("ffmpeg 6.1")
+    assert not load_ffmpeg_capabilities(Box(fastflix=FastFlix(data_path=tmp_path)), config)
+
+
+def test_crop_from_frames(monkeypatch):
+    frames = np.full((3, 540, 960), 16, dtype=np.uint8)
+    frames[:, 70:470, :] = 120  # letterboxed scope picture
+    frames[1, 60:480, 20:940] = 90  # one scene with a taller picture, but pillarboxed
+    frames[2] = 16  # fade to black tells nothing
+    assert crop_from_frames(frames) == (60, 60, 0, 0)
+    assert crop_from_frames(np.full((2, 10, 10), 16, dtype=np.uint8)) is None
+
+    monkeypatch.setattr(flix, "sample_gray_frames", lambda *_: frames)
+    result = []
+    get_auto_crop(Box(ffmpeg="ffmpeg"), Path("movie.mkv"), 1920, 1080, 0, [60.0, 120.0], result)
+    assert result == [[0, 120, 0, 120]]
+    # Bars of 4K frames sampled at 960x540 are rounded down to even source pixels
+    assert crop_to_source((61, 61, 3, 0), 960, 540, 3840, 2160) == [0, 244, 12, 244]
+
+
+def test_interlace_decision():
+    assert interlace_decision({"tff": 693, "bff": 0, "progressive": 39}) == ("tff", 0.947)
+    assert interlace_decision({"tff": 0, "bff": 30, "progressive": 10}) == ("bff", 0.75)
+    assert interlace_decision({"tff": 0, "bff": 0, "progressive": 641}) == (False, 1.0)
+    assert interlace_decision({"tff": 0, "bff": 0, "progressive": 0}) == (False, 0.0)
+
+
+def test_compact_stream():
+    track = Box(
+        {
+            "index": 3,
+            "codec_name": "hdmv_pgs_subtitle",
+            "codec_type": "subtitle",
+            "time_base": "1/1000",
+            "duration_ts": 5400000,
+            "disposition": {"default": 0, "forced": 1},
+            "tags": {"language": "eng", "title": "Signs", "BPS-eng": "3000", "_STATISTICS_TAGS-eng": "BPS DURATION"},
+        }
+    )
+    stream = compact_stream(track)
+    assert stream == {
+        "index": 3,
+        "codec_name": "hdmv_pgs_subtitle",
+        "codec_type": "subtitle",
+        "disposition": {"default": 0, "forced": 1},
+        "tags": {"language": "eng", "title": "Signs"},
+    }
+    assert "BPS-eng" in track.tags
+
+
+def test_run_source_analysis(monkeypatch):
+    frames = np.full((4, 54, 96), 16, dtype=np.uint8)
+    frames[:, 7:47, :] = 120
+    stderr = (
+        "[Parsed_idet_0 @ 0x4] Single frame detection: TFF:     0 BFF:     0 Progressive:    40 Undetermined:     0"
+    )
+    commands = []
+
+    def fake_run(command, **_):
+        commands.append(command)
+        return CompletedProcess(command, 0, stdout=frames.tobytes(), stderr=stderr.encode("utf-8"))
+
+    monkeypatch.setattr(flix, "run", fake_run)
+    results = flix.run_source_analysis(Path("ffmpeg"), Path("movie.mkv"), 0, [60.0, 120.0], 2, 96, 54)
+    assert results["interlace"] == {"tff": 0, "bff": 0, "progressive": 40}
+    assert results["crop_bars"] == [7, 7, 0, 0]
+    assert "cropdetect" not in " ".join(commands[0])
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+from pathlib import Path
+
+from box import Box
+
+from fastflix.encoders.common.helpers import command_key, join_command, settings_snapshot, split_command
+from fastflix.models.config import Config
+from fastflix.models.encode import AudioTrack, SubtitleTrack, x265Settings
+from fastflix.models.fastflix import FastFlix
+from fastflix.models.video import Video, VideoSettings
+
+
+def make_fastflix() -> FastFlix:
+    video = Video(source=Path("movie.mkv"), streams=Box(video=[]), format=Box())
+    video.video_settings = VideoSettings(
+        output_path=Path("movie-fastflix.mkv"),
+        video_encoder_settings=x265Settings(),
+        audio_tracks=[AudioTrack(index=1, outdex=1, raw_info=Box(index=1))],
+        subtitle_tracks=[SubtitleTrack(index=2, outdex=2)],
+    )
+    return FastFlix(config=Config(), current_video=video)
+
+
+def test_command_key():
+    fastflix = make_fastflix()
+    key = command_key(fastflix)
+    assert command_key(fastflix) == key
+
+    fastflix.current_video.video_settings.audio_tracks[0].raw_info = Box(index=1, codec_name="aac")
+    fastflix.current_video.video_settings.conversion_commands = ["anything"]
+    assert command_key(fastflix) == key
+
+    fastflix.current_video.video_settings.video_title = "Movie"
+    assert command_key(fastflix) != key
+    key = command_key(fastflix)
+    fastflix.current_video.video_settings.subtitle_tracks[0].burn_in = True
+    assert command_key(fastflix) != key
+    key = command_key(fastflix)
+    fastflix.current_video.video_settings.video_encoder_settings.crf = 18
+    assert command_key(fastflix) != key
+
+
+def test_command_key_follows_source_file(tmp_path):
+    fastflix = make_fastflix()
+    source = tmp_path / "movie.mkv"
+    source.write_bytes(b"video")
+    fastflix.current_video.source = source
+    key = command_key(fastflix)
+
+    # Probing the same file again gives new streams with the same contents
+    fastflix.current_video.streams = Box(video=[])
+    assert command_key(fastflix) == key
+    source.write_bytes(b"other video")
+    assert command_key(fastflix) != key
+
+
+def test_settings_snapshot():
+    snapshot = settings_snapshot(make_fastflix())
+    assert snapshot["output_path"] == Path("movie-fastflix.mkv")
+    assert snapshot["video_encoder_settings"]["name"] == "HEVC (x265)"
+    assert "audio_tracks" not in snapshot and "conversion_commands" not in snapshot
+
+
+def test_join_command():
+    args = ["ffmpeg", "-i", r"C:\Users\o'brien\movie.mkv", "-metadata", 'title=a "b c"', "", r"out dir\\", '"']
+    assert split_command(join_command(args)) == args
+    assert join_command(["-c:v", "libx265"]) == "-c:v libx265"
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+from fastflix.packet_index import PacketIndex
+
+
+def test_packet_index(tmp_path):
+    # Two seconds at 4 fps in decode order, keyframes every second
+    pts = np.array([0.0, 0.5, 0.25, 0.75, 1.0, 1.5, 1.25, 1.75])
+    size = np.array([4000, 1000, 500, 500, 4000, 1000, 500, 500], dtype=np.uint32)
+    keyframe = np.array([True, False, False, False, True, False, False, False])
+    index = PacketIndex(pts, size, keyframe)
+
+    assert index.keyframe_at_or_before(0.9) == 0.0
+    assert index.keyframe_at_or_before(1.0) == 1.0
+    assert index.keyframe_after(0.1) == 1.0
+    assert index.keyframe_after(0.1, window=0.5) is None
+    assert index.keyframe_after(1.1) is None
+    assert index.frame_at(0.5) == 2
+    assert index.frame_at(1.25) == 5
+    assert index.bitrate(0, 1) == 6000 * 8
+
+    index.save(tmp_path / "index.npz")
+    loaded = PacketIndex.load(tmp_path / "index.npz")
+    assert len(loaded) == 8
+    assert loaded.keyframes.tolist() == [0.0, 1.0]
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+import os
+
+from fastflix.probe_cache import ProbeCache, content_hash, file_key
+
+
+def test_probe_cache(tmp_path):
+    source = tmp_path / "movie.mkv"
+    source.write_bytes(b"video" * 1000)
+    cache = ProbeCache(tmp_path / "cache.sqlite")
+
+    assert cache.get(source, "ffprobe", "6.0|6.0") is None
+    cache.set(source, "ffprobe", "6.0|6.0", {"streams": [1, 2]})
+    assert cache.get(source, "ffprobe", "6.0|6.0") == {"streams": [1, 2]}
+    assert ProbeCache(tmp_path / "cache.sqlite").get(source, "ffprobe", "6.0|6.0") == {"streams": [1, 2]}
+
+    # New tool versions or a changed file never match old results
+    assert cache.get(source, "ffprobe", "6.1|6.1") is None
+    source.write_bytes(b"other" * 1000)
+    os.utime(source, ns=(1, 1))
+    assert cache.get(source, "ffprobe", "6.0|6.0") is None
+
+
+def test_file_key_reads_file_once(tmp_path):
+    source = tmp_path / "movie.mkv"
+    source.write_bytes(b"video" * 1000)
+    key = file_key(source)
+    misses = content_hash.cache_info().misses
+
+    assert file_key(source) == key
+    assert content_hash.cache_info().misses == misses
+    os.utime(source, ns=(1, 1))
+    assert file_key(source) != key
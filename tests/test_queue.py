@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+import copy
+from contextlib import closing
+from pathlib import Path
+
+from box import Box
+
+from fastflix.encoders.common.helpers import ChunkPlan, Command, split_command
+from fastflix.ff_queue import QueueStore, get_queue, load_probe_data, save_queue
+from fastflix.models.config import Config
+from fastflix.models.encode import AttachmentTrack, AudioTrack, x265Settings
+from fastflix.models.video import Status, Video, VideoSettings
+
+
+def make_video(work_path: Path) -> Video:
+    return Video(
+        source=Path("movie.mkv"),
+        work_path=work_path,
+        video_settings=VideoSettings(
+            output_path=Path("movie-fastflix.mkv"),
+            video_encoder_settings=x265Settings(chunks="2"),
+            conversion_commands=[
+                Command(
+                    command="encode",
+                    chunks=ChunkPlan(
+                        commands=[["one"], ["two"]],
+                        outputs=["chunk_0000.mkv", "chunk_0001.mkv"],
+                        concat_file="chunks.txt",
+                        checkpoint_file="completed_chunks.txt",
+                    ),
+                ),
+                Command(command="concat"),
+            ],
+        ),
+        status=Status(running=True, current_command=1),
+    )
+
+
+def test_queue_keeps_resume_state(tmp_path):
+    queue_file = tmp_path / "queue.yaml"
+    save_queue([make_video(tmp_path)], queue_file)
+
+    video = get_queue(queue_file)[0]
+    assert video.status.running
+    assert video.status.current_command == 1
+    assert video.video_settings.conversion_commands[0].chunks.outputs == ["chunk_0000.mkv", "chunk_0001.mkv"]
+
+    video.status.clear(keep_progress=True)
+    assert video.status.ready
+    assert video.status.current_command == 1
+
+
+def test_queue_restarts_without_work_path(tmp_path):
+    queue_file = tmp_path / "queue.yaml"
+    save_queue([make_video(tmp_path / "gone")], queue_file)
+
+    video = get_queue(queue_file)[0]
+    assert video.status.current_command == 0
+
+
+def test_queue_relocates_cover(tmp_path):
+    cover = tmp_path / "my cover.png"
+    cover.write_bytes(b"png")
+    video = make_video(tmp_path)
+    video.video_settings.attachment_tracks = [AttachmentTrack(outdex=3, file_path=cover, filename="cover")]
+    video.video_settings.conversion_commands = [Command(command=f'ffmpeg -i movie.mkv -attach "{cover}" out.mkv')]
+    queue_file = tmp_path / "queue.yaml"
+    save_queue([video], queue_file, Config(work_path=tmp_path / "work"))
+
+    command = get_queue(queue_file)[0].video_settings.conversion_commands[0]
+    assert command.inputs == ["movie.mkv"] and command.output == "out.mkv"
+    assert command.args[4] != str(cover)
+    assert Path(command.args[4]).read_bytes() == b"png"
+    assert split_command(command.command) == command.args
+    assert video.video_settings.conversion_commands[0].args[4] == str(cover)
+
+
+def test_queue_store(tmp_path):
+    legacy = tmp_path / "queue.yaml"
+    save_queue([make_video(tmp_path), make_video(tmp_path)], legacy)
+    queue_file = tmp_path / "queue.sqlite"
+
+    # The old YAML queue is moved into the database once
+    queue = get_queue(queue_file)
+    assert len(queue) == 2 and not legacy.exists()
+    assert queue[0].video_settings.conversion_commands[0].chunks.outputs == ["chunk_0000.mkv", "chunk_0001.mkv"]
+
+    store = QueueStore(queue_file)
+    queue = store.load()
+    added = make_video(tmp_path)
+    queue.insert(0, added)
+    queue.pop()
+    store.save(queue)
+    with closing(store.connect()) as db:
+        written = dict(db.execute("SELECT uuid, data FROM queue").fetchall())
+
+    # Only the status of videos already stored is written again
+    queue[1].status.complete = True
+    store.save(queue)
+    with closing(store.connect()) as db:
+        assert dict(db.execute("SELECT uuid, data FROM queue").fetchall()) == written
+
+    loaded = QueueStore(queue_file).load()
+    assert [video.uuid for video in loaded] == [video.uuid for video in queue]
+    assert loaded[1].status.complete and not loaded[0].status.complete
+
+    # Anything else changed in place is written again
+    queue[0].video_settings.video_title = "Changed"
+    queue[0].video_settings.conversion_commands = [Command(command="encode again")]
+    store.save(queue)
+    changed = QueueStore(queue_file).load()[0]
+    assert changed.video_settings.video_title == "Changed"
+    assert changed.video_settings.conversion_commands[0].command == "encode again"
+
+
+def test_queue_copies_cover_once(tmp_path):
+    cover = tmp_path / "cover.png"
+    cover.write_bytes(b"png")
+    video = make_video(tmp_path)
+    video.video_settings.attachment_tracks = [AttachmentTrack(outdex=3, file_path=cover, filename="cover")]
+    video.video_settings.conversion_commands = [Command(command=f'ffmpeg -i movie.mkv -attach "{cover}" out.mkv')]
+    config = Config(work_path=tmp_path / "work")
+    queue_file = tmp_path / "queue.yaml"
+
+    save_queue([video], queue_file, config)
+    for _ in range(3):
+        save_queue(get_queue(queue_file), queue_file, config)
+
+    assert len(list((tmp_path / "work" / "covers").iterdir())) == 1
+    command = get_queue(queue_file)[0].video_settings.conversion_commands[0]
+    assert Path(command.args[4]).parent == tmp_path / "work" / "covers"
+
+
+def test_queue_store_loads_probe_data_lazily(tmp_path):
+    video = make_video(tmp_path)
+    video.streams = Box(video=[{"index": 0, "codec_type": "video", "width": 1920, "height": 1080}], audio=[])
+    video.format = Box(duration="10.0")
+    video.video_settings.audio_tracks = [AudioTrack(index=1, outdex=1, raw_info={"codec_name": "aac"})]
+    queue_file = tmp_path / "queue.sqlite"
+    save_queue([video], queue_file)
+
+    loaded = QueueStore(queue_file).load()[0]
+    duplicate = copy.deepcopy(loaded)
+    assert loaded.streams is None
+    assert loaded.video_settings.audio_tracks[0].raw_info is None
+
+    # Exporting the queue again still carries the probe data
+    export = tmp_path / "export.yaml"
+    save_queue([loaded], export)
+    assert get_queue(export)[0].streams.video[0].width == 1920
+
+    load_probe_data(loaded)
+    assert loaded.streams.video[0].width == 1920
+    assert loaded.format.duration == "10.0"
+    assert loaded.video_settings.audio_tracks[0].raw_info == {"codec_name": "aac"}
+
+    # Copies keep their own way to the probe data
+    load_probe_data(duplicate)
+    assert duplicate.streams.video[0].width == 1920
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from fastflix.thumbnails import ThumbnailCache, frame_to_image, ppm_header, thumbnail_key
+
+
+def test_thumbnail_key():
+    assert thumbnail_key(position=2, filters="crop") == thumbnail_key(filters="crop", position=2)
+    assert thumbnail_key(position=2, filters="crop") != thumbnail_key(position=3, filters="crop")
+
+
+def test_thumbnail_cache():
+    cache = ThumbnailCache(max_items=2)
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+    assert cache.get("a") == b"1"
+    cache.set("c", b"3")
+    assert "b" not in cache
+    assert cache.get("a") == b"1"
+    assert cache.get("c") == b"3"
+    assert len(cache) == 2
+
+
+def test_frame_to_image():
+    pixels = bytes([255, 0, 0, 0, 255, 0, 0, 0, 255, 10, 20, 30])
+    frame = b"P6\n2 2\n255\n" + pixels
+    assert ppm_header(frame) == (2, 2, 11)
+    image = frame_to_image(frame)
+    assert (image.width(), image.height()) == (2, 2)
+    assert image.pixelColor(1, 0).getRgb()[:3] == (0, 255, 0)
+    assert image.pixelColor(1, 1).getRgb()[:3] == (10, 20, 30)
+    with pytest.raises(ValueError):
+        ppm_header(frame[:-1])
@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+from pathlib import Path
+
+from box import Box
+
+from fastflix.models.video import Video
+
+
+def test_selected_stream_follows_track_and_streams():
+    video = Video(
+        source=Path("movie.mkv"),
+        streams=Box(video=[Box(index=0, width=1920, height=1080, tags={}), Box(index=1, width=1280, height=720)]),
+    )
+    assert (video.width, video.height) == (1920, 1080)
+    video.video_settings.selected_track = 1
+    assert (video.width, video.height) == (1280, 720)
+    assert video.current_video_stream.index == 1
+
+    video.streams = Box(video=[Box(index=1, width=640, height=480, tags={"rotate": "90"})])
+    assert (video.width, video.height) == (480, 640)
+    video.video_settings.selected_track = 5
+    assert video.current_video_stream is None
+    assert video.pix_fmt == ""